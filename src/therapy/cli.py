@@ -4,6 +4,7 @@ import datetime
 import json
 import logging
 from pathlib import Path
+from timeit import default_timer as timer
 
 import click
 from disease.database import create_db as create_disease_db
@@ -11,6 +12,7 @@ from disease.database import create_db as create_disease_db
 from therapy import __version__
 from therapy.config import get_config
 from therapy.database import create_db
+from therapy.database.dynamodb import DynamoDatabase
 from therapy.schemas import RecordType, SourceName
 from therapy.utils import get_term_mappings, initialize_logs
 
@@ -94,6 +96,12 @@ def _ensure_diseases_updated(from_local: bool) -> None:
 @click.argument("sources", nargs=-1)
 @click.option("--all", "all_", is_flag=True, help="Update records for all sources.")
 @click.option("--normalize", is_flag=True, help="Create normalized records.")
+@click.option(
+    "--store_concepts",
+    is_flag=True,
+    default=False,
+    help="Store precomputed therapy concepts with normalized records.",
+)
 @click.option("--db_url", help=URL_DESCRIPTION)
 @click.option("--aws_instance", is_flag=True, help="Use cloud DynamodDB instance.")
 @click.option(
@@ -102,6 +110,17 @@ def _ensure_diseases_updated(from_local: bool) -> None:
     default=False,
     help="Use most recent locally-available source data instead of fetching latest version",
 )
+@click.option(
+    "--export_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Write DynamoDB JSON item files to this directory instead of writing to the database.",
+)
+@click.option(
+    "--fast_validation",
+    is_flag=True,
+    default=False,
+    help="Check records with a lightweight structural check instead of full model validation.",
+)
 @click.option("--silent", is_flag=True, default=False, help=SILENT_MODE_DESCRIPTION)
 def update(
     sources: tuple[str, ...],
@@ -109,7 +128,10 @@ def update(
     db_url: str,
     all_: bool,
     normalize: bool,
+    store_concepts: bool,
     use_existing: bool,
+    export_dir: Path | None,
+    fast_validation: bool,
     silent: bool,
 ) -> None:
     """Update provided normalizer SOURCES in the therapy database.
@@ -128,11 +150,33 @@ def update(
 
         $ thera-py update --all --normalize
 
+    To reduce normalization response latency, the --store_concepts option precomputes
+    the therapy concept returned for each normalized record, at the cost of a larger
+    database:
+
+        $ thera-py update --normalize --store_concepts
+
     Thera-Py will fetch the latest available data from all sources if local
     data is out-of-date. To suppress this and force usage of local files only, use the
     --use_existing flag:
 
         $ thera-py update --all --use_existing
+
+    For large loads, records can be written to DynamoDB JSON item files, partitioned
+    by source, instead of to the database. These can be imported with DynamoDB's
+    ImportTable API or with the load-items command. Normalized records are computed
+    from the data currently in the database, so when exporting, load source items
+    before running --normalize:
+
+        $ thera-py update --all --export_dir therapy_items
+        $ thera-py load-items therapy_items
+        $ thera-py update --normalize
+
+    Each record is validated against the Therapy schema before it's loaded. For
+    faster loads of trusted data, use --fast_validation to replace full model
+    validation with a lightweight structural check:
+
+        $ thera-py update --all --fast_validation
     """
     _initialize_app()
     if len(sources) == 0 and (not all_) and (not normalize):
@@ -143,7 +187,10 @@ def update(
         click.echo(ctx.get_help())
         ctx.exit(1)
 
-    db = create_db(db_url, aws_instance)
+    if export_dir:
+        db = create_db(db_url, aws_instance, export_dir=export_dir)
+    else:
+        db = create_db(db_url, aws_instance)
 
     processed_ids = None
     try:
@@ -159,7 +206,9 @@ def update(
         click.get_current_context().exit(1)
     if all_:
         _ensure_diseases_updated(use_existing)
-        processed_ids = update_all_sources(db, use_existing, silent=silent)
+        processed_ids = update_all_sources(
+            db, use_existing, silent=silent, fast_validation=fast_validation
+        )
     elif sources:
         parsed_sources = set()
         failed_source_names = []
@@ -178,13 +227,55 @@ def update(
         working_processed_ids = set()
         for source_name in parsed_sources:
             working_processed_ids |= update_source(
-                source_name, db, use_existing=use_existing, silent=silent
+                source_name,
+                db,
+                use_existing=use_existing,
+                silent=silent,
+                fast_validation=fast_validation,
             )
         if len(sources) == len(SourceName):
             processed_ids = working_processed_ids
 
     if normalize:
-        update_normalized(db, processed_ids, silent=silent)
+        update_normalized(
+            db, processed_ids, silent=silent, store_concepts=store_concepts
+        )
+
+
+@cli.command()
+@click.argument(
+    "item_dir", type=click.Path(exists=True, file_okay=False, path_type=Path)
+)
+@click.option("--db_url", help=URL_DESCRIPTION)
+@click.option("--aws_instance", is_flag=True, help="Use cloud DynamodDB instance.")
+@click.option(
+    "--threads",
+    type=int,
+    default=8,
+    show_default=True,
+    help="Number of concurrent writer threads.",
+)
+@click.option("--silent", is_flag=True, default=False, help=SILENT_MODE_DESCRIPTION)
+def load_items(
+    item_dir: Path, db_url: str, aws_instance: bool, threads: int, silent: bool
+) -> None:
+    """Bulk load DynamoDB JSON item files from ITEM_DIR, as produced by
+    `update --export_dir`, into the therapy database.
+
+        $ thera-py load-items therapy_items --threads 16
+    """
+    _initialize_app()
+    db = create_db(db_url, aws_instance)
+    if not isinstance(db, DynamoDatabase):
+        click.echo("Error: item files can only be loaded into a DynamoDB database.")
+        ctx = click.get_current_context()
+        ctx.exit(1)
+    start = timer()
+    n_items = db.load_item_files(item_dir, threads)
+    msg = f"Loaded {n_items} items in {(timer() - start):.5f} seconds."
+    if not silent:
+        click.echo(msg)
+    _logger.info(msg)
 
 
 @cli.command()
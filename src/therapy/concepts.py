@@ -0,0 +1,329 @@
+"""Format therapy records as GA4GH concepts, as included in normalization responses."""
+
+import json
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from disease.schemas import get_concept_mapping as get_disease_concept_mapping
+from ga4gh.core.models import (
+    Coding,
+    ConceptMapping,
+    Extension,
+    MappableConcept,
+    Relation,
+    code,
+)
+from pydantic import BaseModel
+
+from therapy.schemas import (
+    NAMESPACE_TO_SYSTEM_URI,
+    HasIndication,
+    NamespacePrefix,
+    NormalizeView,
+)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# concept ID prefix -> (namespace, system URI)
+_PREFIX_TO_SYSTEM: dict[str, tuple[NamespacePrefix, str]] = {
+    ns.value: (ns, system) for ns, system in NAMESPACE_TO_SYSTEM_URI.items()
+}
+
+# max number of concept IDs with coding values retained by process-wide cache
+CODING_CACHE_SIZE = 2**16
+
+# max number of decoded indications retained by each process-wide cache
+INDICATION_CACHE_SIZE = 2**16
+
+
+def build_model(model: type[ModelT], strict: bool, **values: Any) -> ModelT:  # noqa: ANN401
+    """Build a response model instance.
+
+    Responses are assembled from records that were validated during ETL, so outside of
+    strict mode, models are constructed without validating values again. Callers are
+    responsible for providing values of the declared types.
+
+    :param model: model class to build
+    :param strict: if True, validate values
+    :param values: model field values
+    :return: model instance
+    """
+    if strict:
+        return model(**values)
+    return model.model_construct(**values)
+
+
+@lru_cache(maxsize=INDICATION_CACHE_SIZE)
+def _get_indication_values(
+    indication_string: str,
+) -> tuple[str, str, str | None, tuple[tuple[str, str | None], ...] | None]:
+    """Decode indication data.
+
+    :param indication_string: dumped JSON string from db
+    :return: disease ID, disease label, normalized disease ID, and supplemental info
+        items
+    """
+    disease_id, disease_label, normalized_disease_id, supplemental_info = json.loads(
+        indication_string
+    )
+    if supplemental_info is not None:
+        supplemental_info = tuple(supplemental_info.items())
+    return disease_id, disease_label, normalized_disease_id, supplemental_info
+
+
+def get_indication(indication_string: str, strict: bool = True) -> HasIndication:
+    """Load indication data.
+
+    A new object is built for each call, from decoded values that are cached for the
+    life of the process.
+
+    :param str indication_string: dumped JSON string from db
+    :param strict: if False, skip validation of indication values
+    :return: complete HasIndication object
+    """
+    disease_id, disease_label, normalized_disease_id, supplemental_info = (
+        _get_indication_values(indication_string)
+    )
+    return build_model(
+        HasIndication,
+        strict,
+        disease_id=disease_id,
+        disease_label=disease_label,
+        normalized_disease_id=normalized_disease_id,
+        supplemental_info=(
+            dict(supplemental_info) if supplemental_info is not None else None
+        ),
+    )
+
+
+@lru_cache(maxsize=CODING_CACHE_SIZE)
+def _get_coding_values(concept_id: str) -> tuple[str, str]:
+    """Get code and system for CURIE identifier.
+
+    ``system`` will use system prefix URL, OBO Foundry persistent URL (PURL), or
+    source homepage, in that order of preference.
+
+    :param concept_id: A lowercase concept identifier represented as a curie
+    :raises ValueError: If source of concept ID is not a valid ``NamespacePrefix``
+    :return: code and system URI for identifier
+    """
+    prefix, source_code = concept_id.split(":")
+
+    namespace = _PREFIX_TO_SYSTEM.get(prefix) or _PREFIX_TO_SYSTEM.get(prefix.upper())
+    if namespace is None:
+        err_msg = f"Namespace prefix not supported: {prefix}"
+        raise ValueError(err_msg)
+    source, system = namespace
+
+    if source == NamespacePrefix.CHEBI:
+        source_code = concept_id
+    return source_code, system
+
+
+def get_coding_object(concept_id: str, strict: bool = True) -> Coding:
+    """Get coding object for CURIE identifier
+
+    A new object is built for each call, from code and system values that are cached
+    for the life of the process.
+
+    :param concept_id: A lowercase concept identifier represented as a curie
+    :param strict: if False, skip validation of coding values
+    :raises ValueError: If source of concept ID is not a valid ``NamespacePrefix``
+    :return: Coding object for identifier
+    """
+    source_code, system = _get_coding_values(concept_id)
+    return build_model(
+        Coding,
+        strict,
+        id=concept_id,
+        code=build_model(code, strict, root=source_code),
+        system=system,
+    )
+
+
+def get_concept_mapping(
+    concept_id: str, relation: Relation, strict: bool = True
+) -> ConceptMapping:
+    """Create concept mapping for identifier
+
+    :param concept_id: A lowercase concept identifier represented as a curie
+    :param relation: SKOS mapping relationship, default is relatedMatch
+    :param strict: if False, skip validation of mapping values
+    :raises ValueError: If source of concept ID is not a valid
+        ``NamespacePrefix``
+    :return: Concept mapping for identifier
+    """
+    return build_model(
+        ConceptMapping,
+        strict,
+        coding=get_coding_object(concept_id, strict),
+        relation=relation,
+    )
+
+
+@lru_cache(maxsize=INDICATION_CACHE_SIZE)
+def _get_indication_concept_json(indication_string: str) -> str:
+    """Format indication as a disease Mappable Concept, dumped to JSON.
+
+    :param indication_string: dumped JSON string from db
+    :return: disease concept JSON, without None values
+    """
+    indication = get_indication(indication_string)
+
+    if indication.normalized_disease_id:
+        mappings = [
+            get_disease_concept_mapping(
+                concept_id=indication.normalized_disease_id,
+                relation=Relation.EXACT_MATCH,
+            )
+        ]
+    else:
+        mappings = []
+    ind_disease_obj = MappableConcept(
+        id=indication.disease_id,
+        conceptType="Disease",
+        name=indication.disease_label,
+        mappings=mappings or None,
+    )
+
+    if indication.supplemental_info:
+        ind_disease_obj.extensions = [
+            Extension(name=k, value=v) for k, v in indication.supplemental_info.items()
+        ]
+    return ind_disease_obj.model_dump_json(exclude_none=True)
+
+
+def get_indication_concept(indication_string: str) -> dict:
+    """Format indication as a dumped disease Mappable Concept.
+
+    A new object is decoded for each call, from concept JSON that's cached for the
+    life of the process.
+
+    :param indication_string: dumped JSON string from db
+    :return: disease concept, as included in normalization responses
+    """
+    return json.loads(_get_indication_concept_json(indication_string))
+
+
+def get_therapy_concept(
+    record: dict,
+    view: NormalizeView = NormalizeView.FULL,
+    strict: bool = True,
+) -> MappableConcept:
+    """Format DB record as a therapy Mappable Concept.
+
+    :param record: record as stored in DB
+    :param view: parts of the concept to include
+    :param strict: if False, skip validation of concept and extension values
+    :return: therapy concept, as returned in normalization responses
+    """
+    therapy_obj = build_model(
+        MappableConcept,
+        strict,
+        id=f"normalize.therapy.{record['concept_id']}",
+        primaryCoding=get_coding_object(record["concept_id"], strict),
+        conceptType="Therapy",
+        name=record.get("label"),
+    )
+    if view == NormalizeView.MINIMAL:
+        return therapy_obj
+
+    xrefs = record.get("xrefs", [])
+    mappings = [
+        get_concept_mapping(xref_id, Relation.EXACT_MATCH, strict) for xref_id in xrefs
+    ]
+
+    associated_with = record.get("associated_with", [])
+    mappings.extend(
+        get_concept_mapping(associated_with_id, Relation.RELATED_MATCH, strict)
+        for associated_with_id in associated_with
+    )
+
+    therapy_obj.mappings = mappings or None
+    if view == NormalizeView.MAPPINGS:
+        return therapy_obj
+
+    extensions = []
+    if "aliases" in record:
+        extensions.append(
+            build_model(Extension, strict, name="aliases", value=record["aliases"])
+        )
+
+    if any(
+        filter(
+            lambda f: f in record,
+            ("approval_ratings", "approval_year", "has_indication"),
+        )
+    ):
+        approv_value = {}
+        if "approval_ratings" in record:
+            value = record.get("approval_ratings")
+            if value:
+                approv_value["approval_ratings"] = value
+        if "approval_year" in record:
+            value = record.get("approval_year")
+            if value:
+                approv_value["approval_year"] = value
+
+        inds_list = [
+            get_indication_concept(ind_db)
+            for ind_db in record.get("has_indication", [])
+        ]
+        if inds_list:
+            approv_value["has_indication"] = inds_list
+
+        approv = build_model(
+            Extension, strict, name="regulatory_approval", value=approv_value
+        )
+        extensions.append(approv)
+
+    trade_names = record.get("trade_names")
+    if trade_names:
+        extensions.append(
+            build_model(Extension, strict, name="trade_names", value=trade_names)
+        )
+
+    if extensions:
+        therapy_obj.extensions = extensions
+
+    return therapy_obj
+
+
+def _construct_coding(values: dict) -> Coding:
+    """Construct coding object from its dumped form, without validation.
+
+    :param values: dumped coding
+    :return: Coding object
+    """
+    return Coding.model_construct(
+        **{**values, "code": code.model_construct(values["code"])}
+    )
+
+
+def load_therapy_concept(concept_json: str, strict: bool = True) -> MappableConcept:
+    """Load therapy concept stored with a merged record (see ``Merge``).
+
+    Stored concepts are generated by ``get_therapy_concept()`` during ETL, so outside
+    of strict mode, they're constructed without validating them again.
+
+    :param concept_json: concept, as dumped to JSON without None values
+    :param strict: if True, validate the concept
+    :return: therapy concept, as returned in normalization responses
+    """
+    if strict:
+        return MappableConcept.model_validate_json(concept_json)
+    values = json.loads(concept_json)
+    values["primaryCoding"] = _construct_coding(values["primaryCoding"])
+    if "mappings" in values:
+        values["mappings"] = [
+            ConceptMapping.model_construct(
+                coding=_construct_coding(mapping["coding"]),
+                relation=Relation(mapping["relation"]),
+            )
+            for mapping in values["mappings"]
+        ]
+    if "extensions" in values:
+        values["extensions"] = [
+            Extension.model_construct(**extension) for extension in values["extensions"]
+        ]
+    return MappableConcept.model_construct(**values)
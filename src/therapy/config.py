@@ -25,6 +25,9 @@ class Settings(BaseSettings):
     debug: bool = False
     test: bool = False
     db_url: str = "http://localhost:8001"
+    strict_models: bool = False
+    # Cache-Control header value for query responses, or empty to omit the header
+    cache_control: str = "no-cache"
 
 
 @cache
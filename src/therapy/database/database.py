@@ -2,14 +2,15 @@
 
 import abc
 import sys
-from collections.abc import Generator
+from collections.abc import Collection, Generator
 from enum import Enum
 from os import environ
 from pathlib import Path
 
 import click
 
-from therapy.schemas import RecordType, RefType, SourceMeta, SourceName
+from therapy.schemas import MatchType, RecordType, RefType, SourceMeta, SourceName
+from therapy.term_filter import TermFilter
 
 
 class DatabaseError(Exception):
@@ -113,9 +114,53 @@ class AbstractDatabase(abc.ABC):
         :return: source metadata object if available
         """
 
+    @abc.abstractmethod
+    def get_source_versions(self) -> dict[SourceName, str]:
+        """Get version of each loaded source.
+
+        This is never cached, so that long-running processes can detect when a source
+        has been reloaded.
+
+        :return: mapping from source name to version, for each source with metadata
+        """
+
+    @abc.abstractmethod
+    def get_merge_run_id(self) -> str | None:
+        """Get ID of the most recently completed merge run.
+
+        This is never cached, so that long-running processes can detect when
+        normalized data has been regenerated.
+
+        :return: merge run ID, if normalized data has been generated
+        """
+
+    def get_data_version(self, merge_run_id: str | None = None) -> str:
+        """Get identifier for the current data, composed from the versions of each
+        loaded source and the ID of the merge run that generated normalized data.
+
+        :param merge_run_id: ID of merge run to use. Defaults to the most recently
+            completed run, as given by ``get_merge_run_id()``.
+        :return: data version string
+        """
+        if merge_run_id is None:
+            merge_run_id = self.get_merge_run_id()
+        source_versions = self.get_source_versions()
+        versions = [
+            f"{src_name.value}:{source_versions[src_name]}"
+            for src_name in SourceName
+            if src_name in source_versions
+        ]
+        if merge_run_id:
+            versions.append(f"merge:{merge_run_id}")
+        return ";".join(versions)
+
     @abc.abstractmethod
     def get_record_by_id(
-        self, concept_id: str, case_sensitive: bool = True, merge: bool = False
+        self,
+        concept_id: str,
+        case_sensitive: bool = True,
+        merge: bool = False,
+        fields: Collection[str] | None = None,
     ) -> dict | None:
         """Fetch record corresponding to provided concept ID
 
@@ -124,19 +169,59 @@ class AbstractDatabase(abc.ABC):
             Otherwise, performs filter operation, which doesn't require correct casing.
         :param merge: if true, look for merged record; look for identity
             record otherwise.
-        :return: complete therapy record, if match is found; None otherwise
+        :param fields: if given, only these record attributes need to be retrieved.
+            Implementations may still return others.
+        :return: therapy record, if match is found; None otherwise
         """
 
     @abc.abstractmethod
-    def get_refs_by_type(self, search_term: str, ref_type: RefType) -> list[str]:
+    def get_refs_by_type(
+        self,
+        search_term: str,
+        ref_type: RefType,
+        sources: Collection[str] | None = None,
+    ) -> list[str]:
         """Retrieve concept IDs for records matching the user's query. Other methods
         are responsible for actually retrieving full records.
 
         :param search_term: string to match against
         :param ref_type: type of match to look for.
+        :param sources: if given, only return concept IDs for records from these
+            sources (as ``SourceName`` values)
         :return: list of associated concept IDs. Empty if lookup fails.
         """
 
+    @abc.abstractmethod
+    def get_first_ref_by_type(self, search_term: str, ref_type: RefType) -> str | None:
+        """Retrieve the concept ID of the highest-priority record matching the user's
+        query, i.e. the record from the source with the best ``SourcePriority`` rank,
+        tiebroken by concept ID.
+
+        :param search_term: string to match against
+        :param ref_type: type of match to look for
+        :return: concept ID, if any records match
+        """
+
+    @abc.abstractmethod
+    def get_normalized_ref(self, term: str) -> dict | None:
+        """Retrieve the precomputed normalization result for a search term, as
+        generated alongside merged records.
+
+        :param term: lowercase, stripped search term
+        :return: item giving the normalized concept ID (``concept_id``), the name of
+            the ``MatchType`` achieved (``match_type``), whether the normalized
+            concept is a merged record (``merged``), and the data version that the
+            result was computed from (``data_version``), if available
+        """
+
+    @abc.abstractmethod
+    def get_term_filter(self) -> TermFilter | None:
+        """Retrieve filter over all searchable terms, as generated alongside merged
+        records.
+
+        :return: term filter, if available
+        """
+
     @abc.abstractmethod
     def get_rxnorm_id_by_brand(self, brand_id: str) -> str | None:
         """Given RxNorm brand ID, retrieve associated drug concept ID.
@@ -211,6 +296,46 @@ class AbstractDatabase(abc.ABC):
         :param record: merged record to add
         """
 
+    @abc.abstractmethod
+    def add_normalized_ref(
+        self,
+        term: str,
+        concept_id: str,
+        match_type: MatchType,
+        merged: bool,
+        precedence: tuple[int, int, str],
+        data_version: str,
+    ) -> None:
+        """Add a candidate normalization result for a search term.
+
+        A term may have several candidates, e.g. one for each record that it appears
+        in. ``get_normalized_ref()`` provides the one with the lowest precedence.
+
+        :param term: lowercase search term
+        :param concept_id: ID of normalized concept that the term resolves to
+        :param match_type: type of match that the term achieves
+        :param merged: whether the normalized concept is a merged record (rather than
+            an ungrouped identity record)
+        :param precedence: rank of the candidate, as a tuple of match rank, source
+            priority, and ID of the record that the term was found in
+        :param data_version: version of the data that the result was computed from
+            (see ``get_data_version()``)
+        """
+
+    @abc.abstractmethod
+    def add_term_filter(self, term_filter: TermFilter) -> None:
+        """Add filter over all searchable terms, replacing any existing one.
+
+        :param term_filter: filter to store
+        """
+
+    @abc.abstractmethod
+    def add_merge_run_id(self, merge_run_id: str) -> None:
+        """Record completion of a merge run, replacing any previous one.
+
+        :param merge_run_id: ID of merge run
+        """
+
     @abc.abstractmethod
     def update_merge_ref(self, concept_id: str, merge_ref: str) -> None:
         """Update the merged record reference of an individual record to a new value.
@@ -222,8 +347,9 @@ class AbstractDatabase(abc.ABC):
 
     @abc.abstractmethod
     def delete_normalized_concepts(self) -> None:
-        """Remove merged records from the database. Use when performing a new update
-        of normalized data.
+        """Remove merged records, precomputed normalization results for search terms,
+        the term filter, and the merge run ID from the database. Use when performing a
+        new update of normalized data.
 
         :raise DatabaseReadError: if DB client requires separate read calls and
             encounters a failure in the process
@@ -297,7 +423,7 @@ def confirm_aws_db_use(env_name: str) -> None:
 
 
 def create_db(
-    db_url: str | None = None, aws_instance: bool = False
+    db_url: str | None = None, aws_instance: bool = False, **db_args
 ) -> AbstractDatabase:
     """Database factory method. Checks environment variables and provided parameters
     and creates a DB instance. Currently, Thera-Py only supports DynamoDB, but this
@@ -332,6 +458,7 @@ def create_db(
 
     :param db_url: address to database instance
     :param aws_instance: use hosted DynamoDB instance, not local DB
+    :param db_args: any DB implementation-specific parameters
     :return: constructed Database instance
     """
     aws_env_var_set = AWS_ENV_VAR_NAME in environ
@@ -339,7 +466,7 @@ def create_db(
     if aws_env_var_set or aws_instance:
         from therapy.database.dynamodb import DynamoDatabase  # noqa: PLC0415
 
-        db = DynamoDatabase()
+        db = DynamoDatabase(**db_args)
     else:
         if db_url:
             endpoint_url = db_url
@@ -350,5 +477,5 @@ def create_db(
 
         from therapy.database.dynamodb import DynamoDatabase  # noqa: PLC0415
 
-        db = DynamoDatabase(endpoint_url)
+        db = DynamoDatabase(endpoint_url, **db_args)
     return db
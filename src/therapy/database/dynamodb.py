@@ -1,15 +1,30 @@
 """Provide DynamoDB client."""
 
 import atexit
+import gzip
+import json
 import logging
+import random
+import shutil
 import sys
-from collections.abc import Generator
+import threading
+import time
+import zlib
+from collections.abc import Collection, Generator
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from os import environ
 from pathlib import Path
+from timeit import default_timer as timer
+from types import TracebackType
+from typing import IO
 
 import boto3
 import click
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.table import BatchWriter
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.client import BaseClient
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from therapy import ITEM_TYPES, PREFIX_LOOKUP
@@ -25,15 +40,454 @@ from therapy.database.database import (
     confirm_aws_db_use,
 )
 from therapy.schemas import (
+    MERGE_RUN_ITEM_TYPE,
+    NORMALIZED_REF_ITEM_TYPE,
     RXNORM_BRAND_ITEM_TYPE,
+    TERM_FILTER_ITEM_TYPE,
+    MatchType,
     RecordType,
     RefType,
     SourceMeta,
     SourceName,
+    SourcePriority,
 )
+from therapy.term_filter import TermFilter
 
 _logger = logging.getLogger(__name__)
 
+# max number of requests in a single BatchWriteItem call, per DynamoDB limits
+BATCH_WRITE_MAX_ITEMS = 25
+
+# max number of filter bytes to store per item. Base64 encoding inflates chunks by a
+# third, which keeps items within DynamoDB's 400 KB limit.
+TERM_FILTER_CHUNK_SIZE = 256 * 1024
+
+TERM_FILTER_PK = f"terms##{TERM_FILTER_ITEM_TYPE}"
+
+MERGE_RUN_KEY = {
+    "label_and_type": f"latest##{MERGE_RUN_ITEM_TYPE}",
+    "concept_id": "merge_run:latest",
+}
+
+# local secondary index which orders reference items by source priority
+PRIORITY_INDEX = "priority_index"
+
+
+class ShardedBatchWriter:
+    """Write items to a DynamoDB table from several threads at once.
+
+    Items are assigned to a shard by hashing their primary key, and each shard
+    flushes full batches of up to 25 put requests through its own single-threaded
+    executor. This keeps writes to any given key in submission order while letting
+    unrelated batches proceed concurrently. Within a batch, a later put overwrites an
+    earlier one with the same key (as with ``overwrite_by_pkeys`` in boto3's
+    ``BatchWriter``).
+
+    ``UnprocessedItems`` returned by DynamoDB are resubmitted with adaptive backoff:
+    each shard's delay doubles (with jitter) whenever a request comes back
+    incomplete, and decays back toward zero as requests succeed.
+
+    Only a bounded number of batches may be in flight at once. If any batch fails,
+    the error is raised by the next call to ``put_item()`` (or by ``flush()``), and no
+    further batches are submitted.
+
+    Provides the ``put_item()``/``__exit__()`` interface of boto3's ``BatchWriter``, so
+    it can be used as a drop-in replacement within :py:class:`DynamoDatabase`.
+    """
+
+    def __init__(
+        self,
+        client: BaseClient,
+        table_name: str,
+        n_threads: int,
+        max_retries: int = 10,
+        max_backoff: float = 20.0,
+    ) -> None:
+        """Initialize writer.
+
+        :param client: low-level DynamoDB client (clients, unlike resources, are
+            thread-safe)
+        :param table_name: name of table to write to
+        :param n_threads: number of shards/concurrent writer threads
+        :param max_retries: number of consecutive attempts that may return
+            unprocessed items before a batch is considered failed
+        :param max_backoff: upper bound on the retry delay, in seconds
+        """
+        self._client = client
+        self._table_name = table_name
+        self._n_threads = max(n_threads, 1)
+        self._max_retries = max_retries
+        self._max_backoff = max_backoff
+        self._serializer = TypeSerializer()
+        self._buffers: list[dict[tuple[str, str], dict]] = [
+            {} for _ in range(self._n_threads)
+        ]
+        self._executors = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"dynamo_writer_{i}")
+            for i in range(self._n_threads)
+        ]
+        self._pending: set[Future] = set()
+        self._error: BaseException | None = None
+        self._backoff = [0.0] * self._n_threads
+        # bound number of in-flight batches to keep memory use flat on large loads
+        self._in_flight = threading.BoundedSemaphore(self._n_threads * 4)
+        self._lock = threading.Lock()
+        self._start: float | None = None
+        self.items_written = 0
+        self.batches_written = 0
+        self.retries = 0
+        self.failed_items = 0
+
+    def put_item(self, Item: dict) -> None:  # noqa: N803
+        """Add put request to the queue.
+
+        :param Item: item to write, using the same structure as ``Table.put_item()``
+        :raise DatabaseWriteError: if a previously submitted batch failed to write
+        """
+        self._raise_if_failed()
+        if self._start is None:
+            self._start = timer()
+        key = (Item["label_and_type"], Item["concept_id"])
+        shard = zlib.crc32(f"{key[0]}|{key[1]}".encode()) % self._n_threads
+        if (
+            key not in self._buffers[shard]
+            and len(self._buffers[shard]) >= BATCH_WRITE_MAX_ITEMS
+        ):
+            self._submit(shard)
+        self._buffers[shard][key] = Item
+
+    def _submit(self, shard: int) -> None:
+        """Send a shard's buffered items to its executor.
+
+        :param shard: index of shard to flush
+        """
+        items = list(self._buffers[shard].values())
+        self._buffers[shard] = {}
+        if not items:
+            return
+        self._in_flight.acquire()
+        self._raise_if_failed(release=True)
+        future = self._executors[shard].submit(self._write_batch, shard, items)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._complete_batch)
+
+    def _complete_batch(self, future: Future) -> None:
+        """Stop tracking a finished batch, recording its error if it failed.
+
+        :param future: finished batch write
+        """
+        error = future.exception()
+        with self._lock:
+            self._pending.discard(future)
+            if error is not None and self._error is None:
+                self._error = error
+        self._in_flight.release()
+
+    def _raise_if_failed(self, release: bool = False) -> None:
+        """Raise the first batch write error, if any has occurred.
+
+        :param release: if True, release an in-flight slot before raising
+        :raise DatabaseWriteError: if a batch failed to write
+        """
+        if self._error is not None:
+            if release:
+                self._in_flight.release()
+            raise DatabaseWriteError(self._error) from self._error
+
+    def _write_batch(self, shard: int, items: list[dict]) -> None:
+        """Perform BatchWriteItem call, resubmitting any unprocessed items.
+
+        :param shard: index of calling shard, used to track its backoff delay
+        :param items: up to 25 items to write
+        :raise DatabaseWriteError: if items remain unprocessed after all retries
+        """
+        requests = [
+            {
+                "PutRequest": {
+                    "Item": {k: self._serializer.serialize(v) for k, v in i.items()}
+                }
+            }
+            for i in items
+        ]
+        attempts = 0
+        while requests:
+            if self._backoff[shard]:
+                time.sleep(self._backoff[shard] * random.uniform(0.5, 1))  # noqa: S311
+            try:
+                response = self._client.batch_write_item(
+                    RequestItems={self._table_name: requests}
+                )
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code")
+                if code not in {
+                    "ProvisionedThroughputExceededException",
+                    "ThrottlingException",
+                }:
+                    with self._lock:
+                        self.failed_items += len(requests)
+                    raise DatabaseWriteError(e) from e
+                unprocessed = requests
+            else:
+                unprocessed = response.get("UnprocessedItems", {}).get(
+                    self._table_name, []
+                )
+            with self._lock:
+                self.items_written += len(requests) - len(unprocessed)
+            if not unprocessed:
+                self._backoff[shard] /= 2
+                if self._backoff[shard] < 0.05:
+                    self._backoff[shard] = 0.0
+                break
+            attempts += 1
+            if attempts > self._max_retries:
+                with self._lock:
+                    self.failed_items += len(unprocessed)
+                msg = f"Failed to write {len(unprocessed)} items after {self._max_retries} retries"
+                raise DatabaseWriteError(msg)
+            with self._lock:
+                self.retries += 1
+            self._backoff[shard] = min(
+                max(self._backoff[shard] * 2, 0.05), self._max_backoff
+            )
+            requests = unprocessed
+        with self._lock:
+            self.batches_written += 1
+
+    def get_metrics(self) -> dict[str, float]:
+        """Get write throughput statistics since the writer began receiving items.
+
+        :return: dictionary of counts and rates
+        """
+        elapsed = timer() - self._start if self._start is not None else 0.0
+        return {
+            "items_written": self.items_written,
+            "batches_written": self.batches_written,
+            "retries": self.retries,
+            "failed_items": self.failed_items,
+            "elapsed_seconds": elapsed,
+            "items_per_second": self.items_written / elapsed if elapsed else 0.0,
+        }
+
+    def flush(self) -> None:
+        """Send all buffered items and block until every pending batch completes.
+
+        :raise DatabaseWriteError: if any batch failed to write
+        """
+        if self._error is None:
+            for shard in range(self._n_threads):
+                self._submit(shard)
+        with self._lock:
+            pending = list(self._pending)
+        wait(pending)
+        if self._start is not None:
+            metrics = self.get_metrics()
+            _logger.info(
+                "Wrote %s items in %s batches (%s retries, %s failed) over %.2f seconds: %.1f items/sec",
+                metrics["items_written"],
+                metrics["batches_written"],
+                metrics["retries"],
+                metrics["failed_items"],
+                metrics["elapsed_seconds"],
+                metrics["items_per_second"],
+            )
+        self._raise_if_failed()
+
+    def __enter__(self) -> "ShardedBatchWriter":
+        """Enter context manager.
+
+        :return: this writer
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Flush remaining items and shut down worker threads.
+
+        :param exc_type: type of raised exception, if any
+        :param exc_value: raised exception, if any
+        :param tb: traceback of raised exception, if any
+        """
+        try:
+            self.flush()
+        finally:
+            for executor in self._executors:
+                executor.shutdown(wait=True)
+
+
+# name of item file partition containing normalized concept output
+MERGER_PARTITION = RecordType.MERGER.value
+
+# item types written to the normalized concept partition rather than to a source's
+_MERGER_PARTITION_ITEM_TYPES = {
+    RecordType.MERGER.value,
+    NORMALIZED_REF_ITEM_TYPE,
+    TERM_FILTER_ITEM_TYPE,
+    MERGE_RUN_ITEM_TYPE,
+}
+
+
+class ItemFileWriter:
+    """Write items to gzipped DynamoDB JSON files rather than to a live table.
+
+    Output is partitioned by source, e.g. ``<export_dir>/chembl/items_00000.json.gz``,
+    with each line containing a single ``{"Item": {...}}`` object in the
+    ``DYNAMODB_JSON`` format accepted by DynamoDB's ImportTable API. Partitions can
+    be uploaded to S3 for a bulk import, or loaded directly into a running instance
+    with :py:meth:`DynamoDatabase.load_item_files`.
+
+    Provides the ``put_item()``/``__exit__()`` interface of boto3's ``BatchWriter``, so
+    it can be used as a drop-in replacement within :py:class:`DynamoDatabase`.
+
+    ImportTable doesn't define which of several items sharing a key is kept, so each
+    item must be written exactly once. Updates to identity items that have already been
+    written (i.e. merge refs) are collected and applied to the existing partition files
+    when the writer is closed.
+    """
+
+    def __init__(self, export_dir: Path, max_items_per_file: int = 500_000) -> None:
+        """Initialize writer.
+
+        :param export_dir: directory to write partitions under
+        :param max_items_per_file: number of items to write to a file before starting
+            a new one
+        """
+        self._export_dir = export_dir
+        self._max_items_per_file = max_items_per_file
+        self._serializer = TypeSerializer()
+        self._files: dict[str, IO[str]] = {}
+        self._counts: dict[str, int] = {}
+        self._merge_refs: dict[str, str] = {}
+        self._clear_merge_refs = False
+
+    def _open_file(self, partition: str) -> IO[str]:
+        """Open a new file for a partition, continuing after any existing files.
+
+        :param partition: name of partition
+        :return: writeable file handle
+        """
+        partition_dir = self._export_dir / partition
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        index = len(list(partition_dir.glob("items_*.json.gz")))
+        path = partition_dir / f"items_{index:05d}.json.gz"
+        return gzip.open(path, "wt", encoding="utf-8")
+
+    @staticmethod
+    def _get_partition(item: dict) -> str:
+        """Get name of partition that an item belongs in.
+
+        :param item: item to write
+        :return: ``MERGER_PARTITION`` for normalized concept output, or the lowercased
+            source name otherwise
+        """
+        if item["item_type"] in _MERGER_PARTITION_ITEM_TYPES:
+            return MERGER_PARTITION
+        return item["src_name"].lower()
+
+    def put_item(self, Item: dict) -> None:  # noqa: N803
+        """Write item to its partition file.
+
+        :param Item: item to write, using the same structure as ``Table.put_item()``
+        """
+        partition = self._get_partition(Item)
+        count = self._counts.get(partition, 0)
+        if partition not in self._files or count >= self._max_items_per_file:
+            if partition in self._files:
+                self._files[partition].close()
+            self._files[partition] = self._open_file(partition)
+            count = 0
+        serialized = {k: self._serializer.serialize(v) for k, v in Item.items()}
+        self._files[partition].write(json.dumps({"Item": serialized}))
+        self._files[partition].write("\n")
+        self._counts[partition] = count + 1
+
+    def update_merge_ref(self, concept_id: str, merge_ref: str) -> None:
+        """Set the merged record reference of a previously-written identity item.
+
+        The update is applied when the writer is closed.
+
+        :param concept_id: ID of identity record to update
+        :param merge_ref: new ref value
+        """
+        self._merge_refs[f"{concept_id.lower()}##identity"] = merge_ref.lower()
+
+    def delete_normalized_concepts(self) -> None:
+        """Delete the normalized concept partition, and remove merged record references
+        from all previously-written identity items.
+
+        References set afterward with ``update_merge_ref()`` are kept. Identity items
+        are updated when the writer is closed.
+        """
+        shutil.rmtree(self._export_dir / MERGER_PARTITION, ignore_errors=True)
+        self._merge_refs = {}
+        self._clear_merge_refs = True
+
+    def _apply_merge_refs(self) -> None:
+        """Rewrite source partition files with pending merge ref changes."""
+        unmatched = set(self._merge_refs)
+        for partition in self._export_dir.iterdir():
+            if not partition.is_dir() or partition.name == MERGER_PARTITION:
+                continue
+            for item_file in sorted(partition.glob("items_*.json.gz")):
+                tmp_file = item_file.with_name(f"{item_file.name}.tmp")
+                with (
+                    gzip.open(item_file, "rt", encoding="utf-8") as f_in,
+                    gzip.open(tmp_file, "wt", encoding="utf-8") as f_out,
+                ):
+                    for line in f_in:
+                        item = json.loads(line)["Item"]
+                        if item["item_type"]["S"] == RecordType.IDENTITY.value:
+                            label_and_type = item["label_and_type"]["S"]
+                            if label_and_type in self._merge_refs:
+                                merge_ref = self._merge_refs[label_and_type]
+                                item["merge_ref"] = self._serializer.serialize(
+                                    merge_ref
+                                )
+                                unmatched.discard(label_and_type)
+                            elif self._clear_merge_refs:
+                                item.pop("merge_ref", None)
+                            line = json.dumps({"Item": item}) + "\n"
+                        f_out.write(line)
+                tmp_file.replace(item_file)
+        for label_and_type in sorted(unmatched):
+            _logger.error(
+                "Updating nonexistent record: %s for merge ref to %s",
+                label_and_type,
+                self._merge_refs[label_and_type],
+            )
+
+    def __enter__(self) -> "ItemFileWriter":
+        """Enter context manager.
+
+        :return: this writer
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close all open files, and apply any pending merge ref changes.
+
+        :param exc_type: type of raised exception, if any
+        :param exc_value: raised exception, if any
+        :param tb: traceback of raised exception, if any
+        """
+        for file in self._files.values():
+            file.close()
+        self._files = {}
+        self._counts = {}
+        if (self._merge_refs or self._clear_merge_refs) and exc_type is None:
+            self._apply_merge_refs()
+        self._merge_refs = {}
+        self._clear_merge_refs = False
+
 
 class DynamoDatabase(AbstractDatabase):
     """Database class employing DynamoDB."""
@@ -44,11 +498,23 @@ class DynamoDatabase(AbstractDatabase):
         :param db_url: URL endpoint for DynamoDB source
         :Keyword Arguments:
             * region_name: AWS region (defaults to "us-east-2")
+            * write_threads: number of concurrent threads to use for batch writes.
+              Defaults to the value of the ``THERAPY_DYNAMO_WRITE_THREADS`` env var, or
+              to 1 (i.e. a standard single-threaded batch writer) if unset.
+            * export_dir: if given, write items to DynamoDB JSON files under this
+              directory instead of to the database (see :py:class:`ItemFileWriter`).
+              Reads are still performed against the database. Defaults to the value
+              of the ``THERAPY_DYNAMO_EXPORT_DIR`` env var, if set.
         :raise DatabaseInitializationError: if initial setup fails
         """
         self.therapy_table = environ.get("THERAPY_DYNAMO_TABLE", "therapy_normalizer")
 
         region_name = db_args.get("region_name", "us-east-2")
+        self._write_threads = int(
+            db_args.get("write_threads", environ.get("THERAPY_DYNAMO_WRITE_THREADS", 1))
+        )
+        export_dir = db_args.get("export_dir", environ.get("THERAPY_DYNAMO_EXPORT_DIR"))
+        self._export_dir = Path(export_dir) if export_dir else None
 
         if AWS_ENV_VAR_NAME in environ:
             if "THERAPY_TEST" in environ:
@@ -82,6 +548,7 @@ class DynamoDatabase(AbstractDatabase):
             click.echo(f"***Using Therapy Database Endpoint: {endpoint_url}***")
             boto_params = {"region_name": region_name, "endpoint_url": endpoint_url}
 
+        self._boto_params = boto_params
         self.dynamodb = boto3.resource("dynamodb", **boto_params)
         self.dynamodb_client = boto3.client("dynamodb", **boto_params)
 
@@ -91,10 +558,46 @@ class DynamoDatabase(AbstractDatabase):
             self.initialize_db()
 
         self.therapies = self.dynamodb.Table(self.therapy_table)
-        self.batch = self.therapies.batch_writer()
+        self._write_client: BaseClient | None = None
+        self._write_client_pool_size = 0
+        self.batch = self._get_batch_writer()
         self._cached_sources: dict[str, SourceMeta] = {}
+        self._merge_run_id: str | None = None
+        self._has_priority_index: bool | None = None
         atexit.register(self.close_connection)
 
+    def _get_sharded_batch_writer(self, n_threads: int) -> ShardedBatchWriter:
+        """Construct multi-threaded batch writer.
+
+        Writers share a single client, whose connection pool is sized to serve the
+        largest number of threads requested so far.
+
+        :param n_threads: number of concurrent writer threads
+        :return: writer instance
+        """
+        pool_size = max(n_threads, 10)
+        if self._write_client is None or self._write_client_pool_size < pool_size:
+            self._write_client = boto3.client(
+                "dynamodb",
+                config=Config(max_pool_connections=pool_size),
+                **self._boto_params,
+            )
+            self._write_client_pool_size = pool_size
+        return ShardedBatchWriter(self._write_client, self.therapy_table, n_threads)
+
+    def _get_batch_writer(self) -> ShardedBatchWriter | BatchWriter | ItemFileWriter:
+        """Construct writer to use for batched record uploads.
+
+        :return: item file writer if an export directory is configured, multi-threaded
+            writer if more than one write thread is configured, and boto3's standard
+            batch writer otherwise
+        """
+        if self._export_dir:
+            return ItemFileWriter(self._export_dir)
+        if self._write_threads > 1:
+            return self._get_sharded_batch_writer(self._write_threads)
+        return self.therapies.batch_writer()
+
     def list_tables(self) -> list[str]:
         """Return names of tables in database.
 
@@ -127,6 +630,17 @@ class DynamoDatabase(AbstractDatabase):
                 {"AttributeName": "concept_id", "AttributeType": "S"},
                 {"AttributeName": "src_name", "AttributeType": "S"},
                 {"AttributeName": "item_type", "AttributeType": "S"},
+                {"AttributeName": "priority", "AttributeType": "S"},
+            ],
+            LocalSecondaryIndexes=[
+                {
+                    "IndexName": PRIORITY_INDEX,
+                    "KeySchema": [
+                        {"AttributeName": "label_and_type", "KeyType": "HASH"},
+                        {"AttributeName": "priority", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "KEYS_ONLY"},
+                },
             ],
             GlobalSecondaryIndexes=[
                 {
@@ -151,6 +665,33 @@ class DynamoDatabase(AbstractDatabase):
             ProvisionedThroughput={"ReadCapacityUnits": 10, "WriteCapacityUnits": 10},
         )
 
+    def _check_priority_index(self) -> bool:
+        """Check whether the table has the priority index.
+
+        Local secondary indexes can only be defined when a table is created, so
+        tables created by earlier versions of Thera-Py lack it until they're dropped
+        and reloaded.
+
+        :return: True if the index is available
+        """
+        try:
+            indexes = self.therapies.local_secondary_indexes or []
+        except ClientError as e:
+            _logger.warning(
+                "Unable to describe table %s: %s",
+                self.therapy_table,
+                e.response["Error"]["Message"],
+            )
+            return False
+        if not any(index["IndexName"] == PRIORITY_INDEX for index in indexes):
+            _logger.warning(
+                "Table %s has no %s -- recreate it to speed up reference lookups",
+                self.therapy_table,
+                PRIORITY_INDEX,
+            )
+            return False
+        return True
+
     def check_schema_initialized(self) -> bool:
         """Check if database schema is properly initialized.
 
@@ -203,6 +744,7 @@ class DynamoDatabase(AbstractDatabase):
         """Create therapy_normalizer table if not already created."""
         if not self.check_schema_initialized():
             self._create_therapies_table()
+            self._has_priority_index = None
 
     def get_source_metadata(self, src_name: str | SourceName) -> SourceMeta | None:
         """Get license, versioning, data lookup, etc information for a source.
@@ -225,8 +767,73 @@ class DynamoDatabase(AbstractDatabase):
         self._cached_sources[src_name] = formatted_metadata
         return formatted_metadata
 
+    def get_source_versions(self) -> dict[SourceName, str]:
+        """Get version of each loaded source.
+
+        This is never cached, so that long-running processes can detect when a source
+        has been reloaded. Cached source metadata is replaced with the retrieved
+        metadata.
+
+        :return: mapping from source name to version, for each source with metadata
+        """
+        keys = [
+            {
+                "label_and_type": f"{src_name.value.lower()}##source",
+                "concept_id": f"source:{src_name.value.lower()}",
+            }
+            for src_name in SourceName
+        ]
+        items = []
+        request_items = {self.therapy_table: {"Keys": keys}}
+        try:
+            while request_items:
+                response = self.dynamodb.batch_get_item(RequestItems=request_items)
+                items.extend(response["Responses"].get(self.therapy_table, []))
+                request_items = response.get("UnprocessedKeys")
+        except ClientError as e:
+            _logger.exception(
+                "boto3 client error on get_source_versions: %s",
+                e.response["Error"]["Message"],
+            )
+            return {
+                SourceName(src_name): metadata.version
+                for src_name, metadata in self._cached_sources.items()
+            }
+        self._cached_sources = {item["src_name"]: SourceMeta(**item) for item in items}
+        return {
+            SourceName(src_name): metadata.version
+            for src_name, metadata in self._cached_sources.items()
+        }
+
+    def get_merge_run_id(self) -> str | None:
+        """Get ID of the most recently completed merge run.
+
+        This is never cached, so that long-running processes can detect when
+        normalized data has been regenerated. A new run also implies that sources may
+        have been reloaded, so cached source metadata is discarded when one is found.
+
+        :return: merge run ID, if normalized data has been generated
+        """
+        try:
+            item = self.therapies.get_item(Key=MERGE_RUN_KEY).get("Item")
+        except ClientError as e:
+            _logger.exception(
+                "boto3 client error on get_merge_run_id: %s",
+                e.response["Error"]["Message"],
+            )
+            return self._merge_run_id
+        merge_run_id = item["merge_run_id"] if item else None
+        if merge_run_id != self._merge_run_id:
+            self._cached_sources = {}
+            self._merge_run_id = merge_run_id
+        return merge_run_id
+
     def get_record_by_id(
-        self, concept_id: str, case_sensitive: bool = True, merge: bool = False
+        self,
+        concept_id: str,
+        case_sensitive: bool = True,
+        merge: bool = False,
+        fields: Collection[str] | None = None,
     ) -> dict | None:
         """Fetch record corresponding to provided concept ID
 
@@ -235,8 +842,14 @@ class DynamoDatabase(AbstractDatabase):
             Otherwise, performs filter operation, which doesn't require correct casing.
         :param merge: if true, look for merged record; look for identity record
             otherwise.
-        :return: complete therapy record, if match is found; None otherwise
+        :param fields: if given, only retrieve these record attributes
+        :return: therapy record, if match is found; None otherwise
         """
+        params: dict = {}
+        if fields is not None:
+            names = {f"#f{i}": field for i, field in enumerate(fields)}
+            params["ProjectionExpression"] = ",".join(names)
+            params["ExpressionAttributeNames"] = names
         try:
             if merge:
                 pk = f"{concept_id.lower()}##{RecordType.MERGER.value}"
@@ -244,13 +857,13 @@ class DynamoDatabase(AbstractDatabase):
                 pk = f"{concept_id.lower()}##{RecordType.IDENTITY.value}"
             if case_sensitive:
                 match = self.therapies.get_item(
-                    Key={"label_and_type": pk, "concept_id": concept_id}
+                    Key={"label_and_type": pk, "concept_id": concept_id}, **params
                 )
                 return match["Item"]
             exp = Key("label_and_type").eq(pk)
-            response = self.therapies.query(KeyConditionExpression=exp)
+            response = self.therapies.query(KeyConditionExpression=exp, **params)
             record = response["Items"][0]
-            del record["label_and_type"]
+            record.pop("label_and_type", None)
         except ClientError as e:
             _logger.exception(
                 "boto3 client error on get_records_by_id for search term %s: %s",
@@ -263,18 +876,32 @@ class DynamoDatabase(AbstractDatabase):
         else:
             return record
 
-    def get_refs_by_type(self, search_term: str, ref_type: RefType) -> list[str]:
+    def get_refs_by_type(
+        self,
+        search_term: str,
+        ref_type: RefType,
+        sources: Collection[str] | None = None,
+    ) -> list[str]:
         """Retrieve concept IDs for records matching the user's query. Other methods
         are responsible for actually retrieving full records.
 
         :param search_term: string to match against
         :param ref_type: type of match to look for.
+        :param sources: if given, only return concept IDs for records from these
+            sources (as ``SourceName`` values)
         :return: list of associated concept IDs. Empty if lookup fails.
         """
         pk = f"{search_term}##{ref_type.value.lower()}"
-        filter_exp = Key("label_and_type").eq(pk)
+        params = {
+            "KeyConditionExpression": Key("label_and_type").eq(pk),
+            "ProjectionExpression": "concept_id",
+        }
+        if sources is not None:
+            if not sources:
+                return []
+            params["FilterExpression"] = Attr("src_name").is_in(list(sources))
         try:
-            matches = self.therapies.query(KeyConditionExpression=filter_exp)
+            matches = self.therapies.query(**params)
             return [m["concept_id"] for m in matches.get("Items", None)]
         except ClientError as e:
             _logger.exception(
@@ -284,6 +911,134 @@ class DynamoDatabase(AbstractDatabase):
             )
             return []
 
+    def get_first_ref_by_type(self, search_term: str, ref_type: RefType) -> str | None:
+        """Retrieve the concept ID of the highest-priority record matching the user's
+        query, i.e. the record from the source with the best ``SourcePriority`` rank,
+        tiebroken by concept ID.
+
+        Reads a single item from the priority index. The index is sparse, so
+        references written without a ``priority`` attribute (i.e. by earlier versions
+        of Thera-Py) are absent from it. If it has no match, or the table was created
+        without it, fall back to reading every matching reference. Drop and reload
+        tables created by earlier versions to avoid the extra reads.
+
+        :param search_term: string to match against
+        :param ref_type: type of match to look for
+        :return: concept ID, if any records match
+        """
+        pk = f"{search_term}##{ref_type.value.lower()}"
+        filter_exp = Key("label_and_type").eq(pk)
+        if self._has_priority_index is None:
+            self._has_priority_index = self._check_priority_index()
+        if self._has_priority_index:
+            try:
+                matches = self.therapies.query(
+                    IndexName=PRIORITY_INDEX,
+                    KeyConditionExpression=filter_exp,
+                    Limit=1,
+                )
+            except ClientError as e:
+                _logger.exception(
+                    "boto3 client error on get_first_ref_by_type for search term %s: %s",
+                    search_term,
+                    e.response["Error"]["Message"],
+                )
+                return None
+            items = matches.get("Items")
+            if items:
+                return items[0]["concept_id"]
+
+        try:
+            matches = self.therapies.query(
+                KeyConditionExpression=filter_exp,
+                ProjectionExpression="concept_id,src_name",
+            )
+        except ClientError as e:
+            _logger.exception(
+                "boto3 client error on get_first_ref_by_type for search term %s: %s",
+                search_term,
+                e.response["Error"]["Message"],
+            )
+            return None
+        items = matches.get("Items")
+        if not items:
+            return None
+        first = min(
+            items,
+            key=lambda i: (
+                SourcePriority[SourceName(i["src_name"]).name],
+                i["concept_id"],
+            ),
+        )
+        return first["concept_id"]
+
+    def get_normalized_ref(self, term: str) -> dict | None:
+        """Retrieve the precomputed normalization result for a search term, as
+        generated alongside merged records.
+
+        Candidates are sorted by precedence (see ``add_normalized_ref()``), so only
+        the first needs to be retrieved.
+
+        :param term: lowercase, stripped search term
+        :return: item giving the normalized concept ID (``concept_id``), the name of
+            the ``MatchType`` achieved (``match_type``), whether the normalized
+            concept is a merged record (``merged``), and the data version that the
+            result was computed from (``data_version``), if available
+        """
+        pk = f"{term}##{NORMALIZED_REF_ITEM_TYPE}"
+        filter_exp = Key("label_and_type").eq(pk)
+        try:
+            matches = self.therapies.query(KeyConditionExpression=filter_exp, Limit=1)
+        except ClientError as e:
+            _logger.exception(
+                "boto3 client error on get_normalized_ref for search term %s: %s",
+                term,
+                e.response["Error"]["Message"],
+            )
+            return None
+        items = matches.get("Items")
+        if not items or "normalized_id" not in items[0]:
+            # no result, or one written in an older format
+            return None
+        item = items[0]
+        return {
+            "concept_id": item["normalized_id"],
+            "match_type": item["match_type"],
+            "merged": item["merged"],
+            "data_version": item.get("data_version"),
+        }
+
+    def get_term_filter(self) -> TermFilter | None:
+        """Retrieve filter over all searchable terms, as generated alongside merged
+        records.
+
+        :return: term filter, if available
+        """
+        items = []
+        params = {"KeyConditionExpression": Key("label_and_type").eq(TERM_FILTER_PK)}
+        try:
+            while True:
+                response = self.therapies.query(**params)
+                items += response.get("Items", [])
+                last_evaluated_key = response.get("LastEvaluatedKey")
+                if not last_evaluated_key:
+                    break
+                params["ExclusiveStartKey"] = last_evaluated_key
+        except ClientError as e:
+            _logger.exception(
+                "boto3 client error on get_term_filter: %s",
+                e.response["Error"]["Message"],
+            )
+            return None
+        if not items or len(items) != items[0]["num_chunks"]:
+            return None
+        return TermFilter.from_chunks(
+            (item["chunk"] for item in items),
+            int(items[0]["num_bits"]),
+            int(items[0]["num_hashes"]),
+            items[0]["data_version"],
+        )
+
     def get_rxnorm_id_by_brand(self, brand_id: str) -> str | None:
         """Given RxNorm brand ID, retrieve associated drug concept ID.
 
@@ -408,7 +1163,7 @@ class DynamoDatabase(AbstractDatabase):
         metadata_item["concept_id"] = f"source:{str(src_name_value).lower()}"
         metadata_item["item_type"] = "source"
         try:
-            self.therapies.put_item(Item=metadata_item)
+            self.batch.put_item(Item=metadata_item)
         except ClientError as e:
             raise DatabaseWriteError(e) from e
 
@@ -504,6 +1259,9 @@ class DynamoDatabase(AbstractDatabase):
             "concept_id": concept_id.lower(),
             "src_name": src_name.value,
             "item_type": ref_type,
+            # sort key for the priority index, in the same order as normalization
+            # ranks matching records
+            "priority": f"{SourcePriority[src_name.name]:02d}#{concept_id}",
         }
         try:
             self.batch.put_item(Item=record)
@@ -516,6 +1274,93 @@ class DynamoDatabase(AbstractDatabase):
                 e.response["Error"]["Message"],
             )
 
+    def add_normalized_ref(
+        self,
+        term: str,
+        concept_id: str,
+        match_type: MatchType,
+        merged: bool,
+        precedence: tuple[int, int, str],
+        data_version: str,
+    ) -> None:
+        """Add a candidate normalization result for a search term.
+
+        Candidates share a partition key, and are sorted by a key built from their
+        precedence, so each can be written as soon as it's found without overwriting
+        any other.
+
+        :param term: lowercase search term
+        :param concept_id: ID of normalized concept that the term resolves to
+        :param match_type: type of match that the term achieves
+        :param merged: whether the normalized concept is a merged record (rather than
+            an ungrouped identity record)
+        :param precedence: rank of the candidate, as a tuple of match rank, source
+            priority, and ID of the record that the term was found in
+        :param data_version: version of the data that the result was computed from
+        """
+        match_rank, source_rank, record_id = precedence
+        item = {
+            "label_and_type": f"{term}##{NORMALIZED_REF_ITEM_TYPE}",
+            "concept_id": f"{match_rank:02d}#{source_rank:02d}#{record_id}",
+            "normalized_id": concept_id.lower(),
+            "match_type": match_type.name,
+            "merged": merged,
+            "data_version": data_version,
+            "item_type": NORMALIZED_REF_ITEM_TYPE,
+        }
+        try:
+            self.batch.put_item(Item=item)
+        except ClientError as e:
+            _logger.exception(
+                "boto3 client error on add_normalized_ref for %s -> %s: %s",
+                term,
+                concept_id,
+                e.response["Error"]["Message"],
+            )
+
+    def add_term_filter(self, term_filter: TermFilter) -> None:
+        """Add filter over all searchable terms, replacing any existing one.
+
+        :param term_filter: filter to store
+        """
+        chunks = term_filter.to_chunks(TERM_FILTER_CHUNK_SIZE)
+        for i, chunk in enumerate(chunks):
+            item = {
+                "label_and_type": TERM_FILTER_PK,
+                "concept_id": f"term_filter:{i:05d}",
+                "chunk": chunk,
+                "num_chunks": len(chunks),
+                "num_bits": term_filter.num_bits,
+                "num_hashes": term_filter.num_hashes,
+                "data_version": term_filter.data_version,
+                "item_type": TERM_FILTER_ITEM_TYPE,
+            }
+            try:
+                self.batch.put_item(Item=item)
+            except ClientError as e:
+                _logger.exception(
+                    "boto3 client error on add_term_filter: %s",
+                    e.response["Error"]["Message"],
+                )
+
+    def add_merge_run_id(self, merge_run_id: str) -> None:
+        """Record completion of a merge run, replacing any previous one.
+
+        :param merge_run_id: ID of merge run
+        """
+        item = {
+            **MERGE_RUN_KEY,
+            "merge_run_id": merge_run_id,
+            "item_type": MERGE_RUN_ITEM_TYPE,
+        }
+        try:
+            self.batch.put_item(Item=item)
+        except ClientError as e:
+            _logger.exception(
+                "boto3 client error on add_merge_run_id: %s",
+                e.response["Error"]["Message"],
+            )
+
     def update_merge_ref(self, concept_id: str, merge_ref: str) -> None:
         """Update the merged record reference of an individual record to a new value.
 
@@ -523,6 +1368,9 @@ class DynamoDatabase(AbstractDatabase):
         :param merge_ref: new ref value
         :raise DatabaseWriteError: if attempting to update non-existent record
         """
+        if isinstance(self.batch, ItemFileWriter):
+            self.batch.update_merge_ref(concept_id, merge_ref)
+            return
         label_and_type = f"{concept_id.lower()}##identity"
         key = {"label_and_type": label_and_type, "concept_id": concept_id}
         update_expression = "set merge_ref=:r"
@@ -546,36 +1394,44 @@ class DynamoDatabase(AbstractDatabase):
             )
 
     def delete_normalized_concepts(self) -> None:
-        """Remove merged records from the database. Use when performing a new update
-        of normalized data.
+        """Remove merged records, precomputed normalization results for search terms,
+        the term filter, and the merge run ID from the database. Use when performing a
+        new update of normalized data.
 
         :raise DatabaseReadError: if DB client requires separate read calls and
             encounters a failure in the process
         :raise DatabaseWriteError: if deletion call fails
         """
-        while True:
-            with self.therapies.batch_writer(
-                overwrite_by_pkeys=["label_and_type", "concept_id"]
-            ) as batch:
-                try:
-                    response = self.therapies.query(
-                        IndexName="item_type_index",
-                        KeyConditionExpression=Key("item_type").eq(
-                            RecordType.MERGER.value
-                        ),
-                    )
-                except ClientError as e:
-                    raise DatabaseReadError(e) from e
-                records = response["Items"]
-                if not records:
-                    break
-                for record in records:
-                    batch.delete_item(
-                        Key={
-                            "label_and_type": record["label_and_type"],
-                            "concept_id": record["concept_id"],
-                        }
-                    )
+        if isinstance(self.batch, ItemFileWriter):
+            self.batch.delete_normalized_concepts()
+            return
+        for item_type in (
+            RecordType.MERGER.value,
+            NORMALIZED_REF_ITEM_TYPE,
+            TERM_FILTER_ITEM_TYPE,
+            MERGE_RUN_ITEM_TYPE,
+        ):
+            while True:
+                with self.therapies.batch_writer(
+                    overwrite_by_pkeys=["label_and_type", "concept_id"]
+                ) as batch:
+                    try:
+                        response = self.therapies.query(
+                            IndexName="item_type_index",
+                            KeyConditionExpression=Key("item_type").eq(item_type),
+                        )
+                    except ClientError as e:
+                        raise DatabaseReadError(e) from e
+                    records = response["Items"]
+                    if not records:
+                        break
+                    for record in records:
+                        batch.delete_item(
+                            Key={
+                                "label_and_type": record["label_and_type"],
+                                "concept_id": record["concept_id"],
+                            }
+                        )
 
     def delete_source(self, src_name: SourceName) -> None:
         """Delete all data for a source. Use when updating source data.
@@ -585,6 +1441,9 @@ class DynamoDatabase(AbstractDatabase):
             encounters a failure in the process
         :raise DatabaseWriteError: if deletion call fails
         """
+        if self._export_dir:
+            shutil.rmtree(self._export_dir / src_name.value.lower(), ignore_errors=True)
+            return
         while True:
             try:
                 response = self.therapies.query(
@@ -610,10 +1469,41 @@ class DynamoDatabase(AbstractDatabase):
                     except ClientError as e:
                         raise DatabaseWriteError(e) from e
 
+    def load_item_files(self, item_dir: Path, n_threads: int = 8) -> int:
+        """Bulk load DynamoDB JSON item files, as produced by :py:class:`ItemFileWriter`,
+        into the database.
+
+        :param item_dir: directory containing item file partitions
+        :param n_threads: number of concurrent writer threads
+        :return: number of items loaded
+        :raise DatabaseWriteError: if any items fail to be written
+        """
+        partitions = sorted(
+            (p for p in item_dir.iterdir() if p.is_dir()),
+            key=lambda p: (p.name == MERGER_PARTITION, p.name),
+        )
+        deserializer = TypeDeserializer()
+        n_items = 0
+        with self._get_sharded_batch_writer(n_threads) as writer:
+            for partition in partitions:
+                _logger.info("Loading item files from %s", partition)
+                for item_file in sorted(partition.glob("items_*.json.gz")):
+                    with gzip.open(item_file, "rt", encoding="utf-8") as f:
+                        for line in f:
+                            item = json.loads(line)["Item"]
+                            writer.put_item(
+                                Item={
+                                    k: deserializer.deserialize(v)
+                                    for k, v in item.items()
+                                }
+                            )
+                            n_items += 1
+        return n_items
+
     def complete_write_transaction(self) -> None:
         """Conclude transaction or batch writing if relevant."""
         self.batch.__exit__(*sys.exc_info())
-        self.batch = self.therapies.batch_writer()
+        self.batch = self._get_batch_writer()
 
     def close_connection(self) -> None:
         """Perform any manual connection closure procedures if necessary."""
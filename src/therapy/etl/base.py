@@ -3,14 +3,20 @@
 import contextlib
 import json
 import logging
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Generator, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import ClassVar
 
 import click
+from disease import __version__ as disease_normalizer_version
 from disease.database import create_db as create_disease_db
 from disease.query import QueryHandler as DiseaseNormalizer
+from disease.schemas import SourceName as DiseaseSourceName
 from pydantic import ValidationError
+from tqdm import tqdm
 from wags_tails import (
     ChemblData,
     ChemIDplusData,
@@ -23,11 +29,13 @@ from wags_tails import (
     NcitData,
     RxNormData,
 )
+from wags_tails.utils.storage import get_data_dir
 
 from therapy import ITEM_TYPES, PREFIX_LOOKUP
 from therapy.database import AbstractDatabase
+from therapy.etl.disease_cache import DiseaseCache
 from therapy.etl.rules import Rules
-from therapy.schemas import RefType, SourceName, Therapy
+from therapy.schemas import ApprovalRating, RefType, SourceName, Therapy
 
 _logger = logging.getLogger(__name__)
 
@@ -48,6 +56,65 @@ class EtlError(Exception):
     """Raise for data transform errors."""
 
 
+_LISTLIKE_FIELDS = (
+    "aliases",
+    "trade_names",
+    "xrefs",
+    "associated_with",
+    "approval_year",
+)
+_APPROVAL_RATINGS = frozenset(rating.value for rating in ApprovalRating)
+
+
+def _is_str_collection(value: object) -> bool:
+    """Check whether value is a list-like collection of strings.
+
+    :param value: value to check
+    :return: True if value is a list, set, or tuple containing only strings
+    """
+    return isinstance(value, list | set | tuple) and all(
+        isinstance(v, str) for v in value
+    )
+
+
+def _check_record_structure(therapy: dict) -> str | None:
+    """Perform a lightweight check that a record matches the ``Therapy`` schema.
+
+    This covers the types and values produced by the source transforms, without the
+    cost of constructing a ``Therapy`` model. It isn't as thorough as full model
+    validation (e.g. it doesn't check values inside ``supplemental_info``).
+
+    :param therapy: record to check
+    :return: description of the first problem found, or None if record looks valid
+    """
+    if not isinstance(therapy.get("concept_id"), str):
+        return "concept_id must be a string"
+    label = therapy.get("label")
+    if label is not None and not isinstance(label, str):
+        return "label must be a string"
+    for field in _LISTLIKE_FIELDS:
+        value = therapy.get(field)
+        if value is not None and not _is_str_collection(value):
+            return f"{field} must be a list of strings"
+    ratings = therapy.get("approval_ratings")
+    if ratings is not None and not (
+        _is_str_collection(ratings) and all(r in _APPROVAL_RATINGS for r in ratings)
+    ):
+        return "approval_ratings must be a list of approval rating values"
+    indications = therapy.get("has_indication")
+    if indications is not None:
+        if not isinstance(indications, list):
+            return "has_indication must be a list"
+        for indication in indications:
+            if not (
+                isinstance(indication, dict)
+                and isinstance(indication.get("disease_id"), str)
+                and isinstance(indication.get("disease_label"), str)
+            ):
+                return "has_indication members must provide disease ID and label"
+    return None
+
+
 class Base(ABC):
     """The ETL base class.
 
@@ -62,15 +129,19 @@ class Base(ABC):
         database: AbstractDatabase,
         data_path: Path | None = None,
         silent: bool = True,
+        fast_validation: bool = False,
     ) -> None:
         """Extract from sources.
 
         :param database: application database object
         :param data_path: path to app data directory
         :param silent: if True, don't print ETL results to console
+        :param fast_validation: if True, check records with a lightweight structural
+            check instead of full Pydantic model validation
         """
         # self._name = SourceName[self.__class__.__name__.upper()]
         self._silent = silent
+        self._fast_validation = fast_validation
         self._name = SourceName(self.__class__.__name__)
         self._data_source: (
             ChemblData
@@ -134,6 +205,29 @@ class Base(ABC):
         """
         raise NotImplementedError
 
+    def _read_lines(self, path: Path) -> Generator[str, None, None]:
+        """Read UTF-8 text file one line at a time, reporting progress by bytes read.
+
+        Useful for large files where counting records in advance to size a progress bar
+        would require an extra pass over the file.
+
+        :param path: location of file
+        :return: generator of lines, including line endings
+        """
+        with (
+            path.open("rb") as f,
+            tqdm(
+                total=path.stat().st_size,
+                unit="B",
+                unit_scale=True,
+                ncols=80,
+                disable=self._silent,
+            ) as progress,
+        ):
+            for line in f:
+                progress.update(len(line))
+                yield line.decode("utf-8")
+
     @staticmethod
     def _process_excess_xrefs(xrefs: list[str]) -> list[str]:
         """If there are too many xrefs, drop the ones that we don't need for
@@ -260,12 +354,21 @@ class Base(ABC):
             * removing empty fields
 
         :param therapy: valid therapy object.
+        :raise ValidationError: if record fails full validation
+        :raise EtlError: if record fails fast validation
         """
-        try:
-            Therapy(**therapy)
-        except ValidationError:
-            _logger.exception("Attempted to load invalid therapy: %s", therapy)
-            raise
+        if self._fast_validation:
+            problem = _check_record_structure(therapy)
+            if problem:
+                _logger.error("Attempted to load invalid therapy: %s", therapy)
+                msg = f"Invalid therapy {therapy.get('concept_id')}: {problem}"
+                raise EtlError(msg)
+        else:
+            try:
+                Therapy(**therapy)
+            except ValidationError:
+                _logger.exception("Attempted to load invalid therapy: %s", therapy)
+                raise
 
         therapy = self._rules.apply_rules_to_therapy(therapy)
         therapy = self._process_searchable_attributes(therapy)
@@ -276,24 +379,117 @@ class Base(ABC):
 
 
 class DiseaseIndicationBase(Base):
-    """Base class for sources that require disease normalization capabilities."""
+    """Base class for sources that require disease normalization capabilities.
+
+    Normalization results are held in memory for the duration of the process. While
+    ``perform_etl()`` runs, they're also persisted to a local SQLite file (by default,
+    under the wags-tails data directory) for use in subsequent ETL runs. Both layers
+    are discarded whenever the Disease Normalizer's data version changes.
+    """
 
     _disease_cache: ClassVar[dict[str, str | None]] = {}
+    _disease_cache_version: ClassVar[str | None] = None
+    # number of concurrent threads to use when prefetching disease normalizations
+    _disease_lookup_workers: ClassVar[int] = 8
 
     def __init__(
         self,
         database: AbstractDatabase,
         data_path: Path | None = None,
         silent: bool = True,
+        fast_validation: bool = False,
+        disease_cache_path: Path | None = None,
+        persist_disease_cache: bool = True,
     ) -> None:
         """Initialize source ETL instance.
 
         :param database: application database object
         :param data_path: path to app data directory
         :param silent: if True, don't print ETL results to console
+        :param fast_validation: if True, check records with a lightweight structural
+            check instead of full Pydantic model validation
+        :param disease_cache_path: location of persistent disease normalization cache.
+            Defaults to ``disease_cache.db`` under the Thera-Py data directory.
+        :param persist_disease_cache: if False, only hold disease normalization
+            results in memory
         """
-        super().__init__(database, data_path, silent)
-        self.disease_normalizer = DiseaseNormalizer(create_disease_db())
+        super().__init__(database, data_path, silent, fast_validation)
+        self.disease_normalizer = self._create_disease_normalizer()
+        self._disease_lookup_thread_state = threading.local()
+        self._disease_data_version = self._get_disease_data_version()
+        if self._disease_data_version != DiseaseIndicationBase._disease_cache_version:
+            DiseaseIndicationBase._disease_cache.clear()
+            DiseaseIndicationBase._disease_cache_version = self._disease_data_version
+        if disease_cache_path is None and persist_disease_cache:
+            disease_cache_path = get_data_dir() / "thera_py" / "disease_cache.db"
+        self._disease_cache_path = disease_cache_path
+        self._persistent_disease_cache: DiseaseCache | None = None
+
+    @staticmethod
+    def _create_disease_normalizer() -> DiseaseNormalizer:
+        """Construct a disease normalizer with its own DB connection.
+
+        :return: disease normalizer instance
+        """
+        return DiseaseNormalizer(create_disease_db())
+
+    def _get_disease_data_version(self) -> str:
+        """Construct an identifier for the data used by the disease normalizer,
+        from the package version and the version of each of its sources.
+
+        :return: version string, e.g. ``"0.11.3|NCIt:24.01e;Mondo:2024-01-03;..."``
+        """
+        source_versions = []
+        for source in DiseaseSourceName:
+            meta = self.disease_normalizer.db.get_source_metadata(source)
+            source_versions.append(f"{source.value}:{meta.version if meta else None}")
+        return f"{disease_normalizer_version}|{';'.join(source_versions)}"
+
+    def perform_etl(self, use_existing: bool = False) -> list[str]:
+        """Public-facing method to begin ETL procedures on given data. Opens the
+        persistent disease normalization cache for the duration of the run, and ensures
+        that newly-cached results are saved once complete.
+
+        :param use_existing: if True, don't try to retrieve latest source data
+        :return: list of concept IDs which were successfully processed and
+            uploaded.
+        """
+        if self._disease_cache_path is None:
+            return super().perform_etl(use_existing)
+        self._persistent_disease_cache = DiseaseCache(
+            self._disease_cache_path, self._disease_data_version
+        )
+        try:
+            return super().perform_etl(use_existing)
+        finally:
+            self._persistent_disease_cache.close()
+            self._persistent_disease_cache = None
+
+    def _prefetch_diseases(self, queries: Iterable[str]) -> None:
+        """Normalize a batch of disease terms concurrently, so that later calls to
+        ``_normalize_disease()`` for them are served from cache.
+
+        Duplicate and already-cached terms are skipped. The disease normalizer's DB
+        connection (a boto3 resource) isn't thread-safe, so each worker thread
+        constructs its own normalizer.
+
+        :param queries: terms to normalize
+        """
+        terms = {q.lower() for q in queries} - self._disease_cache.keys()
+        if not terms:
+            return
+        _logger.debug("Prefetching normalized IDs for %s disease terms", len(terms))
+        with ThreadPoolExecutor(
+            max_workers=self._disease_lookup_workers,
+            initializer=self._init_disease_lookup_worker,
+        ) as executor:
+            list(executor.map(self._normalize_disease, terms))
+
+    def _init_disease_lookup_worker(self) -> None:
+        """Give the current worker thread its own disease normalizer."""
+        self._disease_lookup_thread_state.disease_normalizer = (
+            self._create_disease_normalizer()
+        )
 
     def _normalize_disease(self, query: str) -> str | None:
         """Attempt normalization of disease term.
@@ -304,13 +500,26 @@ class DiseaseIndicationBase(Base):
         term = query.lower()
         if term in self._disease_cache:
             return self._disease_cache[term]
-        response = self.disease_normalizer.normalize(term)
+        persistent_cache = self._persistent_disease_cache
+        if persistent_cache is not None:
+            found, normalized_id = persistent_cache.get(term)
+            if found:
+                self._disease_cache[term] = normalized_id
+                return normalized_id
+        disease_normalizer = getattr(
+            self._disease_lookup_thread_state,
+            "disease_normalizer",
+            self.disease_normalizer,
+        )
+        response = disease_normalizer.normalize(term)
         normalized_id = (
             response.disease.id.split("normalize.disease.")[-1]
             if response.disease
             else None
         )
         self._disease_cache[term] = normalized_id
+        if persistent_cache is not None:
+            persistent_cache.set(term, normalized_id)
         if normalized_id is None:
             _logger.warning("Failed to normalize disease term: %s", query)
         return normalized_id
@@ -89,6 +89,25 @@ class ChEMBL(DiseaseIndicationBase):
             return indications
         return []
 
+    def _prefetch_indications(self, rows: list[sqlite3.Row]) -> None:
+        """Normalize indication terms for all rows up front.
+
+        ``_get_indications()`` tries each term of an indication (MeSH ID, EFO ID, MeSH
+        heading, EFO term) in order until one normalizes, so terms are prefetched in
+        the same stages to avoid looking up terms that would never be needed.
+
+        :param rows: rows retrieved from ChEMBL DB
+        """
+        remaining = {
+            tuple(group.split("||")[:4])
+            for row in rows
+            if row["indications"]
+            for group in row["indications"].split("|||")
+        }
+        for i in range(4):
+            self._prefetch_diseases(group[i] for group in remaining)
+            remaining = {g for g in remaining if self._normalize_disease(g[i]) is None}
+
     def _transform_data(self) -> None:
         """Transform SQLite data and load to DB."""
         conn = sqlite3.connect(self._data_file)  # type: ignore
@@ -154,8 +173,10 @@ class ChEMBL(DiseaseIndicationBase):
         GROUP BY md.molregno;
         """
         self._cursor.execute(query)
+        rows = list(self._cursor)
+        self._prefetch_indications(rows)
 
-        for row in tqdm(list(self._cursor), ncols=80, disable=self._silent):
+        for row in tqdm(rows, ncols=80, disable=self._silent):
             appr_ratings = []
             max_phase = self._get_approval_rating(row["max_phase"])
             if max_phase is not None:
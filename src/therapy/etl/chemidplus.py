@@ -19,7 +19,13 @@ from therapy.schemas import (
     SourceName,
 )
 
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
 TAGS_REGEX = r" \[.*\]"
+TAGS_PATTERN = re.compile(TAGS_REGEX)
 
 
 class ChemIDplus(Base):
@@ -28,10 +34,23 @@ class ChemIDplus(Base):
     @staticmethod
     def parse_xml(path: Path, tag: str) -> Generator:
         """Parse XML file and retrieve elements with matching tag value.
+
+        If lxml is installed, it's used to parse only elements with the given tag.
+        Otherwise, falls back to the standard library parser.
+
         :param Path path: path to XML file
         :param str tag: XML tag
         :return: generator yielding elements of corresponding tag
         """
+        if lxml_etree is not None:
+            for _, elem in lxml_etree.iterparse(str(path), events=("end",), tag=tag):
+                yield elem
+                # free memory held by this element and already-processed siblings
+                elem.clear(keep_tail=True)
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+            return
+
         context = iter(ElTree.iterparse(path, events=("start", "end")))  # noqa: S314
         _, root = next(context)
         for event, elem in context:
@@ -39,6 +58,58 @@ class ChemIDplus(Base):
                 yield elem
                 root.clear()
 
+    @staticmethod
+    def _get_record(chemical: ElTree.Element) -> RecordParams | None:
+        """Construct therapy record from a ChemIDplus chemical element.
+
+        :param chemical: ``Chemical`` element from either the lxml or standard library
+            parser
+        :return: record params, or None if the chemical lacks a tagged display name or
+            a CAS registry number
+        """
+        display_name = chemical.get("displayName")
+        if not display_name or not TAGS_PATTERN.search(display_name):
+            return None
+        label = TAGS_PATTERN.sub("", display_name)
+        params: RecordParams = {"label": label}
+
+        # get concept ID
+        reg_no = chemical.find("NumberList").find("CASRegistryNumber")  # type: ignore
+        if reg_no is None or not len(reg_no):
+            return None
+        params["concept_id"] = f"{NamespacePrefix.CASREGISTRY.value}:{reg_no.text}"
+
+        # get aliases
+        aliases = []
+        label_l = label.lower()
+        name_list = chemical.find("NameList")
+        if name_list is not None:
+            for name in name_list.findall("NameOfSubstance"):
+                text = name.text
+                if text != display_name and text.lower() != label_l:  # type: ignore
+                    aliases.append(TAGS_PATTERN.sub("", text))  # type: ignore
+        params["aliases"] = aliases
+
+        # get xrefs and associated_with
+        params["xrefs"] = []
+        params["associated_with"] = []
+        locator_list = chemical.find("LocatorList")
+        if locator_list is not None:
+            for loc in locator_list.findall("InternetLocator"):
+                if loc.text == "DrugBank":
+                    db = (
+                        f"{NamespacePrefix.DRUGBANK.value}:"
+                        f"{loc.attrib['url'].split('/')[-1]}"
+                    )
+                    params["xrefs"].append(db)  # type: ignore
+                elif loc.text == "FDA SRS":
+                    unii = (
+                        f"{NamespacePrefix.UNII.value}:"
+                        f"{loc.attrib['url'].split('/')[-1]}"
+                    )
+                    params["associated_with"].append(unii)  # type: ignore
+        return params
+
     def _transform_data(self) -> None:
         """Open dataset and prepare for loading into database."""
         parser = self.parse_xml(self._data_file, "Chemical")  # type: ignore
@@ -47,56 +118,10 @@ class ChemIDplus(Base):
         with Console(color_system=None).status(
             "Loading ChemIDplus records...", spinner="dots"
         ):
-            for chemical in parser:  # type: ignore
-                if "displayName" not in chemical.attrib:
-                    continue
-
-                # initial setup and get label
-                display_name = chemical.attrib["displayName"]
-                if not display_name or not re.search(TAGS_REGEX, display_name):
-                    continue
-                label = re.sub(TAGS_REGEX, "", display_name)
-                params: RecordParams = {"label": label}
-
-                # get concept ID
-                reg_no = chemical.find("NumberList").find("CASRegistryNumber")
-                if not reg_no:
-                    continue
-                params["concept_id"] = (
-                    f"{NamespacePrefix.CASREGISTRY.value}:{reg_no.text}"
-                )
-
-                # get aliases
-                aliases = []
-                label_l = label.lower()
-                name_list = chemical.find("NameList")
-                if name_list:
-                    for name in name_list.findall("NameOfSubstance"):
-                        text = name.text
-                        if text != display_name and text.lower() != label_l:
-                            aliases.append(re.sub(TAGS_REGEX, "", text))
-                params["aliases"] = aliases
-
-                # get xrefs and associated_with
-                params["xrefs"] = []
-                params["associated_with"] = []
-                locator_list = chemical.find("LocatorList")
-                if locator_list:
-                    for loc in locator_list.findall("InternetLocator"):
-                        if loc.text == "DrugBank":
-                            db = (
-                                f"{NamespacePrefix.DRUGBANK.value}:"
-                                f"{loc.attrib['url'].split('/')[-1]}"
-                            )
-                            params["xrefs"].append(db)  # type: ignore
-                        elif loc.text == "FDA SRS":
-                            unii = (
-                                f"{NamespacePrefix.UNII.value}:"
-                                f"{loc.attrib['url'].split('/')[-1]}"
-                            )
-                            params["associated_with"].append(unii)  # type: ignore
-
-                self._load_therapy(params)
+            for chemical in parser:
+                params = self._get_record(chemical)
+                if params is not None:
+                    self._load_therapy(params)
 
     def _load_meta(self) -> None:
         """Add source metadata."""
@@ -0,0 +1,109 @@
+"""Provide persistent storage for disease normalization results."""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+_logger = logging.getLogger(__name__)
+
+
+class DiseaseCache:
+    """Store disease term normalization results in a local SQLite file, so that
+    repeated ETL runs can skip lookups against the Disease Normalizer.
+
+    Entries are keyed to a data version string. If the cache is opened with a version
+    that differs from the one it was populated under, all existing entries are
+    discarded. Instances may be shared between threads.
+
+    >>> from pathlib import Path
+    >>> from therapy.etl.disease_cache import DiseaseCache
+    >>> cache = DiseaseCache(Path("disease_cache.db"), "Mondo:2024-01-03")
+    >>> cache.set("lung cancer", "mondo:0008903")
+    >>> cache.get("lung cancer")
+    (True, 'mondo:0008903')
+    >>> cache.get("not a disease")
+    (False, None)
+    """
+
+    def __init__(
+        self, db_path: Path, version: str, commit_interval: int = 1000
+    ) -> None:
+        """Open cache file, clearing it if it was built from different data.
+
+        :param db_path: location of SQLite file (created if it doesn't exist)
+        :param version: identifier for the disease data currently in use
+        :param commit_interval: number of new entries to hold before committing them
+        """
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS normalized_terms "
+            "(term TEXT PRIMARY KEY, normalized_id TEXT)"
+        )
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+        if row is None or row[0] != version:
+            _logger.info(
+                "Disease data version changed from %s to %s -- clearing cache at %s",
+                row[0] if row else None,
+                version,
+                db_path,
+            )
+            self._conn.execute("DELETE FROM normalized_terms")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                (version,),
+            )
+            self._conn.commit()
+        self._commit_interval = commit_interval
+        self._pending = 0
+
+    def get(self, term: str) -> tuple[bool, str | None]:
+        """Look up cached normalization result.
+
+        :param term: lowercased disease term
+        :return: whether the term was found, and its normalized ID (which may be None
+            if normalization previously failed)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT normalized_id FROM normalized_terms WHERE term = ?", (term,)
+            ).fetchone()
+        if row is None:
+            return False, None
+        return True, row[0]
+
+    def set(self, term: str, normalized_id: str | None) -> None:
+        """Store normalization result.
+
+        :param term: lowercased disease term
+        :param normalized_id: normalized concept ID, or None if normalization failed
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO normalized_terms (term, normalized_id) VALUES (?, ?)",
+                (term, normalized_id),
+            )
+            self._pending += 1
+            if self._pending >= self._commit_interval:
+                self._conn.commit()
+                self._pending = 0
+
+    def commit(self) -> None:
+        """Write any pending entries to disk."""
+        with self._lock:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        """Commit pending entries and close connection."""
+        self.commit()
+        self._conn.close()
@@ -3,8 +3,6 @@
 import csv
 from typing import Any
 
-from tqdm import tqdm
-
 from therapy.etl.base import Base
 from therapy.schemas import NamespacePrefix, SourceMeta, SourceName
 
@@ -29,41 +27,45 @@ class DrugBank(Base):
         self.database.add_source_metadata(SourceName.DRUGBANK, metadata)
 
     def _transform_data(self) -> None:
-        """Transform the DrugBank source."""
-        with self._data_file.open() as file:  # type: ignore
-            reader = list(csv.reader(file))
-            for row in tqdm(reader[1:], ncols=80, disable=self._silent):
-                # get concept ID
-                params: dict[str, Any] = {
-                    "concept_id": f"{NamespacePrefix.DRUGBANK.value}:{row[0]}",
-                }
+        """Transform the DrugBank source.
+
+        Rows are read and loaded one at a time, so memory use doesn't grow with the size
+        of the source file.
+        """
+        reader = csv.reader(self._read_lines(self._data_file))  # type: ignore
+        next(reader)  # skip header
+        for row in reader:
+            # get concept ID
+            params: dict[str, Any] = {
+                "concept_id": f"{NamespacePrefix.DRUGBANK.value}:{row[0]}",
+            }
 
-                # get label
-                label = row[2]
-                if label:
-                    params["label"] = label
+            # get label
+            label = row[2]
+            if label:
+                params["label"] = label
 
-                # get aliases
-                aliases = [a for a in row[1].split(" | ") + row[5].split(" | ") if a]
-                if aliases:
-                    params["aliases"] = aliases
+            # get aliases
+            aliases = [a for a in row[1].split(" | ") + row[5].split(" | ") if a]
+            if aliases:
+                params["aliases"] = aliases
 
-                # get CAS reference
-                cas_ref = row[3]
-                if cas_ref:
-                    params["xrefs"] = [f"{NamespacePrefix.CHEMIDPLUS.value}:{row[3]}"]
+            # get CAS reference
+            cas_ref = row[3]
+            if cas_ref:
+                params["xrefs"] = [f"{NamespacePrefix.CHEMIDPLUS.value}:{row[3]}"]
 
-                params["associated_with"] = []
-                # get inchi key
-                if len(row) >= 7:
-                    inchi_key = row[6]
-                    if inchi_key:
-                        inchi_id = f"{NamespacePrefix.INCHIKEY.value}:{inchi_key}"
-                        params["associated_with"].append(inchi_id)
-                # get UNII id
-                unii = row[4]
-                if unii:
-                    unii_id = f"{NamespacePrefix.UNII.value}:{unii}"
-                    params["associated_with"].append(unii_id)
+            params["associated_with"] = []
+            # get inchi key
+            if len(row) >= 7:
+                inchi_key = row[6]
+                if inchi_key:
+                    inchi_id = f"{NamespacePrefix.INCHIKEY.value}:{inchi_key}"
+                    params["associated_with"].append(inchi_id)
+            # get UNII id
+            unii = row[4]
+            if unii:
+                unii_id = f"{NamespacePrefix.UNII.value}:{unii}"
+                params["associated_with"].append(unii_id)
 
-                self._load_therapy(params)
+            self._load_therapy(params)
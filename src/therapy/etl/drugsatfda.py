@@ -2,10 +2,13 @@
 
 import json
 import logging
+import re
+from collections.abc import Generator
+from typing import TextIO
 
 from tqdm import tqdm
 
-from therapy.etl.base import Base
+from therapy.etl.base import Base, SourceFormatError
 from therapy.schemas import (
     ApprovalRating,
     NamespacePrefix,
@@ -15,6 +18,120 @@ from therapy.schemas import (
 
 _logger = logging.getLogger(__name__)
 
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _JsonStreamReader:
+    """Read consecutive JSON values from a text stream without loading all of it.
+
+    Only enough of the stream is buffered to decode the next value, so memory use is
+    bounded by the size of the largest individual value rather than the whole file.
+    """
+
+    def __init__(
+        self, stream: TextIO, chunk_size: int = 1 << 20, max_value_size: int = 1 << 26
+    ) -> None:
+        """Initialize reader.
+
+        :param stream: open text stream
+        :param chunk_size: number of characters to read from stream at a time
+        :param max_value_size: max number of characters to buffer while decoding a
+            single value. Individual Drugs@FDA records are far smaller, so a value
+            that can't be decoded within this limit is treated as malformed rather
+            than incomplete.
+        """
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._max_value_size = max_value_size
+        self._buffer = ""
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        """Read next chunk from stream, discarding already-consumed characters.
+
+        :return: False if stream is exhausted
+        """
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Get next non-whitespace character without consuming it.
+
+        :return: next character, or empty string if stream is exhausted
+        """
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume next non-whitespace character.
+
+        :param char: expected character
+        :raise SourceFormatError: if next character is something else
+        """
+        found = self.peek()
+        if found != char:
+            msg = f"Expected '{char}' in Drugs@FDA JSON, found '{found}'"
+            raise SourceFormatError(msg)
+        self._pos += 1
+
+    def decode(self) -> object:
+        """Consume and decode next JSON value.
+
+        :return: decoded value
+        :raise SourceFormatError: if the stream ends before a complete value is read, or
+            no complete value is read within the max value size
+        """
+        self.peek()
+        decoder = json.JSONDecoder()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if len(self._buffer) - self._pos > self._max_value_size:
+                    msg = f"Malformed Drugs@FDA JSON: {e}"
+                    raise SourceFormatError(msg) from e
+                if not self._fill():
+                    msg = "Unexpected end of Drugs@FDA JSON"
+                    raise SourceFormatError(msg) from e
+            else:
+                # a value at the very end of the buffer (e.g. a number) may be cut off
+                if end < len(self._buffer) or not self._fill():
+                    self._pos = end
+                    return value
+
+
+def _iter_results(stream: TextIO) -> Generator[dict, None, None]:
+    """Yield members of the top-level ``results`` array of an openFDA download, one at
+    a time.
+
+    :param stream: open Drugs@FDA JSON file
+    :return: generator of Drugs@FDA application objects
+    """
+    reader = _JsonStreamReader(stream)
+    reader.expect("{")
+    while reader.peek() != "}":
+        key = reader.decode()
+        reader.expect(":")
+        if key != "results":
+            reader.decode()
+        else:
+            reader.expect("[")
+            while reader.peek() != "]":
+                yield reader.decode()  # type: ignore
+                if reader.peek() == ",":
+                    reader.expect(",")
+            reader.expect("]")
+        if reader.peek() == ",":
+            reader.expect(",")
+
 
 class DrugsAtFDA(Base):
     """Class for Drugs@FDA ETL methods."""
@@ -61,83 +178,92 @@ class DrugsAtFDA(Base):
         return statuses_map.get(statuses[0])
 
     def _transform_data(self) -> None:
-        """Prepare source data for loading into DB."""
+        """Prepare source data for loading into DB.
+
+        Applications are parsed and loaded one at a time, rather than reading the full
+        (very large) data file into memory up front.
+        """
         with self._data_file.open() as f:  # type: ignore
-            data = json.load(f)["results"]
-
-        for result in tqdm(data, ncols=80, disable=self._silent):
-            if "products" not in result:
-                continue
-            products = result["products"]
-
-            app_no = result["application_number"]
-            if app_no.startswith("NDA"):
-                namespace = NamespacePrefix.DRUGSATFDA_NDA.value
-            elif app_no.startswith("ANDA"):
-                namespace = NamespacePrefix.DRUGSATFDA_ANDA.value
-            else:
-                # ignore biologics license applications (tentative)
-                continue
-            concept_id = f"{namespace}:{app_no.split('NDA')[-1]}"
-            therapy: RecordParams = {"concept_id": concept_id}
-
-            rating = self._get_marketing_status_rating(products, concept_id)
-            if rating:
-                therapy["approval_ratings"] = [rating]
-
-            brand_names = [p["brand_name"] for p in products]
-
-            aliases = []
-            if "openfda" in result:
-                openfda = result["openfda"]
-                brand_name = openfda.get("brand_name")
-                if brand_name:
-                    brand_names += brand_name
-
-                substances = openfda.get("substance_name", [])
-                n_substances = len(set(substances))
-                if n_substances > 1:
-                    # if ambiguous, store all as aliases
-                    msg = (
-                        f"Application {concept_id} has {n_substances} "
-                        f"substance names: {substances}"
-                    )
-                    _logger.debug(msg)
-                    aliases += substances
-                elif n_substances == 1:
-                    therapy["label"] = substances[0]
-
-                generics = openfda.get("generic_name", [])
-                n_generic = len(set(generics))
-                if n_generic > 1:
-                    aliases += generics
-                elif n_generic == 1:
-                    if n_substances == 0:
-                        # there are about 300 cases of this
-                        therapy["label"] = generics[0]
-                    else:
-                        aliases.append(generics[0])
-
-                therapy["associated_with"] = []
-                unii = openfda.get("unii")
-                if unii:
-                    unii_items = [f"{NamespacePrefix.UNII.value}:{u}" for u in unii]
-                    therapy["associated_with"] += unii_items  # type: ignore
-                spl = openfda.get("spl_id")
-                if spl:
-                    spl_items = [f"{NamespacePrefix.SPL.value}:{s}" for s in spl]
-                    therapy["associated_with"] += spl_items  # type: ignore
-                ndc = openfda.get("product_ndc")
-                if ndc:
-                    ndc_items = [f"{NamespacePrefix.NDC.value}:{n}" for n in ndc]
-                    therapy["associated_with"] += ndc_items  # type: ignore
-
-                rxcui = openfda.get("rxcui")
-                if rxcui:
-                    therapy["xrefs"] = [
-                        f"{NamespacePrefix.RXNORM.value}:{r}" for r in rxcui
-                    ]
-
-            therapy["trade_names"] = brand_names
-            therapy["aliases"] = aliases
-            self._load_therapy(therapy)
+            for result in tqdm(_iter_results(f), ncols=80, disable=self._silent):
+                self._load_application(result)
+
+    def _load_application(self, result: dict) -> None:
+        """Transform a single Drugs@FDA application and load it to DB.
+
+        :param result: application object from Drugs@FDA data
+        """
+        if "products" not in result:
+            return
+        products = result["products"]
+
+        app_no = result["application_number"]
+        if app_no.startswith("NDA"):
+            namespace = NamespacePrefix.DRUGSATFDA_NDA.value
+        elif app_no.startswith("ANDA"):
+            namespace = NamespacePrefix.DRUGSATFDA_ANDA.value
+        else:
+            # ignore biologics license applications (tentative)
+            return
+        concept_id = f"{namespace}:{app_no.split('NDA')[-1]}"
+        therapy: RecordParams = {"concept_id": concept_id}
+
+        rating = self._get_marketing_status_rating(products, concept_id)
+        if rating:
+            therapy["approval_ratings"] = [rating]
+
+        brand_names = [p["brand_name"] for p in products]
+
+        aliases = []
+        if "openfda" in result:
+            openfda = result["openfda"]
+            brand_name = openfda.get("brand_name")
+            if brand_name:
+                brand_names += brand_name
+
+            substances = openfda.get("substance_name", [])
+            n_substances = len(set(substances))
+            if n_substances > 1:
+                # if ambiguous, store all as aliases
+                msg = (
+                    f"Application {concept_id} has {n_substances} "
+                    f"substance names: {substances}"
+                )
+                _logger.debug(msg)
+                aliases += substances
+            elif n_substances == 1:
+                therapy["label"] = substances[0]
+
+            generics = openfda.get("generic_name", [])
+            n_generic = len(set(generics))
+            if n_generic > 1:
+                aliases += generics
+            elif n_generic == 1:
+                if n_substances == 0:
+                    # there are about 300 cases of this
+                    therapy["label"] = generics[0]
+                else:
+                    aliases.append(generics[0])
+
+            therapy["associated_with"] = []
+            unii = openfda.get("unii")
+            if unii:
+                unii_items = [f"{NamespacePrefix.UNII.value}:{u}" for u in unii]
+                therapy["associated_with"] += unii_items  # type: ignore
+            spl = openfda.get("spl_id")
+            if spl:
+                spl_items = [f"{NamespacePrefix.SPL.value}:{s}" for s in spl]
+                therapy["associated_with"] += spl_items  # type: ignore
+            ndc = openfda.get("product_ndc")
+            if ndc:
+                ndc_items = [f"{NamespacePrefix.NDC.value}:{n}" for n in ndc]
+                therapy["associated_with"] += ndc_items  # type: ignore
+
+            rxcui = openfda.get("rxcui")
+            if rxcui:
+                therapy["xrefs"] = [
+                    f"{NamespacePrefix.RXNORM.value}:{r}" for r in rxcui
+                ]
+
+        therapy["trade_names"] = brand_names
+        therapy["aliases"] = aliases
+        self._load_therapy(therapy)
@@ -4,7 +4,7 @@ import csv
 import html
 import logging
 import re
-from typing import Any
+from collections.abc import Generator
 
 from tqdm import tqdm
 from wags_tails.guide_to_pharmacology import GtoPLigandPaths
@@ -17,6 +17,52 @@ _logger = logging.getLogger(__name__)
 TAG_PATTERN = re.compile("</?[a-zA-Z]+>")
 PMID_PATTERN = re.compile(r"\[PMID:[ ]?\d+\]")
 
+LIGANDS_HEADER = [
+    "Ligand ID",
+    "Name",
+    "Species",
+    "Type",
+    "Approved",
+    "Withdrawn",
+    "Labelled",
+    "Radioactive",
+    "PubChem SID",
+    "PubChem CID",
+    "UniProt ID",
+    "Ensembl ID",
+    "ChEMBL ID",
+    "Ligand Subunit IDs",
+    "Ligand Subunit Name",
+    "Ligand Subunit UniProt IDs",
+    "Ligand Subunit Ensembl IDs",
+    "IUPAC name",
+    "INN",
+    "Synonyms",
+    "SMILES",
+    "InChIKey",
+    "InChI",
+    "GtoImmuPdb",
+    "GtoMPdb",
+    "Antibacterial",
+]
+LIGAND_ID_MAPPING_HEADER = [
+    "Ligand id",
+    "Name",
+    "Species",
+    "Type",
+    "PubChem SID",
+    "PubChem CID",
+    "ChEMBl ID",
+    "Chebi ID",
+    "UniProt id",
+    "Ensembl ID",
+    "IUPAC name",
+    "INN",
+    "CAS",
+    "DrugBank ID",
+    "Drug Central ID",
+]
+
 
 class GuideToPHARMACOLOGY(Base):
     """Class for Guide to PHARMACOLOGY ETL methods."""
@@ -35,13 +81,23 @@ class GuideToPHARMACOLOGY(Base):
         self._data_files: GtoPLigandPaths = data_files  # type: ignore
 
     def _transform_data(self) -> None:
-        """Transform Guide To PHARMACOLOGY data."""
-        data: dict[str, Any] = {}
-        self._transform_ligands(data)
-        self._transform_ligand_id_mappings(data)
+        """Transform Guide To PHARMACOLOGY data.
 
-        for param in tqdm(data.values(), ncols=80, disable=self._silent):
-            self._load_therapy(param)
+        The ligand ID mapping file is indexed first, so that each row of the ligands
+        file can be joined with its mappings and loaded as a finished record as soon as
+        it's read.
+        """
+        mappings = self._get_ligand_id_mappings()
+        for params in tqdm(
+            self._transform_ligands(mappings), ncols=80, disable=self._silent
+        ):
+            self._load_therapy(params)
+        for ligand_id in mappings:
+            _logger.debug(
+                "%s:%s not in ligands",
+                NamespacePrefix.GUIDETOPHARMACOLOGY.value,
+                ligand_id,
+            )
 
     @staticmethod
     def _process_name(name: str) -> str:
@@ -49,46 +105,27 @@ class GuideToPHARMACOLOGY(Base):
         :param name: raw drug referent
         :return: cleaned name (may be unchanged)
         """
-        return re.sub(TAG_PATTERN, "", name)
+        return TAG_PATTERN.sub("", name)
+
+    def _transform_ligands(
+        self, mappings: dict[str, tuple[list[str], list[str]]]
+    ) -> Generator[dict, None, None]:
+        """Transform ligands data file, joining each row with its ID mappings.
 
-    def _transform_ligands(self, data: dict) -> None:
-        """Transform ligands data file and add this data to `data`.
+        Mappings are removed from ``mappings`` as they're used, so that only mappings
+        for unknown ligands are left once all records have been produced.
 
-        :param dict data: Transformed data
+        :param mappings: xrefs and associated_with values for each ligand ID, as
+            returned by ``_get_ligand_id_mappings()``
+        :return: generator of finished therapy records
+        :raise SourceFormatError: if ligands file columns are unrecognized
         """
         with self._data_files.ligands.open() as f:
             rows = csv.reader(f, delimiter="\t")
 
             # check that file structure is the same
             next(rows)
-            if next(rows) != [
-                "Ligand ID",
-                "Name",
-                "Species",
-                "Type",
-                "Approved",
-                "Withdrawn",
-                "Labelled",
-                "Radioactive",
-                "PubChem SID",
-                "PubChem CID",
-                "UniProt ID",
-                "Ensembl ID",
-                "ChEMBL ID",
-                "Ligand Subunit IDs",
-                "Ligand Subunit Name",
-                "Ligand Subunit UniProt IDs",
-                "Ligand Subunit Ensembl IDs",
-                "IUPAC name",
-                "INN",
-                "Synonyms",
-                "SMILES",
-                "InChIKey",
-                "InChI",
-                "GtoImmuPdb",
-                "GtoMPdb",
-                "Antibacterial",
-            ]:
+            if next(rows) != LIGANDS_HEADER:
                 msg = "GtoP ligands file contains missing or unrecognized columns. See FAQ in README for suggested resolution."
                 raise SourceFormatError(msg)
 
@@ -136,12 +173,16 @@ class GuideToPHARMACOLOGY(Base):
                         f"{NamespacePrefix.INCHIKEY.value}:{row[21]}"
                     )
 
+                xrefs, mapped_associated_with = mappings.pop(row[0], ([], []))
+                associated_with += mapped_associated_with
+                if xrefs:
+                    params["xrefs"] = xrefs
                 if associated_with:
                     params["associated_with"] = associated_with
                 if aliases:
                     params["aliases"] = aliases
 
-                data[params["concept_id"]] = params
+                yield params
 
     @staticmethod
     def _get_xrefs(ref: str, namespace: str) -> list[str]:
@@ -150,56 +191,30 @@ class GuideToPHARMACOLOGY(Base):
         :param namspace: namespace prefix to use
         :return: List (usually with just one member) of xref IDs
         """
-        xrefs = []
-        for split_ref in ref.split("|"):
-            xref = f"{namespace}:{split_ref}"
-            xrefs.append(xref)
-        return xrefs
+        return [f"{namespace}:{split_ref}" for split_ref in ref.split("|")]
 
-    def _transform_ligand_id_mappings(self, data: dict) -> None:
-        """Transform ligand_id_mappings and add this data to `data`
-        All ligands found in this file should already be in data
+    def _get_ligand_id_mappings(self) -> dict[str, tuple[list[str], list[str]]]:
+        """Index ligand_id_mappings file by ligand ID.
 
-        :param dict data: Transformed data
+        :return: mapping from ligand ID to xrefs and associated_with values
+        :raise SourceFormatError: if mapping file columns are unrecognized
         """
+        mappings = {}
         with self._data_files.ligand_id_mapping.open() as f:
             rows = csv.reader(f, delimiter="\t")
             next(rows)
-            if next(rows) != [
-                "Ligand id",
-                "Name",
-                "Species",
-                "Type",
-                "PubChem SID",
-                "PubChem CID",
-                "ChEMBl ID",
-                "Chebi ID",
-                "UniProt id",
-                "Ensembl ID",
-                "IUPAC name",
-                "INN",
-                "CAS",
-                "DrugBank ID",
-                "Drug Central ID",
-            ]:
+            if next(rows) != LIGAND_ID_MAPPING_HEADER:
                 msg = "GtoP ligand mapping file contains missing or unrecognized columns. See FAQ in README for suggested resolution."
                 raise SourceFormatError(msg)
 
             for row in rows:
-                concept_id = f"{NamespacePrefix.GUIDETOPHARMACOLOGY.value}:{row[0]}"
-
-                if concept_id not in data:
-                    _logger.debug("%s not in ligands", concept_id)
-                    continue
-                params = data[concept_id]
                 xrefs = []
-                associated_with = params.get("associated_with", [])
+                associated_with = []
                 if row[6]:
                     xrefs += self._get_xrefs(row[6], NamespacePrefix.CHEMBL.value)
                 if row[7]:
                     # CHEBI IDs are already namespaced
-                    for chebi_id in row[7].split("|"):
-                        associated_with.append(chebi_id)
+                    associated_with += row[7].split("|")
                 if row[8]:
                     associated_with += self._get_xrefs(
                         row[8], NamespacePrefix.UNIPROT.value
@@ -212,10 +227,8 @@ class GuideToPHARMACOLOGY(Base):
                     associated_with += self._get_xrefs(
                         row[14], NamespacePrefix.DRUGCENTRAL.value
                     )
-                if xrefs:
-                    params["xrefs"] = xrefs
-                if associated_with:
-                    params["associated_with"] = associated_with
+                mappings[row[0]] = (xrefs, associated_with)
+        return mappings
 
     def _set_approval_rating(self, approved: str, withdrawn: str) -> str | None:
         """Set approval rating value.
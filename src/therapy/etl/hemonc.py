@@ -2,6 +2,7 @@
 
 import csv
 import logging
+from timeit import default_timer as timer
 
 import requests.exceptions
 from tqdm import tqdm
@@ -11,7 +12,6 @@ from therapy.etl.base import DiseaseIndicationBase, EtlError
 from therapy.schemas import (
     ApprovalRating,
     NamespacePrefix,
-    RecordParams,
     SourceMeta,
 )
 
@@ -59,15 +59,18 @@ class HemOnc(DiseaseIndicationBase):
         }
         self.database.add_source_metadata(self._name, SourceMeta(**meta))
 
-    def _get_concepts(self) -> tuple[dict, dict, dict, dict]:
+    def _get_concepts(
+        self,
+    ) -> tuple[dict[int, dict], dict[int, str], dict[int, str], dict[int, str]]:
         """Get therapy, brand name, and disease concepts from concepts file.
 
-        :return: Tuple of dicts mapping ID to object for each type of concept
+        :return: Tuple of dicts mapping HemOnc concept code to object for each type of
+            concept
         """
-        therapies: RecordParams = {}  # hemonc id -> record
-        brand_names: dict[str, str] = {}  # hemonc id -> brand name
-        conditions: dict[str, str] = {}  # hemonc id -> condition name
-        years: dict[str, str] = {}  # hemonc ID -> year
+        therapies: dict[int, dict] = {}  # hemonc code -> record
+        brand_names: dict[int, str] = {}  # hemonc code -> brand name
+        conditions: dict[int, str] = {}  # hemonc code -> condition name
+        years: dict[int, str] = {}  # hemonc code -> year
 
         with self._data_files.concepts.open() as concepts_file:
             concepts_reader = csv.reader(concepts_file)
@@ -77,9 +80,20 @@ class HemOnc(DiseaseIndicationBase):
                     continue  # skip if deprecated/invalid
 
                 row_type = row[2]
+                if row_type not in ("Component", "Brand Name", "Condition", "Year"):
+                    continue
+                if not row[3].isdigit():
+                    _logger.warning(
+                        "Skipping %s concept with non-numeric code: %s",
+                        row_type,
+                        row[3],
+                    )
+                    continue
+                hemonc_code = int(row[3])
+
                 if row_type == "Component":
                     concept_id = f"{NamespacePrefix.HEMONC.value}:{row[3]}"
-                    therapies[row[3]] = {
+                    therapies[hemonc_code] = {
                         "concept_id": concept_id,
                         "label": row[0],
                         "trade_names": [],
@@ -87,42 +101,49 @@ class HemOnc(DiseaseIndicationBase):
                         "xrefs": [],
                     }
                 elif row_type == "Brand Name":
-                    brand_names[row[3]] = row[0]
+                    brand_names[hemonc_code] = row[0]
                 elif row_type == "Condition":
-                    conditions[row[3]] = row[0]
-                elif row_type == "Year":
-                    years[row[3]] = row[0]
+                    conditions[hemonc_code] = row[0]
+                else:
+                    years[hemonc_code] = row[0]
 
         return therapies, brand_names, conditions, years
 
     def _get_rels(
         self,
-        therapies: dict,
-        brand_names: dict,
-        conditions: dict,
-        years: dict[str, str],
-    ) -> dict:
+        therapies: dict[int, dict],
+        brand_names: dict[int, str],
+        conditions: dict[int, str],
+        years: dict[int, str],
+    ) -> dict[int, list[int]]:
         """Gather relations to provide associations between therapies, brand names,
         and conditions.
 
-        :param therapies: mapping from IDs to therapy concepts
-        :param brand_names: mapping from IDs to therapy brand names
-        :param conditions: mapping from IDs to disease conditions
-        :param years: mapping IDs to year values
-        :return: therapies dict updated with brand names and conditions
+        Therapy records are updated in place with xrefs, brand names, and approval
+        info. Indications are returned as condition codes, so that they can be
+        normalized together once it's known which therapies will be loaded.
+
+        :param therapies: mapping from codes to therapy concepts
+        :param brand_names: mapping from codes to therapy brand names
+        :param conditions: mapping from codes to disease conditions
+        :param years: mapping codes to year values
+        :return: mapping from therapy codes to codes of their FDA-indicated conditions
         """
+        indications: dict[int, list[int]] = {}
         with self._data_files.rels.open() as rels_file:
             rels_reader = csv.reader(rels_file)
             next(rels_reader)  # skip header
 
             for row in rels_reader:
-                rel_type = row[4]
-                hemonc_id = row[0]
-                record = therapies.get(hemonc_id)
+                if not row[0].isdigit():
+                    continue  # skip non-HemOnc items
+                hemonc_code = int(row[0])
+                record = therapies.get(hemonc_code)
 
                 if record is None:
                     continue  # skip non-drug items
 
+                rel_type = row[4]
                 if rel_type == "Maps to":
                     src_raw = row[3]
                     if src_raw == "RxNorm Extension":
@@ -137,8 +158,8 @@ class HemOnc(DiseaseIndicationBase):
 
                 elif rel_type == "Has brand name":
                     try:
-                        record["trade_names"].append(brand_names[row[1]])
-                    except KeyError:
+                        record["trade_names"].append(brand_names[int(row[1])])
+                    except (KeyError, ValueError):
                         _logger.warning(
                             "Unrecognized brand name ID (%s) for HemOnc concept %s",
                             row[1],
@@ -148,8 +169,8 @@ class HemOnc(DiseaseIndicationBase):
 
                 elif rel_type == "Was FDA approved yr":
                     try:
-                        year = years[row[1]]
-                    except KeyError:
+                        year = years[int(row[1])]
+                    except (KeyError, ValueError):
                         _logger.exception(
                             "Failed parse of FDA approval year ID %s for HemOnc ID %s",
                             row[1],
@@ -167,84 +188,111 @@ class HemOnc(DiseaseIndicationBase):
                         record["approval_year"] = [year]
 
                 elif rel_type == "Has FDA indication":
-                    try:
-                        label = conditions[row[1]]
-                    except KeyError:
+                    if not row[1].isdigit() or int(row[1]) not in conditions:
                         # concept is deprecated or otherwise unavailable
-                        _logger.exception(
+                        _logger.error(
                             "Unable to process relation with indication %s -- deprecated?",
                             row[0],
                         )
                         continue
-                    norm_id = self._normalize_disease(label)
-                    hemonc_concept_id = f"{NamespacePrefix.HEMONC.value}:{row[1]}"
-                    indication = {
-                        "disease_id": hemonc_concept_id,
-                        "disease_label": label,
-                        "normalized_disease_id": norm_id,
-                        "supplemental_info": {"regulatory_body": "FDA"},
-                    }
-                    if "has_indication" in record:
-                        record["has_indication"].append(indication)
-                    else:
-                        record["has_indication"] = [indication]
+                    indications.setdefault(hemonc_code, []).append(int(row[1]))
 
-        return therapies
+        return indications
 
-    def _get_synonyms(self, therapies: dict) -> dict:
-        """Gather synonym entries and associate with therapy concepts.
+    def _get_synonyms(self, therapies: dict[int, dict]) -> None:
+        """Gather synonym entries and add them to therapy concepts as aliases.
 
-        :param dict therapies: mapping of IDs to therapy objects
-        :return: therapies dict with synonyms added as aliases
+        :param therapies: mapping of codes to therapy objects
         """
         with self._data_files.synonyms.open() as synonyms_file:
             synonyms_reader = csv.reader(synonyms_file)
             next(synonyms_reader)
             for row in synonyms_reader:
-                therapy_code = row[1]
-                if therapy_code in therapies:
-                    therapy = therapies[therapy_code]
+                if not row[1].isdigit():
+                    continue
+                therapy = therapies.get(int(row[1]))
+                if therapy is not None:
                     alias = row[0]
                     if alias != therapy.get("label"):
-                        therapies[therapy_code]["aliases"].append(row[0])
-            return therapies
+                        therapy["aliases"].append(alias)
 
-    def _perform_qc(self, therapies: dict[str, dict]) -> dict[str, dict]:
-        """Perform HemOnc-specific QC checks on therapy records.
+    @staticmethod
+    def _passes_qc(therapy: dict) -> bool:
+        """Perform HemOnc-specific QC checks on a therapy record.
 
         Indications that a record is a combo therapy:
         * has multiple RxNorm xrefs
         * has " and " in label
 
-        :param therapies: collection of records from HemOnc
-        :return: collection w/o failing records
+        :param therapy: record from HemOnc
+        :return: False if record should be excluded
         """
-        output_therapies = {}
-
-        for key, therapy in therapies.items():
-            xrefs = therapy.get("xrefs")
-            if xrefs and len([x for x in xrefs if x.startswith("rxcui")]) > 1:
-                _logger.debug(
-                    "%s appears to be a combo therapy given >1 RxNorm xrefs",
-                    therapy["label"],
-                )
-                continue
-            if " and " in therapy["label"].lower():
-                _logger.debug(
-                    "%s appears to be a combo therapy given presence of ` and ` in label",
-                    therapy["label"],
-                )
-                continue
-            output_therapies[key] = therapy
-        return output_therapies
+        xrefs = therapy.get("xrefs")
+        if xrefs and len([x for x in xrefs if x.startswith("rxcui")]) > 1:
+            _logger.debug(
+                "%s appears to be a combo therapy given >1 RxNorm xrefs",
+                therapy["label"],
+            )
+            return False
+        if " and " in therapy["label"].lower():
+            _logger.debug(
+                "%s appears to be a combo therapy given presence of ` and ` in label",
+                therapy["label"],
+            )
+            return False
+        return True
 
-    def _transform_data(self) -> None:
-        """Prepare dataset for loading into normalizer database."""
-        therapies, brand_names, conditions, years = self._get_concepts()
-        therapies = self._get_rels(therapies, brand_names, conditions, years)
-        therapies = self._get_synonyms(therapies)
+    def _get_indication(self, condition_code: int, label: str) -> dict:
+        """Construct indication object for a HemOnc condition.
 
-        therapies = self._perform_qc(therapies)
+        :param condition_code: HemOnc code for condition
+        :param label: condition name
+        :return: indication object, normalized if possible
+        """
+        return {
+            "disease_id": f"{NamespacePrefix.HEMONC.value}:{condition_code}",
+            "disease_label": label,
+            "normalized_disease_id": self._normalize_disease(label),
+            "supplemental_info": {"regulatory_body": "FDA"},
+        }
+
+    def _transform_data(self) -> None:
+        """Prepare dataset for loading into normalizer database.
 
-        for therapy in tqdm(therapies.values(), ncols=80, disable=self._silent):
+        Each source file is read exactly once. Concepts are indexed by their integer
+        HemOnc codes, and therapy records are finished and loaded one at a time after
+        all relations and synonyms have been gathered.
+        """
+        start = timer()
+        therapies, brand_names, conditions, years = self._get_concepts()
+        _logger.info("Read HemOnc concepts in %.2f seconds", timer() - start)
+
+        start = timer()
+        indications = self._get_rels(therapies, brand_names, conditions, years)
+        _logger.info("Read HemOnc relationships in %.2f seconds", timer() - start)
+
+        start = timer()
+        self._get_synonyms(therapies)
+        _logger.info("Read HemOnc synonyms in %.2f seconds", timer() - start)
+
+        start = timer()
+        therapies = {k: v for k, v in therapies.items() if self._passes_qc(v)}
+        self._prefetch_diseases(
+            conditions[code]
+            for therapy_code in therapies
+            for code in indications.get(therapy_code, [])
+        )
+        _logger.info("Normalized HemOnc indications in %.2f seconds", timer() - start)
+
+        start = timer()
+        for therapy_code, therapy in tqdm(
+            therapies.items(), ncols=80, disable=self._silent
+        ):
+            condition_codes = indications.get(therapy_code)
+            if condition_codes:
+                therapy["has_indication"] = [
+                    self._get_indication(code, conditions[code])
+                    for code in condition_codes
+                ]
             self._load_therapy(therapy)
+        _logger.info("Loaded HemOnc therapies in %.2f seconds", timer() - start)
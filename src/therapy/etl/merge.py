@@ -2,13 +2,23 @@
 
 import logging
 import re
+import uuid
 from timeit import default_timer as timer
 from typing import Any
 
 from tqdm import tqdm
 
+from therapy import ITEM_TYPES
+from therapy.concepts import get_therapy_concept
 from therapy.database.database import AbstractDatabase, DatabaseWriteError
-from therapy.schemas import RefType, SourceName, SourcePriority
+from therapy.schemas import (
+    MatchType,
+    RecordType,
+    RefType,
+    SourceName,
+    SourcePriority,
+)
+from therapy.term_filter import TermFilter
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +26,12 @@ logger = logging.getLogger(__name__)
 class Merge:
     """Handles record merging."""
 
-    def __init__(self, database: AbstractDatabase, silent: bool = True) -> None:
+    def __init__(
+        self,
+        database: AbstractDatabase,
+        silent: bool = True,
+        store_concepts: bool = False,
+    ) -> None:
         """Initialize Merge instance.
 
         * self._groups is a dictionary keying concept IDs to the Set of concept IDs in
@@ -32,8 +47,12 @@ class Merge:
 
         :param database: db instance to use for record retrieval and creation.
         :param silent: if True, suppress all console output
+        :param store_concepts: if True, precompute the serialized therapy concept that
+            normalization responses return for each merged record, and store it with
+            the record under ``therapy_concept``
         """
         self.database = database
+        self._store_concepts = store_concepts
         self._groups: dict[str, set[str]] = {}
         self._unii_to_drugsatfda: dict[str, set[str]] = {}
         self._failed_lookups: set[str] = set()
@@ -42,6 +61,13 @@ class Merge:
     def create_merged_concepts(self, record_ids: set[str]) -> None:
         """Create concept groups, generate merged concept records, and update database.
 
+        Then, write a precomputed normalization result for every searchable term (see
+        ``_create_normalized_refs()``), and a filter over all of those terms, so that
+        queries which can't match anything can skip database lookups (see
+        ``therapy.term_filter.TermFilter``). Both are stamped with a data version that
+        includes a new merge run ID, which is only recorded once they're complete, so
+        that query handlers ignore them until then.
+
         :param Set[str] record_ids: concept identifiers from which groups should be
             generated.
         """
@@ -59,6 +85,7 @@ class Merge:
 
         logger.info("Creating merged records and updating database...")
         uploaded_ids = set()
+        merge_refs: dict[str, str] = {}
         start = timer()
         for record_id, group in tqdm(
             self._groups.items(), ncols=80, disable=self._silent
@@ -66,6 +93,10 @@ class Merge:
             if record_id in uploaded_ids:
                 continue
             merged_record = self._generate_merged_record(group)
+            if self._store_concepts:
+                merged_record["therapy_concept"] = get_therapy_concept(
+                    merged_record
+                ).model_dump_json(exclude_none=True)
 
             # add group merger item to DB
             self.database.add_merged_record(merged_record)
@@ -73,6 +104,7 @@ class Merge:
             # add updated references
             for concept_id in group:
                 merge_ref = merged_record["concept_id"]
+                merge_refs[concept_id.lower()] = merge_ref
                 try:
                     self.database.update_merge_ref(concept_id, merge_ref)
                 except DatabaseWriteError as dw:
@@ -90,6 +122,97 @@ class Merge:
         end = timer()
         logger.debug("Generated and added concepts in %s seconds", end - start)
 
+        merge_run_id = uuid.uuid4().hex
+        data_version = self.database.get_data_version(merge_run_id)
+
+        logger.info("Creating normalized search term references...")
+        start = timer()
+        terms = self._create_normalized_refs(record_ids, merge_refs, data_version)
+        self.database.complete_write_transaction()
+        end = timer()
+        logger.debug("Created normalized references in %s seconds", end - start)
+
+        logger.info("Creating term filter...")
+        start = timer()
+        term_filter = TermFilter.build(terms, data_version)
+        self.database.add_term_filter(term_filter)
+        self.database.complete_write_transaction()
+        end = timer()
+        logger.debug(
+            "Created term filter over %s terms in %s seconds", len(terms), end - start
+        )
+
+        self.database.add_merge_run_id(merge_run_id)
+        self.database.complete_write_transaction()
+        logger.info("Completed merge run %s", merge_run_id)
+
+    def _create_normalized_refs(
+        self, record_ids: set[str], merge_refs: dict[str, str], data_version: str
+    ) -> set[str]:
+        """Precompute the normalized concept that each searchable term resolves to,
+        and add it to the database, so that normalization requires a single reference
+        lookup rather than a chain of dependent ones.
+
+        Follows the precedence of ``QueryHandler._perform_normalized_lookup()``: concept
+        ID matches come first, then each ``RefType`` in order, and within a ``RefType``,
+        the record with the highest source priority (tiebroken by concept ID) wins.
+        Namespace inference depends on the exact query string, so it's handled at query
+        time.
+
+        Each record's terms are written as candidates as soon as the record is read,
+        and the database resolves the winning candidate for a term at lookup time, so
+        results don't need to be held in memory.
+
+        :param record_ids: concept IDs that merged concepts were generated from
+        :param merge_refs: mapping from lowercase concept IDs to the merged concept ID
+            of their group, for groups generated from ``record_ids``
+        :param data_version: identifier for the data that results are computed from
+        :return: all searchable terms
+        """
+        processed_ids = {record_id.lower() for record_id in record_ids}
+        terms: set[str] = set()
+
+        for record in tqdm(
+            self.database.get_all_records(RecordType.IDENTITY),
+            ncols=80,
+            disable=self._silent,
+        ):
+            concept_id = record["concept_id"]
+            if concept_id.lower() in processed_ids:
+                merge_ref = merge_refs.get(concept_id.lower())
+            else:
+                merge_ref = record.get("merge_ref")
+            normalized_id, merged = (
+                (merge_ref, True) if merge_ref else (concept_id, False)
+            )
+            source_rank = SourcePriority[record["src_name"].upper()].value
+
+            # term -> (match rank, match type), keeping the best match for each term
+            record_refs = {concept_id.lower(): (0, MatchType.CONCEPT_ID)}
+            for ref_rank, (attr_type, item_type) in enumerate(
+                ITEM_TYPES.items(), start=1
+            ):
+                value = record.get(attr_type)
+                if not value:
+                    continue
+                values = {value} if isinstance(value, str) else set(value)
+                for term in values:
+                    record_refs.setdefault(
+                        term.lower(), (ref_rank, MatchType[item_type.upper()])
+                    )
+
+            for term, (ref_rank, match_type) in record_refs.items():
+                self.database.add_normalized_ref(
+                    term,
+                    normalized_id,
+                    match_type,
+                    merged,
+                    (ref_rank, source_rank, concept_id),
+                    data_version,
+                )
+            terms.update(record_refs)
+        return terms
+
     def _get_drugsatfda_from_unii(self, ref: str) -> str | None:
         """Given an `associated_with` item keying a UNII code to a Drugs@FDA record,
         verify that the record can be safely added to a concept group.
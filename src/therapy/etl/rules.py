@@ -1,10 +1,61 @@
 """Apply manual data restrictions and annotations to extracted records."""
 
 import csv
+from pathlib import Path
 
 from therapy import APP_ROOT
 from therapy.schemas import SourceName
 
+# fields that rules may remove values from
+LISTLIKE_FIELDS = ("aliases", "trade_names", "xrefs", "associated_with")
+
+# use in the `concept_id` column to match every record from a source, or in the
+# `field` column to match every listlike field
+WILDCARD = "*"
+
+RulesIndex = dict[tuple[str, str], dict[str, frozenset[str]]]
+
+# rules file path -> (modification time, compiled index)
+_rules_cache: dict[Path, tuple[float, RulesIndex]] = {}
+
+
+def get_rules_index(rules_path: Path) -> RulesIndex:
+    """Get compiled rules, parsing the rules file only if it hasn't already been read
+    by this process or has been modified since.
+
+    :param rules_path: location of rules CSV
+    :return: mapping from (source name, concept ID) to the values to remove from each
+        field. Field wildcards are expanded to each individual field.
+    :raise ValueError: if a rule targets a field that isn't listlike
+    """
+    mtime = rules_path.stat().st_mtime
+    cached = _rules_cache.get(rules_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    staged: dict[tuple[str, str], dict[str, set[str]]] = {}
+    with rules_path.open() as rules_file:
+        reader = csv.DictReader(rules_file, delimiter=",")
+        for row in reader:
+            field = row["field"]
+            if field == WILDCARD:
+                fields: tuple[str, ...] = LISTLIKE_FIELDS
+            elif field in LISTLIKE_FIELDS:
+                fields = (field,)
+            else:
+                msg = "Non-scalar fields currently not implemented"
+                raise ValueError(msg)
+            key = (row["source"], row["concept_id"])
+            for f in fields:
+                staged.setdefault(key, {}).setdefault(f, set()).add(row["value"])
+
+    index = {
+        key: {field: frozenset(values) for field, values in field_values.items()}
+        for key, field_values in staged.items()
+    }
+    _rules_cache[rules_path] = (mtime, index)
+    return index
+
 
 class Rules:
     """Store manually-generated data rules for modifying extracted source data.
@@ -12,56 +63,52 @@ class Rules:
     Use to provide consistency in edge cases for computational normalization, and
     correct possible curation errors.
 
-    Initialize within each source's ETL class. This entails a small amount of repeated
-    work, and could be revisited if the rules CSV becomes truly large, but makes for
-    cleaner code in the meantime.
+    Initialize within each source's ETL class. The rules CSV is compiled into an index
+    once per process (and again only if the file changes), so initialization is cheap.
 
-    Currently used to delete specific parameters from listlike fields, but could be
-    expanded to use wildcards (e.g. to prohibit a value from being used in any field)
-    or to manually add custom values to a field.
+    Currently used to delete specific parameters from listlike fields. A wildcard
+    (``*``) concept ID applies a rule to every record from a source, and a wildcard
+    field applies it to every listlike field.
     """
 
-    def __init__(self, source_name: SourceName) -> None:
+    def __init__(self, source_name: SourceName, rules_path: Path | None = None) -> None:
         """Initialize rules class.
+
         :param source_name: name of source to use, for filtering unneeded rules
+        :param rules_path: location of rules CSV, if not the default
+        """
+        if rules_path is None:
+            rules_path = APP_ROOT / "etl" / "rules.csv"
+        self._source = source_name.value
+        self._index = get_rules_index(rules_path)
+        self._source_rules = self._index.get((self._source, WILDCARD), {})
+
+    def _get_removals(self, concept_id: str) -> dict[str, frozenset[str]]:
+        """Get values to remove from each field of a record.
+
+        :param concept_id: record concept ID
+        :return: mapping from field names to values to remove
         """
-        rules_path = APP_ROOT / "etl" / "rules.csv"
-        self.rules: dict[str, list[tuple[str, str]]] = {}
-        with rules_path.open() as rules_file:
-            reader = csv.DictReader(rules_file, delimiter=",")
-            for row in reader:
-                if row["source"] == source_name:
-                    concept_id = row["concept_id"]
-                    if not self.rules.get(concept_id):
-                        self.rules[concept_id] = [(row["field"], row["value"])]
-                    else:
-                        self.rules[concept_id].append((row["field"], row["value"]))
+        concept_rules = self._index.get((self._source, concept_id))
+        if not concept_rules:
+            return self._source_rules
+        if not self._source_rules:
+            return concept_rules
+        return {
+            field: concept_rules.get(field, frozenset())
+            | self._source_rules.get(field, frozenset())
+            for field in concept_rules.keys() | self._source_rules.keys()
+        }
 
     def apply_rules_to_therapy(self, therapy: dict) -> dict:
-        """Apply all rules to therapy. First find relevant rules, then call the
-        apply method.
+        """Apply all rules to therapy, removing any prohibited values from each field in
+        a single pass.
+
         :param therapy: therapy object from ETL base
         :return: processed therapy object
         """
-        relevant_rules = self.rules.get(therapy["concept_id"], [])
-        for rule in relevant_rules:
-            therapy = self._apply_rule_to_field(therapy, rule[0], rule[1])
-        return therapy
-
-    def _apply_rule_to_field(
-        self, therapy: dict, field: str, value: str | list | dict | int | float
-    ) -> dict:
-        """Given a (field, value) rule, apply it to the given therapy object.
-        :param therapy: therapy object ready to load to DB
-        :param field: name of object property field to check
-        :param value: value to remove from field, if possible
-        :return: therapy object with rule applied
-        """
-        if field not in {"aliases", "trade_names", "xrefs", "associated_with"}:
-            msg = "Non-scalar fields currently not implemented"
-            raise ValueError(msg)
-        field_data = set(therapy.get(field, []))
-        if value in field_data:
-            field_data.remove(value)
-            therapy[field] = list(field_data)
+        for field, values in self._get_removals(therapy["concept_id"]).items():
+            field_data = therapy.get(field)
+            if field_data:
+                therapy[field] = [v for v in field_data if v not in values]
         return therapy
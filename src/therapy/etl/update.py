@@ -48,7 +48,11 @@ def delete_source(
 
 
 def load_source(
-    source: SourceName, db: AbstractDatabase, use_existing: bool, silent: bool = True
+    source: SourceName,
+    db: AbstractDatabase,
+    use_existing: bool,
+    silent: bool = True,
+    fast_validation: bool = False,
 ) -> tuple[float, set[str]]:
     """Load data for an individual source.
 
@@ -56,6 +60,8 @@ def load_source(
     :param db: database instance
     :param use_existing: if True, use latest available version of local data
     :param silent: if True, suppress console output
+    :param fast_validation: if True, use lightweight structural checks instead of full
+        model validation for each record
     :return: time spent loading data, and set of processed IDs from that source
     """
     _emit_info_msg(f"Loading {source.value}...", silent)
@@ -91,7 +97,9 @@ def load_source(
         SourceName.RXNORM: RxNorm,
         SourceName.WIKIDATA: Wikidata,
     }
-    source_instance = sources_table[source](database=db, silent=silent)
+    source_instance = sources_table[source](
+        database=db, silent=silent, fast_validation=fast_validation
+    )
 
     try:
         processed_ids = source_instance.perform_etl(use_existing)
@@ -112,7 +120,11 @@ def load_source(
 
 
 def update_source(
-    source: SourceName, db: AbstractDatabase, use_existing: bool, silent: bool = True
+    source: SourceName,
+    db: AbstractDatabase,
+    use_existing: bool,
+    silent: bool = True,
+    fast_validation: bool = False,
 ) -> set[str]:
     """Refresh data for an individual therapy data source.
 
@@ -128,10 +140,14 @@ def update_source(
     :param db: database instance
     :param use_existing: if True, use latest available local data
     :param silent: if True, suppress console output
+    :param fast_validation: if True, use lightweight structural checks instead of full
+        model validation for each record
     :return: IDs for records created from source
     """
     delete_time = delete_source(source, db, silent)
-    load_time, processed_ids = load_source(source, db, use_existing, silent)
+    load_time, processed_ids = load_source(
+        source, db, use_existing, silent, fast_validation
+    )
     _emit_info_msg(
         f"Total time for {source.value}: {(delete_time + load_time):.5f} seconds.",
         silent,
@@ -140,18 +156,23 @@ def update_source(
 
 
 def update_all_sources(
-    db: AbstractDatabase, use_existing: bool, silent: bool = True
+    db: AbstractDatabase,
+    use_existing: bool,
+    silent: bool = True,
+    fast_validation: bool = False,
 ) -> set[str]:
     """Refresh data for all therapy record sources.
 
     :param db: database instance
     :param use_existing: if True, use latest available local data for all sources
     :param silent: if True, suppress console output
+    :param fast_validation: if True, use lightweight structural checks instead of full
+        model validation for each record
     :return: IDs processed from all sources
     """
     processed_ids: list[str] = []
     for source in SourceName:
-        source_ids = update_source(source, db, use_existing, silent)
+        source_ids = update_source(source, db, use_existing, silent, fast_validation)
         processed_ids += list(source_ids)
     return set(processed_ids)
 
@@ -177,7 +198,10 @@ def delete_normalized(database: AbstractDatabase, silent: bool = True) -> None:
 
 
 def update_normalized(
-    db: AbstractDatabase, processed_ids: set[str] | None, silent: bool = True
+    db: AbstractDatabase,
+    processed_ids: set[str] | None,
+    silent: bool = True,
+    store_concepts: bool = False,
 ) -> None:
     """Delete existing and update merged normalized records.
 
@@ -186,6 +210,8 @@ def update_normalized(
         cut down on some potentially slow database calls. If unavailable, this method
         will fetch all known IDs directly.
     :param silent: if True, suppress console output
+    :param store_concepts: if True, store precomputed therapy concepts with merged
+        records, so that normalization responses don't need to build them
     """
     start = timer()
     delete_normalized(db, silent)
@@ -201,7 +227,7 @@ def update_normalized(
         _logger.exception(msg)
         click.get_current_context().exit()
 
-    merge = Merge(database=db)
+    merge = Merge(database=db, store_concepts=store_concepts)
     if not silent:
         click.echo("Constructing normalized records...")
     merge.create_merged_concepts(processed_ids)
@@ -213,7 +239,10 @@ def update_normalized(
 
 
 def update_all_and_normalize(
-    db: AbstractDatabase, use_existing: bool, silent: bool = True
+    db: AbstractDatabase,
+    use_existing: bool,
+    silent: bool = True,
+    fast_validation: bool = False,
 ) -> None:
     """Update all sources as well as normalized records.
 
@@ -227,6 +256,8 @@ def update_all_and_normalize(
     :param db: database instance
     :param use_existing: if True, use latest local copy of data
     :param silent: if True, suppress console output
+    :param fast_validation: if True, use lightweight structural checks instead of full
+        model validation for each record
     """
-    processed_ids = update_all_sources(db, use_existing, silent)
+    processed_ids = update_all_sources(db, use_existing, silent, fast_validation)
     update_normalized(db, processed_ids, silent)
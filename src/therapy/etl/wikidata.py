@@ -2,7 +2,9 @@
 
 import datetime
 import json
+import logging
 import os
+from itertools import groupby
 from pathlib import Path
 from typing import Any
 
@@ -14,13 +16,15 @@ from wikibaseintegrator.wbi_helpers import execute_sparql_query
 
 from therapy import XREF_SOURCES
 from therapy.etl.base import Base, EtlError
-from therapy.schemas import NamespacePrefix, RecordParams, SourceMeta, SourceName
+from therapy.schemas import NamespacePrefix, SourceMeta, SourceName
 
 wbi_config["USER_AGENT"] = (
     os.environ.get("WIKIBASE_USER_AGENT")
     or "thera_py (https://github.com/cancervariants/therapy-normalization)"
 )
 
+_logger = logging.getLogger(__name__)
+
 # Translate Wikidata keys to standardized namespaces
 NAMESPACES = {
     "casRegistry": NamespacePrefix.CASREGISTRY.value,
@@ -93,32 +97,95 @@ GROUP BY ?item ?itemLabel ?casRegistry ?pubchemCompound ?pubchemSubstance ?chemb
   ?rxnorm ?drugbank ?guideToPharmacology
 """
 
+# Order on every grouped variable, so that OFFSET pagination is stable and all rows for
+# an item are adjacent
+SPARQL_ORDER_BY = """ORDER BY ?item ?itemLabel ?casRegistry ?pubchemCompound
+  ?pubchemSubstance ?chembl ?rxnorm ?drugbank ?guideToPharmacology
+"""
+
+# Number of rows to request per query, number of attempts per query, and seconds to
+# wait between attempts
+SPARQL_PAGE_SIZE = 50000
+SPARQL_PAGE_RETRIES = 5
+SPARQL_RETRY_AFTER = 30
+
 
 class Wikidata(Base):
     """Class for Wikidata ETL methods."""
 
+    @staticmethod
+    def _get_page(offset: int) -> list[dict]:
+        """Retrieve a single page of Wikidata medicine query results.
+
+        :param offset: number of rows to skip
+        :return: rows of query results, as flat dicts mapping variable names to values
+        :raise EtlError: if SPARQL query fails
+        """
+        query = (
+            f"{SPARQL_QUERY}{SPARQL_ORDER_BY}"
+            f"LIMIT {SPARQL_PAGE_SIZE}\nOFFSET {offset}\n"
+        )
+        try:
+            results = execute_sparql_query(
+                query, max_retries=SPARQL_PAGE_RETRIES, retry_after=SPARQL_RETRY_AFTER
+            )
+        except Exception as e:
+            msg = f"Wikidata medicine SPARQL query failed at offset {offset}"
+            raise EtlError(msg) from e
+        if results is None:
+            msg = f"Wikidata medicine SPARQL query failed at offset {offset}"
+            raise EtlError(msg)
+        return [
+            {attr: value["value"] for attr, value in row.items()}
+            for row in results["results"]["bindings"]
+        ]
+
+    @staticmethod
+    def _truncate_partial_rows(partial_file: Path) -> int:
+        """Remove trailing, incompletely written row from partial download file.
+
+        :param partial_file: location of partial data dump
+        :return: number of complete rows remaining in file
+        """
+        n_rows = 0
+        end = 0
+        with partial_file.open("r+b") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                n_rows += 1
+                end += len(line)
+            f.truncate(end)
+        return n_rows
+
     @staticmethod
     def _download_data(version: str, file: Path) -> None:  # noqa: ARG004
-        """Download latest Wikidata source dump.
+        """Download latest Wikidata source dump as JSON Lines, one page of query results
+        at a time.
+
+        Pages are appended to a partial file as they're received, and the partial file
+        is moved into place once all pages are retrieved. If a page can't be retrieved,
+        the next download attempt resumes from that page, after discarding any
+        incompletely written row.
 
         :param version: not used by this method
         :param file: location to save data dump at
         :raise EtlError: if SPARQL query fails
         """
-        medicine_query_results = execute_sparql_query(SPARQL_QUERY)
-        if medicine_query_results is None:
-            msg = "Wikidata medicine SPARQL query failed"
-            raise EtlError(msg)
-        results = medicine_query_results["results"]["bindings"]
-
-        transformed_data = []
-        for item in results:
-            params: RecordParams = {}
-            for attr in item:
-                params[attr] = item[attr]["value"]
-            transformed_data.append(params)
-        with file.open("w+") as f:
-            json.dump(transformed_data, f)
+        partial_file = file.with_name(f"{file.name}.part")
+        offset = 0
+        if partial_file.exists():
+            offset = Wikidata._truncate_partial_rows(partial_file)
+            _logger.info("Resuming Wikidata download from row %s", offset)
+        with partial_file.open("a") as f:
+            while True:
+                rows = Wikidata._get_page(offset)
+                f.write("".join(f"{json.dumps(row)}\n" for row in rows))
+                f.flush()
+                offset += len(rows)
+                if len(rows) < SPARQL_PAGE_SIZE:
+                    break
+        partial_file.replace(file)
 
     @staticmethod
     def _get_latest_version() -> str:
@@ -138,7 +205,7 @@ class Wikidata(Base):
         """
         return CustomData(
             "wikidata",
-            "json",
+            "jsonl",
             self._get_latest_version,
             self._download_data,
             data_dir=data_path,
@@ -161,47 +228,60 @@ class Wikidata(Base):
         )
         self.database.add_source_metadata(SourceName.WIKIDATA, metadata)
 
+    @staticmethod
+    def _get_item(rows: list[dict]) -> dict[str, Any]:
+        """Construct therapy record from rows of query results for a single item.
+
+        :param rows: query result rows for an item
+        :return: therapy record params
+        """
+        record = rows[0]
+        record_id = record["item"].split("/")[-1]
+        concept_id = f"{NamespacePrefix.WIKIDATA.value}:{record_id}"
+        item: dict[str, Any] = {"concept_id": concept_id}
+
+        xrefs = []
+        associated_with = []
+        for key in NAMESPACES:
+            if key in record:
+                ref = record[key]
+
+                if key.upper() == "CASREGISTRY":
+                    key = SourceName.CHEMIDPLUS.value
+
+                if key.upper() in XREF_SOURCES:
+                    if key != "chembl":
+                        prefix = ID_PREFIXES.get(key.lower(), "")
+                        fmted_xref = f"{NAMESPACES[key]}:{prefix}{ref}"
+                    else:
+                        fmted_xref = f"{NAMESPACES[key]}:{ref}"
+                    xrefs.append(fmted_xref)
+                else:
+                    fmted_assoc = f"{NAMESPACES[key]}:{ref}"
+                    associated_with.append(fmted_assoc)
+        item["xrefs"] = xrefs
+        item["associated_with"] = associated_with
+        if "itemLabel" in record:
+            item["label"] = record["itemLabel"]
+        for row in rows:
+            if "aliases" in row:
+                if "aliases" in item:
+                    item["aliases"] += row["aliases"].split(";;")
+                else:
+                    item["aliases"] = row["aliases"].split(";;")
+        return item
+
     def _transform_data(self) -> None:
-        """Transform the Wikidata source data."""
+        """Transform the Wikidata source data.
+
+        Rows are read one at a time. Since all rows for an item are adjacent, each item
+        is loaded as soon as its rows have been read.
+        """
         with self._data_file.open() as f:
-            records: dict = json.load(f)
-
-            items: dict[str, Any] = {}
-
-            for record in records:
-                record_id = record["item"].split("/")[-1]
-                concept_id = f"{NamespacePrefix.WIKIDATA.value}:{record_id}"
-                if concept_id not in items:
-                    item: dict[str, Any] = {"concept_id": concept_id}
-
-                    xrefs = []
-                    associated_with = []
-                    for key in NAMESPACES:
-                        if key in record:
-                            ref = record[key]
-
-                            if key.upper() == "CASREGISTRY":
-                                key = SourceName.CHEMIDPLUS.value
-
-                            if key.upper() in XREF_SOURCES:
-                                if key != "chembl":
-                                    prefix = ID_PREFIXES.get(key.lower(), "")
-                                    fmted_xref = f"{NAMESPACES[key]}:{prefix}{ref}"
-                                else:
-                                    fmted_xref = f"{NAMESPACES[key]}:{ref}"
-                                xrefs.append(fmted_xref)
-                            else:
-                                fmted_assoc = f"{NAMESPACES[key]}:{ref}"
-                                associated_with.append(fmted_assoc)
-                    item["xrefs"] = xrefs
-                    item["associated_with"] = associated_with
-                    if "itemLabel" in record:
-                        item["label"] = record["itemLabel"]
-                    items[concept_id] = item
-                if "aliases" in record:
-                    if "aliases" in items[concept_id]:
-                        items[concept_id]["aliases"] += record["aliases"].split(";;")
-                    else:
-                        items[concept_id]["aliases"] = record["aliases"].split(";;")
-        for item in tqdm(items.values(), ncols=80, disable=self._silent):
-            self._load_therapy(item)
+            records = (json.loads(line) for line in f)
+            for _, rows in tqdm(
+                groupby(records, key=lambda r: r["item"]),
+                ncols=80,
+                disable=self._silent,
+            ):
+                self._load_therapy(self._get_item(list(rows)))
@@ -7,17 +7,29 @@ from contextlib import asynccontextmanager
 from enum import Enum
 from typing import Annotated
 
-from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from pydantic import BaseModel
 
 from therapy import __version__
 from therapy.config import get_config
 from therapy.database.database import create_db
 from therapy.query import InvalidParameterError, QueryHandler
+from therapy.responses import (
+    COMPRESSION_MIN_SIZE,
+    MSGPACK_MEDIA_TYPE,
+    compress,
+    encode_response,
+    etag_matches,
+    make_etag,
+    select_content_encoding,
+    select_media_type,
+)
 from therapy.schemas import (
     APP_DESCRIPTION,
     LAB_EMAIL,
     LAB_WEBPAGE_URL,
     NormalizationService,
+    NormalizeView,
     SearchService,
     ServiceInfo,
     ServiceOrganization,
@@ -39,7 +51,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
 
     initialize_logs(log_level=log_level)
     db = create_db()
-    query_handler = QueryHandler(db)
+    query_handler = QueryHandler(db, strict_models=get_config().strict_models)
     app.state.query_handler = query_handler
     yield
     db.close_connection()
@@ -91,6 +103,10 @@ infer_descr = (
     "If true, attempt namespace inference when queries match known "
     "Local Unique Identifier patterns."
 )
+limit_descr = (
+    "Maximum number of records to return per source. Records are ranked by concept "
+    "ID within each source. If not given, all matching records are returned."
+)
 search_description = (
     "For each source, return strongest-match concepts for query string provided by user"
 )
@@ -102,6 +118,11 @@ merged_matches_summary = (
 )
 merged_response_descr = "A response to a validly-formed query."
 normalize_q_descr = "Therapy to normalize."
+view_descr = (
+    "Parts of the normalized concept to include. `minimal` returns only the concept "
+    "ID and label, `mappings` adds mappings to other concepts, and `full` adds "
+    "aliases, trade names, and regulatory approval information."
+)
 unmerged_matches_summary = (
     "Given query, provide source records corresponding to normalized concept."
 )
@@ -115,12 +136,86 @@ unmerged_normalize_description = (
 )
 
 
+# document alternative response formats for query endpoints
+query_responses: dict[int | str, dict] = {
+    200: {"content": {MSGPACK_MEDIA_TYPE: {}}},
+}
+
+
+def _get_cache_headers(request: Request, media_type: str) -> dict[str, str]:
+    """Get caching headers for a query response.
+
+    Entity tags are derived from the query handler's data version, which is
+    periodically re-read, so they change once normalized data is regenerated.
+
+    :param request: incoming HTTP request
+    :param media_type: response media type
+    :return: ETag, Vary, and (if configured) Cache-Control headers
+    """
+    headers = {
+        "ETag": make_etag(
+            request.app.state.query_handler.refresh_data_version(),
+            request.url.path,
+            request.url.query,
+            media_type,
+        ),
+        "Vary": "Accept, Accept-Encoding",
+    }
+    cache_control = get_config().cache_control
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+
+def _get_not_modified_response(request: Request) -> Response | None:
+    """Check whether the client already has the current response to a query.
+
+    Call after validating query parameters, so that invalid requests aren't answered
+    with 304 responses.
+
+    :param request: incoming HTTP request
+    :return: 304 response if the request's ``If-None-Match`` header matches the
+        response's entity tag, None otherwise
+    """
+    media_type = select_media_type(request.headers.get("accept"))
+    headers = _get_cache_headers(request, media_type)
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+def _serialize_response(
+    request: Request, response: BaseModel, exclude_none: bool = False
+) -> Response:
+    """Serialize query response, as JSON or as MessagePack if the client's ``Accept``
+    header prefers it, and compress it if the client accepts compressed responses.
+
+    Query responses are returned pre-serialized, rather than having FastAPI validate
+    them against the response model again (see ``QueryHandler`` for validation of
+    response models).
+
+    :param request: incoming HTTP request
+    :param response: completed query response
+    :param exclude_none: if True, omit fields that are set to None
+    :return: serialized response
+    """
+    media_type = select_media_type(request.headers.get("accept"))
+    content = encode_response(response, media_type, exclude_none)
+    headers = _get_cache_headers(request, media_type)
+    content_encoding = select_content_encoding(request.headers.get("accept-encoding"))
+    if content_encoding and len(content) >= COMPRESSION_MIN_SIZE:
+        content = compress(content, content_encoding)
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
 @app.get(
     "/therapy/search",
     summary=get_matches_summary,
     operation_id="getQueryResponse",
     response_description=response_descr,
-    response_model_exclude_none=True,
+    response_model=SearchService,
+    responses=query_responses,
     description=search_description,
     tags=[_Tag.SEARCH],
 )
@@ -130,19 +225,28 @@ def search(
     incl: Annotated[str | None, Query(description=incl_descr)] = "",
     excl: Annotated[str | None, Query(description=excl_descr)] = "",
     infer_namespace: Annotated[bool, Query(description=infer_descr)] = True,
-) -> SearchService:
+    limit: Annotated[int | None, Query(description=limit_descr, ge=1)] = None,
+) -> Response:
     """For each source, return strongest-match concepts for query string provided by user."""
     query_handler = request.app.state.query_handler
+    try:
+        query_handler.validate_search_params(incl, excl, limit)  # type: ignore[arg-type]
+    except InvalidParameterError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from None
+    not_modified = _get_not_modified_response(request)
+    if not_modified:
+        return not_modified
     try:
         response = query_handler.search(
             html.unescape(q),
             incl=incl,  # type: ignore[arg-type]
             excl=excl,  # type: ignore[arg-type]
             infer=infer_namespace,
+            limit=limit,
         )
     except InvalidParameterError as e:
         raise HTTPException(status_code=422, detail=str(e)) from None
-    return response
+    return _serialize_response(request, response, exclude_none=True)
 
 
 @app.get(
@@ -150,7 +254,8 @@ def search(
     summary=merged_matches_summary,
     operation_id="getMergedRecord",
     response_description=merged_response_descr,
-    response_model_exclude_none=True,
+    response_model=NormalizationService,
+    responses=query_responses,
     description=normalize_description,
     tags=[_Tag.NORMALIZE],
 )
@@ -158,14 +263,18 @@ def normalize(
     request: Request,
     q: Annotated[str, Query(description=normalize_q_descr)],
     infer_namespace: Annotated[bool, Query(description=infer_descr)] = True,
-) -> NormalizationService:
+    view: Annotated[NormalizeView, Query(description=view_descr)] = NormalizeView.FULL,
+) -> Response:
     """Return merged strongest-match concept for query string provided by user."""
+    not_modified = _get_not_modified_response(request)
+    if not_modified:
+        return not_modified
     query_handler = request.app.state.query_handler
     try:
-        response = query_handler.normalize(html.unescape(q), infer_namespace)
+        response = query_handler.normalize(html.unescape(q), infer_namespace, view=view)
     except InvalidParameterError as e:
         raise HTTPException(status_code=422, detail=str(e)) from None
-    return response
+    return _serialize_response(request, response, exclude_none=True)
 
 
 @app.get(
@@ -173,6 +282,8 @@ def normalize(
     summary=unmerged_matches_summary,
     operation_id="getUnmergedRecords",
     response_description=unmerged_response_descr,
+    response_model=UnmergedNormalizationService,
+    responses=query_responses,
     description=unmerged_normalize_description,
     tags=[_Tag.NORMALIZE],
 )
@@ -180,14 +291,17 @@ def normalize_unmerged(
     request: Request,
     q: Annotated[str, Query(description=normalize_q_descr)],
     infer_namespace: Annotated[bool, Query(description=infer_descr)] = True,
-) -> UnmergedNormalizationService:
+) -> Response:
     """Return all individual records associated with a normalized concept."""
+    not_modified = _get_not_modified_response(request)
+    if not_modified:
+        return not_modified
     query_handler = request.app.state.query_handler
     try:
         response = query_handler.normalize_unmerged(html.unescape(q), infer_namespace)
     except InvalidParameterError as e:
         raise HTTPException(status_code=422, detail=str(e)) from None
-    return response
+    return _serialize_response(request, response)
 
 
 @app.get(
@@ -1,55 +1,183 @@
 """Provides methods for handling queries."""
 
 import datetime
-import json
+import heapq
 import re
-from collections.abc import Callable
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Collection, Iterable
+from functools import partial
 from typing import Any, TypeVar
 
 from botocore.exceptions import ClientError
-from disease.schemas import get_concept_mapping as get_disease_concept_mapping
-from ga4gh.core.models import (
-    Coding,
-    ConceptMapping,
-    Extension,
-    MappableConcept,
-    Relation,
-    code,
-)
 from uvicorn.config import logger
 
 from therapy import NAMESPACE_LUIS, PREFIX_LOOKUP, SOURCES
+from therapy.concepts import (
+    build_model,
+    get_indication,
+    get_therapy_concept,
+    load_therapy_concept,
+)
 from therapy.database import AbstractDatabase
 from therapy.schemas import (
-    NAMESPACE_TO_SYSTEM_URI,
+    ApprovalRating,
     BaseNormalizationService,
-    HasIndication,
     MatchesNormalized,
     MatchType,
     NamespacePrefix,
     NormalizationService,
+    NormalizeView,
     RefType,
     SearchService,
     ServiceMeta,
     SourceName,
     SourcePriority,
+    SourceSearchMatches,
     Therapy,
     UnmergedNormalizationService,
 )
+from therapy.term_filter import TermFilter
 
 NormService = TypeVar("NormService", bound=BaseNormalizationService)
 
+# default number of seconds between checks for newly-generated normalized data
+DATA_VERSION_TTL = 30.0
+
+# record attributes needed to resolve a query to its normalized record
+_LOOKUP_FIELDS = ("concept_id", "src_name", "item_type", "merge_ref")
+
+# record attributes to retrieve for each partial normalization view
+_VIEW_FIELDS: dict[NormalizeView, tuple[str, ...]] = {
+    NormalizeView.MINIMAL: (*_LOOKUP_FIELDS, "label"),
+    NormalizeView.MAPPINGS: (*_LOOKUP_FIELDS, "label", "xrefs", "associated_with"),
+}
+
 
 class InvalidParameterError(Exception):
     """Exception for invalid parameter args provided by the user."""
 
 
+class RequestCache:
+    """Memoize database reads for the duration of a single request, so that each
+    record or reference is retrieved from the backend at most once.
+
+    Pass an instance to a ``QueryHandler`` search or normalize method to inspect the
+    backend calls it made afterwards:
+
+    >>> from therapy.query import QueryHandler, RequestCache
+    >>> from therapy.database import create_db
+    >>> q = QueryHandler(create_db())
+    >>> cache = RequestCache(q.db)
+    >>> response = q.normalize("cisplatin", request_cache=cache)
+    >>> cache.db_calls
+    Counter({'get_normalized_ref': 1, 'get_record_by_id': 1})
+    """
+
+    def __init__(self, database: AbstractDatabase) -> None:
+        """Initialize request cache.
+
+        :param database: storage backend to read from
+        """
+        self.db = database
+        self.db_calls: Counter[str] = Counter()
+        self._records: dict[tuple[str, bool, frozenset[str] | None], dict | None] = {}
+        self._refs: dict[tuple[str, RefType, frozenset[str] | None], list[str]] = {}
+        self._first_refs: dict[tuple[str, RefType], str | None] = {}
+        self._normalized_refs: dict[str, dict | None] = {}
+
+    def get_record_by_id(
+        self,
+        concept_id: str,
+        merge: bool = False,
+        fields: Collection[str] | None = None,
+    ) -> dict | None:
+        """Fetch record corresponding to provided concept ID. Lookups are
+        case-insensitive.
+
+        Callers are free to modify top-level values of the returned record without
+        affecting later lookups.
+
+        :param concept_id: concept ID for therapy record
+        :param merge: if true, look for merged record; look for identity record
+            otherwise.
+        :param fields: if given, only these record attributes need to be retrieved
+        :return: therapy record, if match is found; None otherwise
+        """
+        full_key = (concept_id.lower(), merge, None)
+        key = full_key if fields is None else (full_key[0], merge, frozenset(fields))
+        if key not in self._records and full_key in self._records:
+            key = full_key
+        if key not in self._records:
+            self.db_calls["get_record_by_id"] += 1
+            self._records[key] = self.db.get_record_by_id(
+                concept_id, case_sensitive=False, merge=merge, fields=fields
+            )
+        record = self._records[key]
+        return dict(record) if record else None
+
+    def get_refs_by_type(
+        self,
+        search_term: str,
+        ref_type: RefType,
+        sources: Collection[str] | None = None,
+    ) -> list[str]:
+        """Retrieve concept IDs for records matching the user's query.
+
+        :param search_term: string to match against
+        :param ref_type: type of match to look for.
+        :param sources: if given, only return concept IDs for records from these
+            sources
+        :return: list of associated concept IDs. Empty if lookup fails.
+        """
+        source_set = frozenset(sources) if sources is not None else None
+        key = (search_term, ref_type, source_set)
+        if key not in self._refs:
+            self.db_calls["get_refs_by_type"] += 1
+            self._refs[key] = self.db.get_refs_by_type(
+                search_term, ref_type, source_set
+            )
+        return self._refs[key]
+
+    def get_first_ref_by_type(self, search_term: str, ref_type: RefType) -> str | None:
+        """Retrieve the concept ID of the highest-priority record matching the user's
+        query.
+
+        :param search_term: string to match against
+        :param ref_type: type of match to look for
+        :return: concept ID, if any records match
+        """
+        key = (search_term, ref_type)
+        if key not in self._first_refs:
+            self.db_calls["get_first_ref_by_type"] += 1
+            self._first_refs[key] = self.db.get_first_ref_by_type(search_term, ref_type)
+        return self._first_refs[key]
+
+    def get_normalized_ref(self, term: str) -> dict | None:
+        """Retrieve the precomputed normalization result for a search term.
+
+        :param term: lowercase, stripped search term
+        :return: normalization result item, if available
+        """
+        if term not in self._normalized_refs:
+            self.db_calls["get_normalized_ref"] += 1
+            self._normalized_refs[term] = self.db.get_normalized_ref(term)
+        return self._normalized_refs[term]
+
+
 class QueryHandler:
     """Class for normalizer management. Stores reference to database instance and
     normalizes query input.
     """
 
-    def __init__(self, database: AbstractDatabase) -> None:
+    def __init__(
+        self,
+        database: AbstractDatabase,
+        use_term_filter: bool = True,
+        strict_models: bool = False,
+        data_version_ttl: float = DATA_VERSION_TTL,
+    ) -> None:
         """Initialize QueryHandler instance. Requires a created database object to
         initialize. The most straightforward way to do this is via the ``create_db``
         method in the ``therapy.database`` module:
@@ -59,8 +187,88 @@ class QueryHandler:
         >>> q = QueryHandler(create_db())
 
         :param database: storage backend to search against
+        :param use_term_filter: if True, load the filter over all searchable terms
+            generated alongside merged records, and use it to answer queries for
+            unknown terms without database lookups
+        :param strict_models: if True, validate all response models as they're built.
+            Otherwise, models are constructed directly from stored data, which is
+            validated during ETL.
+        :param data_version_ttl: max number of seconds to go between checks for
+            newly-generated normalized data (see ``refresh_data_version()``)
         """
         self.db = database
+        self.strict_models = strict_models
+        self._use_term_filter = use_term_filter
+        self._data_version_ttl = data_version_ttl
+        self._data_version_lock = threading.Lock()
+        self.data_version = self.db.get_data_version()
+        self._data_version_checked = time.monotonic()
+        self.term_filter = self._load_term_filter() if use_term_filter else None
+
+    def refresh_data_version(self) -> str:
+        """Re-read the data version if it hasn't been checked within the TTL given
+        at initialization, and reload the term filter if the version has changed.
+
+        Precomputed normalization results and the term filter are only used if they
+        were built from the current data version, so after normalized data is
+        regenerated, they can be out of date for at most that long.
+
+        :return: current data version
+        """
+        if time.monotonic() - self._data_version_checked < self._data_version_ttl:
+            return self.data_version
+        with self._data_version_lock:
+            if time.monotonic() - self._data_version_checked < self._data_version_ttl:
+                return self.data_version
+            data_version = self.db.get_data_version()
+            if data_version != self.data_version:
+                logger.info(
+                    f"Data version changed from `{self.data_version}` to "
+                    f"`{data_version}` -- reloading term filter."
+                )
+                self.term_filter = None
+                self.data_version = data_version
+                if self._use_term_filter:
+                    self.term_filter = self._load_term_filter()
+            self._data_version_checked = time.monotonic()
+        return self.data_version
+
+    def _load_term_filter(self) -> TermFilter | None:
+        """Load term filter, if one is available and was built from the current data.
+
+        :return: term filter, or None if it's unavailable or out of date
+        """
+        term_filter = self.db.get_term_filter()
+        if term_filter is None:
+            logger.info("No term filter available -- all queries will use the DB.")
+            return None
+        if term_filter.data_version != self.data_version:
+            logger.warning(
+                f"Term filter was built from data version `{term_filter.data_version}`"
+                f", but current data version is `{self.data_version}` -- ignoring it."
+            )
+            return None
+        return term_filter
+
+    def _is_definite_miss(self, query_str: str, query: str, infer: bool) -> bool:
+        """Check whether a query definitely can't match any record.
+
+        :param query_str: lowercase, stripped query
+        :param query: query as used for namespace inference
+        :param infer: whether namespace inference will be attempted
+        :return: True if the query is absent from a term filter built from the
+            current data, and no namespace could be inferred for it, False otherwise
+        """
+        term_filter = self.term_filter
+        if (
+            term_filter is None
+            or term_filter.data_version != self.data_version
+            or query_str in term_filter
+        ):
+            return False
+        return not (
+            infer and any(re.match(pattern, query) for pattern, _ in NAMESPACE_LUIS)
+        )
 
     def _emit_char_warnings(self, query_str: str) -> list[dict]:
         """Emit warnings if query contains non breaking space characters.
@@ -81,18 +289,24 @@ class QueryHandler:
             )
         return warnings
 
-    @staticmethod
-    def _get_indication(indication_string: str) -> HasIndication:
-        """Load indication data.
-        :param str indication_string: dumped JSON string from db
-        :return: complete HasIndication object
+    def _get_therapy(self, record: dict) -> Therapy:
+        """Format DB record as a Therapy object.
+
+        :param record: record as stored in DB. Modified in place.
+        :return: Therapy object
         """
-        indication_values = json.loads(indication_string)
-        return HasIndication(
-            disease_id=indication_values[0],
-            disease_label=indication_values[1],
-            normalized_disease_id=indication_values[2],
-            supplemental_info=indication_values[3],
+        inds = record.get("has_indication")
+        if inds:
+            record["has_indication"] = [
+                get_indication(i, self.strict_models) for i in inds
+            ]
+        ratings = record.get("approval_ratings")
+        if ratings:
+            record["approval_ratings"] = [ApprovalRating(r) for r in ratings]
+        return build_model(
+            Therapy,
+            self.strict_models,
+            **{k: v for k, v in record.items() if k in Therapy.model_fields},
         )
 
     def _add_record(
@@ -100,20 +314,18 @@ class QueryHandler:
     ) -> tuple[dict, str]:
         """Add individual record (i.e. Item in DynamoDB) to response object
 
-        :param Dict[str, Dict] response: in-progress response object
+        :param Dict[str, Dict] response: in-progress response object, including the
+            set of IDs of records added so far (``concept_ids``)
         :param Dict item: Item retrieved from DynamoDB
         :param MatchType match_type: type of query match
         :return: Tuple containing updated response object, and string containing name of
             the source of the match
         """
-        inds = item.get("has_indication")
-        if inds:
-            item["has_indication"] = [self._get_indication(i) for i in inds]
-
-        drug = Therapy(**item)
+        drug = self._get_therapy(item)
         src_name = item["src_name"]
 
         matches = response["source_matches"]
+        concept_ids = response["concept_ids"]
         if src_name not in matches:
             pass
         elif matches[src_name] is None:
@@ -122,15 +334,21 @@ class QueryHandler:
                 "records": [drug],
                 "source_meta_": self.db.get_source_metadata(src_name),
             }
+            concept_ids.add(drug.concept_id)
         elif (matches[src_name]["match_type"] == MatchType[match_type.upper()]) and (
-            drug.concept_id not in [r.concept_id for r in matches[src_name]["records"]]
+            drug.concept_id not in concept_ids
         ):
             matches[src_name]["records"].append(drug)
+            concept_ids.add(drug.concept_id)
 
         return response, src_name
 
     def _fetch_records(
-        self, response: dict[str, dict], concept_ids: set[str], match_type: str
+        self,
+        response: dict[str, dict],
+        concept_ids: set[str],
+        match_type: str,
+        request_cache: RequestCache,
     ) -> tuple[dict, set]:
         """Return matched Drug records as a structured response for a given collection
         of concept IDs.
@@ -139,15 +357,14 @@ class QueryHandler:
         :param List[str] concept_ids: List of concept IDs to build from.  Should be all
             lower-case.
         :param str match_type: record should be assigned this type of match.
+        :param request_cache: record lookup cache for current request
         :return: response Dict with records filled in via provided concept IDs, and Set
             of source names of matched records
         """
         matched_sources = set()
         for concept_id in concept_ids:
             try:
-                match = self.db.get_record_by_id(
-                    concept_id.lower(), case_sensitive=False
-                )
+                match = request_cache.get_record_by_id(concept_id)
                 if not match:
                     msg = f"Unable to retrieve record for {concept_id}"
                     raise KeyError(msg)
@@ -174,16 +391,27 @@ class QueryHandler:
                 }
         return resp
 
-    def _infer_namespace(self, query: str) -> tuple[dict, dict] | None:
+    def _infer_namespace(
+        self,
+        query: str,
+        request_cache: RequestCache,
+        sources: Collection[str] | None = None,
+        fields: Collection[str] | None = None,
+    ) -> tuple[dict, dict] | None:
         """Retrieve concept ID by inferring namespace. Attempts to match given query
         against known LUI patterns and performs concept ID lookup for all matches.
         :param str query: user-provided query string
+        :param request_cache: record lookup cache for current request
+        :param sources: if given, only infer namespaces for these sources
+        :param fields: if given, only retrieve these record attributes
         :return: Either tuple containing complete record and warnings if successful,
         or None if unsuccessful
         """
         inferred_records = []
         namespace = None
         for pattern, source in NAMESPACE_LUIS:
+            if sources is not None and source not in sources:
+                continue
             match = re.match(pattern, query)
             if match:
                 if source == SourceName.DRUGSATFDA.value:
@@ -193,7 +421,7 @@ class QueryHandler:
                 else:
                     namespace = NamespacePrefix[source.upper()].value
                     inferred_id = f"{namespace}:{query}"
-                record = self.db.get_record_by_id(inferred_id, case_sensitive=False)
+                record = request_cache.get_record_by_id(inferred_id, fields=fields)
                 if record:
                     inferred_records.append((record, namespace, inferred_id))
         if inferred_records and namespace:
@@ -210,25 +438,34 @@ class QueryHandler:
         return None
 
     def _check_concept_id(
-        self, query: str, resp: dict, sources: set[str], infer: bool = True
+        self,
+        query: str,
+        resp: dict,
+        sources: set[str],
+        request_cache: RequestCache,
+        infer: bool = True,
     ) -> tuple[dict, set]:
         """Check query for concept ID match. Should only find 0 or 1 matches.
 
         :param str query: search string
         :param Dict resp: in-progress response object to return to client
         :param Set[str] sources: remaining unmatched sources
+        :param request_cache: record lookup cache for current request
         :param bool infer: if true, try to infer namespaces for IDs
         :return: Tuple with updated resp object and updated set of unmatched sources
         """
         records = []
         if infer:
-            infer_response = self._infer_namespace(query)
+            infer_response = self._infer_namespace(query, request_cache, sources)
             if infer_response:
                 records.append(infer_response[0])
                 resp["warnings"].append(infer_response[1])
         query_lower = query.lower()
-        if [p for p in PREFIX_LOOKUP if query_lower.startswith(p)]:
-            record = self.db.get_record_by_id(query, False)
+        prefix_sources = {
+            src for p, src in PREFIX_LOOKUP.items() if query_lower.startswith(p)
+        }
+        if prefix_sources & sources:
+            record = request_cache.get_record_by_id(query)
             if record:
                 records.append(record)
         for item in records:
@@ -237,7 +474,13 @@ class QueryHandler:
         return resp, sources
 
     def _check_match_type(
-        self, query: str, resp: dict, sources: set[str], match_type: RefType
+        self,
+        query: str,
+        resp: dict,
+        sources: set[str],
+        match_type: RefType,
+        request_cache: RequestCache,
+        limit: int | None = None,
     ) -> tuple[dict, set]:
         """Check query for selected match type.
 
@@ -245,45 +488,82 @@ class QueryHandler:
         :param resp: in-progress response object to return to client
         :param sources: remaining unmatched sources
         :param match_type: Match type to check for
+        :param request_cache: record lookup cache for current request
+        :param limit: max number of records to return per source
         :return: Tuple with updated resp object and updated set of unmatched sources
         """
-        matching_ids = self.db.get_refs_by_type(query, match_type)
+        matching_ids = request_cache.get_refs_by_type(query, match_type, sources)
+        if limit is not None:
+            matching_ids = self._get_top_matches(matching_ids, limit)
         if matching_ids:
             (resp, matched_srcs) = self._fetch_records(
-                resp, set(matching_ids), match_type
+                resp, set(matching_ids), match_type, request_cache
             )
             sources = sources - matched_srcs
         return resp, sources
 
+    @staticmethod
+    def _get_top_matches(concept_ids: Iterable[str], limit: int) -> list[str]:
+        """Select the first matching concept IDs from each source, ranked by concept ID.
+        Sources are determined from concept ID prefixes, so no records need to be
+        retrieved.
+
+        :param concept_ids: lowercase concept IDs of matching records
+        :param limit: max number of concept IDs to select per source
+        :return: selected concept IDs
+        """
+        source_matches: dict[str | None, list[str]] = {}
+        for concept_id in concept_ids:
+            source = PREFIX_LOOKUP.get(concept_id.split(":", 1)[0])
+            source_matches.setdefault(source, []).append(concept_id)
+        return [
+            concept_id
+            for matches in source_matches.values()
+            for concept_id in heapq.nsmallest(limit, matches)
+        ]
+
     def _get_search_response(
-        self, query: str, sources: set[str], infer: bool = True
+        self,
+        query: str,
+        sources: set[str],
+        request_cache: RequestCache,
+        infer: bool = True,
+        limit: int | None = None,
     ) -> dict:
         """Return response as dict where key is source name and value
         is a list of records.
 
         :param str query: string to match against
         :param Set[str] sources: sources to match from
+        :param request_cache: record lookup cache for current request
         :param bool infer: if true, attempt to infer namespaces from IDs
+        :param limit: max number of records to return per source
         :return: completed response object to return to client
         """
-        response: dict[str, None | str | list[dict] | dict] = {
+        response: dict[str, None | str | list[dict] | dict | set[str]] = {
             "query": query,
             "warnings": self._emit_char_warnings(query),
             "source_matches": dict.fromkeys(sources),
+            # IDs of records added to source_matches, for deduplication
+            "concept_ids": set(),
         }
         if query == "":
             return self._fill_no_matches(response)
         query = query.strip()
+        if self._is_definite_miss(query.lower(), query, infer):
+            return self._fill_no_matches(response)
 
         # check if concept ID match
-        response, sources = self._check_concept_id(query, response, sources, infer)
+        response, sources = self._check_concept_id(
+            query, response, sources, request_cache, infer
+        )
         if len(sources) == 0:
             return response
 
         query = query.lower()
         for match_type in RefType:
             response, sources = self._check_match_type(
-                query, response, sources, match_type
+                query, response, sources, match_type, request_cache, limit
             )
             if len(sources) == 0:
                 return response
@@ -291,27 +571,23 @@ class QueryHandler:
         # remaining sources get no match
         return self._fill_no_matches(response)
 
-    def search(
-        self,
-        query_str: str,
-        incl: str = "",
-        excl: str = "",
-        infer: bool = True,
-    ) -> SearchService:
-        """Fetch normalized therapy objects.
+    def validate_search_params(
+        self, incl: str = "", excl: str = "", limit: int | None = None
+    ) -> set[str]:
+        """Check search parameters, and get the sources that they select.
 
-        :param str query_str: query, a string, to search for
         :param str incl: str containing comma-separated names of sources to use. Will
             exclude all other sources. Case-insensitive.
         :param str excl: str containing comma-separated names of source to exclude. Will
             include all other source. Case-insensitive.
-        :param bool infer: if true, try to infer namespaces using known Local Unique
-            Identifier patterns
-        :return: dict containing all matches found in sources.
-        :raises InvalidParameterException: if both incl and excl args are provided, or
-            if invalid source names are given.
+        :param limit: max number of records to return per source
+        :return: names of sources to search
+        :raises InvalidParameterException: if both incl and excl args are provided, if
+            invalid source names are given, or if limit is less than 1.
         """
-        sources = {}
+        if limit is not None and limit < 1:
+            detail = f"Limit must be a positive integer, got {limit}"
+            raise InvalidParameterError(detail)
         sources = {k: v for k, v in SOURCES.items() if self.db.get_source_metadata(v)}
         if not incl and not excl:
             query_sources = set(sources.values())
@@ -344,13 +620,61 @@ class QueryHandler:
             if invalid_sources:
                 detail = f"Invalid source name(s): {invalid_sources}"
                 raise InvalidParameterError(detail)
+        return query_sources
 
-        response = self._get_search_response(query_str, query_sources, infer)
+    def search(
+        self,
+        query_str: str,
+        incl: str = "",
+        excl: str = "",
+        infer: bool = True,
+        request_cache: RequestCache | None = None,
+        limit: int | None = None,
+    ) -> SearchService:
+        """Fetch normalized therapy objects.
 
-        response["service_meta_"] = ServiceMeta(
-            response_datetime=datetime.datetime.now(tz=datetime.UTC),
-        ).model_dump()
-        return SearchService(**response)
+        :param str query_str: query, a string, to search for
+        :param str incl: str containing comma-separated names of sources to use. Will
+            exclude all other sources. Case-insensitive.
+        :param str excl: str containing comma-separated names of source to exclude. Will
+            include all other source. Case-insensitive.
+        :param bool infer: if true, try to infer namespaces using known Local Unique
+            Identifier patterns
+        :param request_cache: cache to memoize database reads with. Provide to inspect
+            backend calls made by the request; a new one is used otherwise.
+        :param limit: max number of records to return per source. Records are ranked
+            by concept ID within each source.
+        :return: dict containing all matches found in sources.
+        :raises InvalidParameterException: if both incl and excl args are provided, if
+            invalid source names are given, or if limit is less than 1.
+        """
+        self.refresh_data_version()
+        query_sources = self.validate_search_params(incl, excl, limit)
+        if request_cache is None:
+            request_cache = RequestCache(self.db)
+        response = self._get_search_response(
+            query_str, query_sources, request_cache, infer, limit
+        )
+        logger.debug(
+            "Search for `%s` made DB calls: %s", query_str, dict(request_cache.db_calls)
+        )
+
+        source_matches = {
+            SourceName(src_name): build_model(
+                SourceSearchMatches, self.strict_models, **matches
+            )
+            for src_name, matches in response["source_matches"].items()
+        }
+        return build_model(
+            SearchService,
+            self.strict_models,
+            query=response["query"],
+            warnings=response["warnings"],
+            source_matches=source_matches,
+            service_meta_=ServiceMeta(
+                response_datetime=datetime.datetime.now(tz=datetime.UTC),
+            ),
+        )
 
     def _add_merged_meta(self, response: NormalizationService) -> NormalizationService:
         """Add source metadata to response object.
@@ -398,145 +722,25 @@ class QueryHandler:
         response: NormalizationService,
         record: dict,
         match_type: MatchType,
+        view: NormalizeView = NormalizeView.FULL,
     ) -> NormalizationService:
         """Format received DB record as Mappable Concept and update response object.
+
+        If the full concept is requested and the record includes a precomputed concept
+        (see ``Merge``), it's used instead of building the concept from the record's
+        fields.
+
         :param NormalizationService response: in-progress response object
         :param Dict record: record as stored in DB
-        :param str query: query string from user request
         :param MatchType match_type: type of match achieved
+        :param view: parts of the concept to include
         :return: completed response object ready to return to user
         """
-
-        def _get_coding_object(concept_id: str) -> Coding:
-            """Get coding object for CURIE identifier
-
-            ``system`` will use system prefix URL, OBO Foundry persistent URL (PURL), or
-            source homepage, in that order of preference.
-
-            :param concept_id: A lowercase concept identifier represented as a curie
-            :raises ValueError: If source of concept ID is not a valid ``NamespacePrefix``
-            :return: Coding object for identifier
-            """
-            source, source_code = concept_id.split(":")
-
-            try:
-                source = NamespacePrefix(source)
-            except ValueError:
-                try:
-                    source = NamespacePrefix(source.upper())
-                except ValueError as e:
-                    err_msg = f"Namespace prefix not supported: {source}"
-                    raise ValueError(err_msg) from e
-
-            if source == NamespacePrefix.CHEBI:
-                source_code = concept_id
-
-            return Coding(
-                id=concept_id,
-                code=code(source_code),
-                system=NAMESPACE_TO_SYSTEM_URI[source],
-            )
-
-        def _get_concept_mapping(
-            concept_id: str,
-            relation: Relation,
-        ) -> ConceptMapping:
-            """Create concept mapping for identifier
-
-            ``system`` will use system prefix URL, OBO Foundry persistent URL (PURL), or
-            source homepage, in that order of preference.
-
-            :param concept_id: A lowercase concept identifier represented as a curie
-            :param relation: SKOS mapping relationship, default is relatedMatch
-            :raises ValueError: If source of concept ID is not a valid
-                ``NamespacePrefix``
-            :return: Concept mapping for identifier
-            """
-            return ConceptMapping(
-                coding=_get_coding_object(concept_id),
-                relation=relation,
-            )
-
-        therapy_obj = MappableConcept(
-            id=f"normalize.therapy.{record['concept_id']}",
-            primaryCoding=_get_coding_object(record["concept_id"]),
-            conceptType="Therapy",
-            name=record.get("label"),
-        )
-
-        xrefs = record.get("xrefs", [])
-        mappings = [
-            _get_concept_mapping(xref_id, relation=Relation.EXACT_MATCH)
-            for xref_id in xrefs
-        ]
-
-        associated_with = record.get("associated_with", [])
-        mappings.extend(
-            _get_concept_mapping(associated_with_id, relation=Relation.RELATED_MATCH)
-            for associated_with_id in associated_with
-        )
-
-        therapy_obj.mappings = mappings or None
-
-        extensions = []
-        if "aliases" in record:
-            extensions.append(Extension(name="aliases", value=record["aliases"]))
-
-        if any(
-            filter(
-                lambda f: f in record,
-                ("approval_ratings", "approval_year", "has_indication"),
-            )
-        ):
-            approv_value = {}
-            if "approval_ratings" in record:
-                value = record.get("approval_ratings")
-                if value:
-                    approv_value["approval_ratings"] = value
-            if "approval_year" in record:
-                value = record.get("approval_year")
-                if value:
-                    approv_value["approval_year"] = value
-
-            inds = record.get("has_indication", [])
-            inds_list = []
-            for ind_db in inds:
-                indication = self._get_indication(ind_db)
-
-                if indication.normalized_disease_id:
-                    mappings = [
-                        get_disease_concept_mapping(
-                            concept_id=indication.normalized_disease_id,
-                            relation=Relation.EXACT_MATCH,
-                        )
-                    ]
-                else:
-                    mappings = []
-                ind_disease_obj = MappableConcept(
-                    id=indication.disease_id,
-                    conceptType="Disease",
-                    name=indication.disease_label,
-                    mappings=mappings or None,
-                )
-
-                if indication.supplemental_info:
-                    ind_disease_obj.extensions = [
-                        Extension(name=k, value=v)
-                        for k, v in indication.supplemental_info.items()
-                    ]
-                inds_list.append(ind_disease_obj.model_dump(exclude_none=True))
-            if inds_list:
-                approv_value["has_indication"] = inds_list
-
-            approv = Extension(name="regulatory_approval", value=approv_value)
-            extensions.append(approv)
-
-        trade_names = record.get("trade_names")
-        if trade_names:
-            extensions.append(Extension(name="trade_names", value=trade_names))
-
-        if extensions:
-            therapy_obj.extensions = extensions
+        therapy_concept = record.get("therapy_concept")
+        if therapy_concept and view == NormalizeView.FULL:
+            therapy_obj = load_therapy_concept(therapy_concept, self.strict_models)
+        else:
+            therapy_obj = get_therapy_concept(record, view, self.strict_models)
 
         response.match_type = match_type
         response.therapy = therapy_obj
@@ -549,6 +753,8 @@ class QueryHandler:
         record: dict,
         match_type: MatchType,
         callback: Callable,
+        request_cache: RequestCache,
+        fields: Collection[str] | None = None,
     ) -> NormService:
         """Given a record, return the corresponding normalized record
 
@@ -557,12 +763,14 @@ class QueryHandler:
         :param Dict record: record to retrieve normalized concept for
         :param MatchType match_type: type of match that returned these records
         :param Callable callback: response constructor method
+        :param request_cache: record lookup cache for current request
+        :param fields: if given, only retrieve these record attributes
         :return: Normalized response object
         """
         merge_ref = record.get("merge_ref")
         if merge_ref:
             # follow merge_ref
-            merge = self.db.get_record_by_id(merge_ref, False, True)
+            merge = request_cache.get_record_by_id(merge_ref, merge=True, fields=fields)
             if merge is None:
                 logger.error(
                     f"Merge ref lookup failed for ref {record['merge_ref']} "
@@ -588,36 +796,48 @@ class QueryHandler:
             ),
         }
 
-    def normalize(self, query: str, infer: bool = True) -> NormalizationService:
+    def normalize(
+        self,
+        query: str,
+        infer: bool = True,
+        request_cache: RequestCache | None = None,
+        view: NormalizeView = NormalizeView.FULL,
+    ) -> NormalizationService:
         """Return merged, normalized concept for given search term.
 
         :param str query: string to search against
         :param bool infer: if true, try to infer namespace for IDs
+        :param request_cache: cache to memoize database reads with. Provide to inspect
+            backend calls made by the request; a new one is used otherwise.
+        :param view: parts of the normalized concept to include. Record attributes
+            that aren't needed for the requested parts aren't retrieved.
         :return: Normalized response object
         """
+        self.refresh_data_version()
+        if request_cache is None:
+            request_cache = RequestCache(self.db)
         # prepare basic response
         response = NormalizationService(**self._prepare_normalized_response(query))
 
-        return self._perform_normalized_lookup(
-            response, query, infer, self._add_therapy
+        response = self._perform_normalized_lookup(
+            response,
+            query,
+            infer,
+            partial(self._add_therapy, view=view),
+            request_cache,
+            _VIEW_FIELDS.get(view),
         )
-
-    def _construct_drug_match(self, record: dict) -> Therapy:
-        """Create individual Drug match for unmerged normalization endpoint.
-
-        :param Dict record: record to add
-        :return: completed Drug object
-        """
-        inds = record.get("has_indication")
-        if inds:
-            record["has_indication"] = [self._get_indication(i) for i in inds]
-        return Therapy(**record)
+        logger.debug(
+            "Normalizing `%s` made DB calls: %s", query, dict(request_cache.db_calls)
+        )
+        return response
 
     def _add_normalized_records(
         self,
         response: UnmergedNormalizationService,
         normalized_record: dict,
         match_type: MatchType,
+        request_cache: RequestCache,
     ) -> UnmergedNormalizationService:
         """Add individual records to unmerged normalize response.
 
@@ -625,14 +845,17 @@ class QueryHandler:
         :param Dict normalized_record: record associated with normalized concept,
             either merged or single identity
         :param MatchType match_type: type of match achieved
+        :param request_cache: record lookup cache for current request
         :return: Completed response object
         """
         response.match_type = match_type
         response.normalized_concept_id = normalized_record["concept_id"]
         if normalized_record["item_type"] == "identity":
             record_source = SourceName[normalized_record["src_name"].upper()]
-            response.source_matches[record_source] = MatchesNormalized(
-                records=[self._construct_drug_match(normalized_record)],
+            response.source_matches[record_source] = build_model(
+                MatchesNormalized,
+                self.strict_models,
+                records=[self._get_therapy(normalized_record)],
                 source_meta_=self.db.get_source_metadata(record_source),
             )
         else:
@@ -641,49 +864,118 @@ class QueryHandler:
                 *normalized_record.get("xrefs", []),
             ]
             for concept_id in concept_ids:
-                record = self.db.get_record_by_id(concept_id, case_sensitive=False)
+                record = request_cache.get_record_by_id(concept_id)
                 if not record:
                     continue  # cover a few chemidplus edge cases
                 record_source = SourceName[record["src_name"].upper()]
-                drug = self._construct_drug_match(record)
+                drug = self._get_therapy(record)
                 if record_source in response.source_matches:
                     response.source_matches[record_source].records.append(drug)
                 else:
-                    response.source_matches[record_source] = MatchesNormalized(
+                    response.source_matches[record_source] = build_model(
+                        MatchesNormalized,
+                        self.strict_models,
                         records=[drug],
                         source_meta_=self.db.get_source_metadata(record_source),
                     )
         return response
 
+    def _perform_indexed_lookup(
+        self,
+        response: NormService,
+        query: str,
+        query_str: str,
+        infer: bool,
+        response_builder: Callable,
+        request_cache: RequestCache,
+        fields: Collection[str] | None = None,
+    ) -> NormService | None:
+        """Retrieve normalized concept using the precomputed normalization result for
+        the query, if available (see ``Merge._create_normalized_refs()``).
+
+        :param NormService response: in-progress response object
+        :param str query: user-provided query
+        :param str query_str: lowercase, stripped query
+        :param bool infer: whether to try namespace inference
+        :param Callable response_builder: response constructor callback method
+        :param request_cache: record lookup cache for current request
+        :param fields: if given, only retrieve these record attributes
+        :return: completed service response object, or None if the lookup must be
+            performed step by step instead
+        """
+        ref = request_cache.get_normalized_ref(query_str)
+        if not ref or ref["data_version"] != self.data_version:
+            # missing, or left over from a different merge run
+            return None
+        match_type = MatchType[ref["match_type"]]
+        # inferred namespace matches take precedence over non-concept ID matches
+        if (
+            match_type != MatchType.CONCEPT_ID
+            and infer
+            and any(re.match(pattern, query) for pattern, _ in NAMESPACE_LUIS)
+        ):
+            return None
+        record = request_cache.get_record_by_id(
+            ref["concept_id"], merge=ref["merged"], fields=fields
+        )
+        if not record:
+            return None
+        return response_builder(response, record, match_type)
+
     def _perform_normalized_lookup(
-        self, response: NormService, query: str, infer: bool, response_builder: Callable
+        self,
+        response: NormService,
+        query: str,
+        infer: bool,
+        response_builder: Callable,
+        request_cache: RequestCache,
+        fields: Collection[str] | None = None,
     ) -> NormService:
         """Retrieve normalized concept, for use in normalization endpoints
         :param NormService response: in-progress response object
         :param str query: user-provided query
         :param bool infer: whether to try namespace inference
         :param Callable response_builder: response constructor callback method
+        :param request_cache: record lookup cache for current request
+        :param fields: if given, only retrieve these record attributes
         :return: completed service response object
         """
         if query == "":
             return response
         query_str = query.lower().strip()
+        if self._is_definite_miss(query_str, query, infer):
+            return response
+
+        # check precomputed result
+        indexed_response = self._perform_indexed_lookup(
+            response, query, query_str, infer, response_builder, request_cache, fields
+        )
+        if indexed_response is not None:
+            return indexed_response
 
         # check merged concept ID match
-        record = self.db.get_record_by_id(query_str, case_sensitive=False, merge=True)
+        record = request_cache.get_record_by_id(query_str, merge=True, fields=fields)
         if record:
             return response_builder(response, record, MatchType.CONCEPT_ID)
 
         # check concept ID match
-        record = self.db.get_record_by_id(query_str, case_sensitive=False)
+        record = request_cache.get_record_by_id(query_str, fields=fields)
         if record:
             return self._resolve_merge(
-                response, query, record, MatchType.CONCEPT_ID, response_builder
+                response,
+                query,
+                record,
+                MatchType.CONCEPT_ID,
+                response_builder,
+                request_cache,
+                fields,
             )
 
         # check concept ID match with inferred namespace
         if infer:
-            inferred_response = self._infer_namespace(query)
+            inferred_response = self._infer_namespace(
+                query, request_cache, fields=fields
+            )
             if inferred_response:
                 if response.warnings:
                     response.warnings.append(inferred_response[1])
@@ -695,42 +987,62 @@ class QueryHandler:
                     inferred_response[0],
                     MatchType.CONCEPT_ID,
                     response_builder,
+                    request_cache,
+                    fields,
                 )
 
-        # check other match types
+        # check other match types, using the highest-priority match of each
         for match_type in RefType:
-            matching_refs = self.db.get_refs_by_type(query_str, match_type)
-            matching_records = [
-                self.db.get_record_by_id(ref, False) for ref in matching_refs
-            ]
-            matching_records.sort(key=self._record_order)  # type: ignore[arg-type]
-
-            # attempt merge ref resolution until successful
-            for match in matching_records:
-                if match is None:
-                    raise ValueError
-                record = self.db.get_record_by_id(match["concept_id"], False)
-                if record:
-                    match_type_value = MatchType[match_type.upper()]
-                    return self._resolve_merge(
-                        response, query, record, match_type_value, response_builder
-                    )
+            first_ref = request_cache.get_first_ref_by_type(query_str, match_type)
+            if first_ref is None:
+                continue
+            record = request_cache.get_record_by_id(first_ref, fields=fields)
+            if record:
+                match_type_value = MatchType[match_type.upper()]
+                return self._resolve_merge(
+                    response,
+                    query,
+                    record,
+                    match_type_value,
+                    response_builder,
+                    request_cache,
+                    fields,
+                )
+            logger.error(
+                f"Unable to retrieve record for {first_ref} from query `{query}`"
+            )
 
         return response
 
     def normalize_unmerged(
-        self, query: str, infer: bool = True
+        self,
+        query: str,
+        infer: bool = True,
+        request_cache: RequestCache | None = None,
     ) -> UnmergedNormalizationService:
         """Return all source records under the normalized concept for the provided
         query string.
 
         :param str query: string to search against
         :param bool infer: if true, try to infer namespace for IDs
+        :param request_cache: cache to memoize database reads with. Provide to inspect
+            backend calls made by the request; a new one is used otherwise.
         :return: Normalized response object
         """
+        self.refresh_data_version()
+        if request_cache is None:
+            request_cache = RequestCache(self.db)
         response = UnmergedNormalizationService(
             source_matches={}, **self._prepare_normalized_response(query)
         )
-        return self._perform_normalized_lookup(
-            response, query, infer, self._add_normalized_records
+        response = self._perform_normalized_lookup(
+            response,
+            query,
+            infer,
+            partial(self._add_normalized_records, request_cache=request_cache),
+            request_cache,
         )
+        logger.debug(
+            "Normalizing `%s` made DB calls: %s", query, dict(request_cache.db_calls)
+        )
+        return response
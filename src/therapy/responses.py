@@ -0,0 +1,181 @@
+"""Encode API responses in the format requested by the client, and support caching
+them by HTTP clients and proxies.
+"""
+
+import gzip
+import hashlib
+
+from pydantic import BaseModel
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# media ranges that clients may use to request MessagePack
+_MSGPACK_RANGES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+# media ranges that match JSON, from most to least specific
+_JSON_RANGES = (JSON_MEDIA_TYPE, "application/*", "*/*")
+
+# smallest response body, in bytes, that's worth compressing
+COMPRESSION_MIN_SIZE = 1024
+
+# responses are compressed per request, so favor speed over compression ratio
+_GZIP_LEVEL = 5
+_BROTLI_QUALITY = 4
+
+
+def _parse_accept(accept: str) -> dict[str, float]:
+    """Get quality value for each item in an ``Accept`` or ``Accept-Encoding``
+    header.
+
+    :param accept: header value
+    :return: mapping from lowercase media ranges or content codings to quality values
+    """
+    ranges = {}
+    for item in accept.split(","):
+        media_range, *params = (part.strip() for part in item.split(";"))
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges[media_range.lower()] = quality
+    return ranges
+
+
+def select_media_type(accept: str | None) -> str:
+    """Choose response media type from a request's ``Accept`` header.
+
+    MessagePack is used if the client explicitly asks for it at least as strongly as
+    JSON, and the optional ``msgpack`` dependency is installed. Otherwise, JSON is used.
+
+    :param accept: ``Accept`` header value, if provided
+    :return: response media type
+    """
+    if not accept or msgpack is None:
+        return JSON_MEDIA_TYPE
+    ranges = _parse_accept(accept)
+    msgpack_quality = max(ranges.get(r, 0.0) for r in _MSGPACK_RANGES)
+    if msgpack_quality <= 0:
+        return JSON_MEDIA_TYPE
+    json_quality = next((ranges[r] for r in _JSON_RANGES if r in ranges), 0.0)
+    if msgpack_quality >= json_quality:
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def encode_response(
+    response: BaseModel, media_type: str, exclude_none: bool = False
+) -> bytes:
+    """Serialize response model.
+
+    JSON is written directly by Pydantic's serializer, which is faster for our response
+    models than dumping them to Python objects for another JSON library to encode.
+
+    :param response: completed response object
+    :param media_type: output format, as given by ``select_media_type()``
+    :param exclude_none: if True, omit fields that are set to None
+    :return: serialized response
+    :raise ValueError: if media type isn't supported
+    """
+    if media_type == JSON_MEDIA_TYPE:
+        return response.model_dump_json(exclude_none=exclude_none).encode()
+    if media_type == MSGPACK_MEDIA_TYPE and msgpack is not None:
+        return msgpack.packb(
+            response.model_dump(mode="json", exclude_none=exclude_none)
+        )
+    msg = f"Unsupported response media type: {media_type}"
+    raise ValueError(msg)
+
+
+def select_content_encoding(accept_encoding: str | None) -> str | None:
+    """Choose response compression from a request's ``Accept-Encoding`` header.
+
+    Brotli is used if the client accepts it at least as readily as gzip, and the
+    optional ``brotli`` dependency is installed.
+
+    :param accept_encoding: ``Accept-Encoding`` header value, if provided
+    :return: content coding (``"br"`` or ``"gzip"``), or None if the response shouldn't
+        be compressed
+    """
+    if not accept_encoding:
+        return None
+    codings = _parse_accept(accept_encoding)
+    default_quality = codings.get("*", 0.0)
+    gzip_quality = codings.get("gzip", default_quality)
+    if brotli is not None:
+        brotli_quality = codings.get("br", default_quality)
+        if brotli_quality > 0 and brotli_quality >= gzip_quality:
+            return "br"
+    if gzip_quality > 0:
+        return "gzip"
+    return None
+
+
+def compress(content: bytes, content_encoding: str) -> bytes:
+    """Compress response body.
+
+    :param content: serialized response
+    :param content_encoding: content coding, as given by ``select_content_encoding()``
+    :return: compressed response
+    :raise ValueError: if content coding isn't supported
+    """
+    if content_encoding == "br" and brotli is not None:
+        return brotli.compress(content, quality=_BROTLI_QUALITY)
+    if content_encoding == "gzip":
+        return gzip.compress(content, compresslevel=_GZIP_LEVEL)
+    msg = f"Unsupported content encoding: {content_encoding}"
+    raise ValueError(msg)
+
+
+def make_etag(data_version: str, *request_keys: str) -> str:
+    """Build entity tag for a response.
+
+    Apart from their timestamps, responses are determined entirely by the request and
+    the loaded data, so the tag is derived from those instead of the response body,
+    and marked as weak.
+
+    :param data_version: identifier for loaded data (see
+        ``AbstractDatabase.get_data_version()``)
+    :param request_keys: request attributes that determine the response, e.g. its path
+        and parameters
+    :return: weak entity tag, formatted for an ``ETag`` header
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for key in (data_version, *request_keys):
+        digest.update(key.encode())
+        digest.update(b"\0")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check whether an ``If-None-Match`` header matches an entity tag, using weak
+    comparison.
+
+    :param if_none_match: ``If-None-Match`` header value, if provided
+    :param etag: entity tag of current response
+    :return: True if the client's stored response is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(",")
+    )
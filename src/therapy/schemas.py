@@ -182,6 +182,16 @@ class RefType(str, Enum):
 # not incorporated as a RefType because it shouldn't be publicly searchable
 RXNORM_BRAND_ITEM_TYPE = "rx_brand"
 
+# precomputed search term -> normalized concept lookups, generated alongside merged
+# records
+NORMALIZED_REF_ITEM_TYPE = "normalized"
+
+# chunks of a filter over all searchable terms (see `therapy.term_filter`)
+TERM_FILTER_ITEM_TYPE = "term_filter"
+
+# ID of the most recently completed merge run, which identifies the normalized data
+MERGE_RUN_ITEM_TYPE = "merge_run"
+
 
 class MatchType(IntEnum):
     """Define string constraints for use in Match Type attributes."""
@@ -196,6 +206,17 @@ class MatchType(IntEnum):
     NO_MATCH = 0
 
 
+class NormalizeView(str, Enum):
+    """Define the parts of a normalized therapy concept to include in a response."""
+
+    # concept ID and label only
+    MINIMAL = "minimal"
+    # also includes mappings to xrefs and associated concepts
+    MAPPINGS = "mappings"
+    # also includes aliases, trade names, and regulatory approval extensions
+    FULL = "full"
+
+
 class SourcePriority(IntEnum):
     """Define constraints for Source Priority Rankings."""
 
@@ -0,0 +1,131 @@
+"""Provide a compact, probabilistic set of searchable terms."""
+
+import base64
+import hashlib
+import math
+from collections.abc import Collection, Iterable
+
+
+class TermFilter:
+    """Bloom filter over every lowercased searchable term and concept ID, used to skip
+    database lookups for queries that can't match anything.
+
+    Membership checks may return false positives, at roughly the rate the filter was
+    built with, but never false negatives. Each filter carries the data version it was
+    built from, so that consumers can discard it if the underlying data changes.
+
+    >>> from therapy.term_filter import TermFilter
+    >>> term_filter = TermFilter.build({"cisplatin", "rxcui:2555"}, "RxNorm:20210104")
+    >>> "cisplatin" in term_filter
+    True
+    >>> "zzzz fake therapy zzzz" in term_filter
+    False
+    """
+
+    def __init__(
+        self, bits: bytearray, num_bits: int, num_hashes: int, data_version: str
+    ) -> None:
+        """Initialize filter from existing contents. Use ``build()`` to construct a new
+        filter from a collection of terms.
+
+        :param bits: filter bit array
+        :param num_bits: number of bits in use
+        :param num_hashes: number of bit positions set per term
+        :param data_version: identifier for the data that the filter was built from
+        """
+        self._bits = bits
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.data_version = data_version
+
+    @classmethod
+    def build(
+        cls,
+        terms: Collection[str],
+        data_version: str,
+        false_positive_rate: float = 0.01,
+    ) -> "TermFilter":
+        """Construct filter, sized for the given false positive rate.
+
+        :param terms: lowercase terms to include
+        :param data_version: identifier for the data that terms were taken from
+        :param false_positive_rate: target rate of false positive membership checks
+        :return: filter containing all provided terms
+        """
+        num_terms = max(len(terms), 1)
+        num_bits = max(
+            math.ceil(-num_terms * math.log(false_positive_rate) / math.log(2) ** 2), 8
+        )
+        num_hashes = max(round(num_bits / num_terms * math.log(2)), 1)
+        term_filter = cls(
+            bytearray((num_bits + 7) // 8), num_bits, num_hashes, data_version
+        )
+        term_filter.update(terms)
+        return term_filter
+
+    def _get_positions(self, term: str) -> Iterable[int]:
+        """Get bit positions for a term, using double hashing.
+
+        :param term: term to hash
+        :return: bit positions corresponding to term
+        """
+        digest = hashlib.blake2b(term.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def update(self, terms: Iterable[str]) -> None:
+        """Add terms to filter.
+
+        :param terms: lowercase terms to add
+        """
+        bits = self._bits
+        for term in terms:
+            for position in self._get_positions(term):
+                bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, term: object) -> bool:
+        """Check whether a term may be included.
+
+        :param term: lowercase term to check
+        :return: False if the term definitely isn't included, True otherwise
+        """
+        if not isinstance(term, str):
+            return False
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._get_positions(term)
+        )
+
+    def to_chunks(self, chunk_size: int = 1 << 18) -> list[str]:
+        """Serialize filter bit array, for storage across multiple database items.
+
+        :param chunk_size: max number of bytes to encode per chunk
+        :return: base64-encoded chunks of the bit array, in order
+        """
+        return [
+            base64.b64encode(self._bits[i : i + chunk_size]).decode()
+            for i in range(0, len(self._bits), chunk_size)
+        ]
+
+    @classmethod
+    def from_chunks(
+        cls, chunks: Iterable[str], num_bits: int, num_hashes: int, data_version: str
+    ) -> "TermFilter":
+        """Deserialize filter.
+
+        :param chunks: base64-encoded chunks of the bit array, in order
+        :param num_bits: number of bits in use
+        :param num_hashes: number of bit positions set per term
+        :param data_version: identifier for the data that the filter was built from
+        :return: filter instance
+        :raise ValueError: if decoded chunks don't match the expected size
+        """
+        bits = bytearray()
+        for chunk in chunks:
+            bits += base64.b64decode(chunk)
+        if len(bits) != (num_bits + 7) // 8:
+            msg = f"Expected {(num_bits + 7) // 8} filter bytes, got {len(bits)}"
+            raise ValueError(msg)
+        return cls(bits, num_bits, num_hashes, data_version)
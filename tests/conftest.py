@@ -3,7 +3,7 @@
 import json
 import logging
 import os
-from collections.abc import Callable, Generator
+from collections.abc import Callable, Collection, Generator
 from pathlib import Path
 from typing import Any
 
@@ -11,7 +11,7 @@ import pytest
 
 from therapy.config import get_config as get_therapy_config
 from therapy.database.database import AWS_ENV_VAR_NAME, AbstractDatabase, create_db
-from therapy.etl.base import Base
+from therapy.etl.base import Base, DiseaseIndicationBase
 from therapy.query import QueryHandler
 from therapy.schemas import (
     MatchType,
@@ -22,6 +22,7 @@ from therapy.schemas import (
     SourceSearchMatches,
     Therapy,
 )
+from therapy.term_filter import TermFilter
 
 _logger = logging.getLogger(__name__)
 
@@ -33,6 +34,7 @@ def pytest_collection_modifyitems(items):
     """
     module_order = [
         "test_schemas",
+        "test_base",
         "test_chembl",
         "test_chemidplus",
         "test_drugbank",
@@ -49,6 +51,9 @@ def pytest_collection_modifyitems(items):
         "test_emit_warnings",
         "test_disease_indication",
         "test_utils",
+        "test_rules",
+        "test_term_filter",
+        "test_responses",
     ]
     items.sort(key=lambda i: module_order.index(i.module.__name__))
 
@@ -127,6 +132,7 @@ def test_source(
     is_test_env: bool,
     disease_normalizer: Callable,
     test_data: Path,
+    tmp_path_factory: pytest.TempPathFactory,
 ):
     """Provide query endpoint for testing sources. If THERAPY_TEST is set, will try to
     load DB from test data.
@@ -134,6 +140,7 @@ def test_source(
     :param database: test database instance
     :param is_test_env: if true, load from test data
     :param disease_normalizer: mock disease normalizer callback
+    :param tmp_path_factory: provides scratch locations for persistent disease caches
     :return: factory function that takes an ETL class instance and returns a query
     endpoint.
     """
@@ -141,13 +148,20 @@ def test_source(
     def test_source_factory(EtlClass: Base):  # noqa: N803
         if is_test_env:
             _logger.debug("Reloading DB with data from %s", test_data)
-            test_class = EtlClass(database, test_data / EtlClass.__name__.lower())  # type: ignore
+            kwargs = {}
+            if issubclass(EtlClass, DiseaseIndicationBase):  # type: ignore
+                kwargs["disease_cache_path"] = (
+                    tmp_path_factory.mktemp("disease_cache") / "disease_cache.db"
+                )
+            test_class = EtlClass(  # type: ignore
+                database, test_data / EtlClass.__name__.lower(), **kwargs
+            )
             test_class._normalize_disease = disease_normalizer  # type: ignore
             test_class.perform_etl(use_existing=True)
 
         class QueryGetter:
             def __init__(self):
-                self._query_handler = QueryHandler(database)
+                self._query_handler = QueryHandler(database, strict_models=True)
                 self._src_name = EtlClass.__name__  # type: ignore
 
             def search(self, query_str: str):
@@ -285,11 +299,20 @@ def null_database_class():
             raise NotImplementedError
 
         def get_record_by_id(
-            self, concept_id: str, case_sensitive: bool = True, merge: bool = False
+            self,
+            concept_id: str,
+            case_sensitive: bool = True,
+            merge: bool = False,
+            fields: Collection[str] | None = None,
         ) -> dict | None:
             raise NotImplementedError
 
-        def get_refs_by_type(self, search_term: str, ref_type: RefType) -> list[str]:
+        def get_refs_by_type(
+            self,
+            search_term: str,
+            ref_type: RefType,
+            sources: Collection[str] | None = None,
+        ) -> list[str]:
             raise NotImplementedError
 
         def get_all_concept_ids(self, source: SourceName | None = None) -> set[str]:
@@ -309,6 +332,23 @@ def null_database_class():
         def get_drugsatfda_from_unii(self, unii: str) -> set[str]:
             raise NotImplementedError
 
+        def get_first_ref_by_type(
+            self, search_term: str, ref_type: RefType
+        ) -> str | None:
+            raise NotImplementedError
+
+        def get_normalized_ref(self, term: str) -> dict | None:
+            raise NotImplementedError
+
+        def get_source_versions(self) -> dict[SourceName, str]:
+            raise NotImplementedError
+
+        def get_merge_run_id(self) -> str | None:
+            raise NotImplementedError
+
+        def get_term_filter(self) -> TermFilter | None:
+            raise NotImplementedError
+
         def get_rxnorm_id_by_brand(self, brand_id: str) -> str | None:
             raise NotImplementedError
 
@@ -318,6 +358,23 @@ def null_database_class():
         def add_merged_record(self, record: dict) -> None:
             raise NotImplementedError
 
+        def add_normalized_ref(
+            self,
+            term: str,
+            concept_id: str,
+            match_type: MatchType,
+            merged: bool,
+            precedence: tuple[int, int, str],
+            data_version: str,
+        ) -> None:
+            raise NotImplementedError
+
+        def add_merge_run_id(self, merge_run_id: str) -> None:
+            raise NotImplementedError
+
+        def add_term_filter(self, term_filter: TermFilter) -> None:
+            raise NotImplementedError
+
         def update_merge_ref(self, concept_id: str, merge_ref: Any) -> None:  # noqa: ANN401
             raise NotImplementedError
 
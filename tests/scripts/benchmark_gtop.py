@@ -0,0 +1,66 @@
+"""Time the Guide to PHARMACOLOGY transformation on a synthetic, scaled-up copy of the
+test data. Records are discarded rather than written to a database.
+
+Run against different revisions to compare implementations, e.g.
+``python3 tests/scripts/benchmark_gtop.py 20000``.
+"""
+
+import csv
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from timeit import default_timer as timer
+
+from wags_tails.guide_to_pharmacology import GtoPLigandPaths
+
+from therapy.etl import GuideToPHARMACOLOGY
+
+TEST_DATA_DIR = Path(__file__).resolve().parents[1] / "data" / "guidetopharmacology"
+
+
+class NullDatabase:
+    """Stand-in for database which discards records"""
+
+    def add_record(self, record: dict, src_name: str) -> None:
+        """Discard record"""
+
+
+def scale_file(source: Path, dest: Path, copies: int) -> None:
+    """Write copies of each data row in `source` with new ligand IDs."""
+    with source.open() as f:
+        rows = list(csv.reader(f, delimiter="\t"))
+    header, data = rows[:2], rows[2:]
+    with dest.open("w") as f:
+        writer = csv.writer(f, delimiter="\t", quoting=csv.QUOTE_ALL)
+        writer.writerows(header)
+        for i in range(copies):
+            for row in data:
+                writer.writerow([f"{i}{row[0]}", *row[1:]])
+
+
+copies = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+with tempfile.TemporaryDirectory() as tmp_dir:
+    tmp_path = Path(tmp_dir)
+    paths = GtoPLigandPaths(
+        ligands=tmp_path / "ligands.tsv",
+        ligand_id_mapping=tmp_path / "ligand_id_mapping.tsv",
+    )
+    scale_file(next(TEST_DATA_DIR.glob("*_ligands_*.tsv")), paths.ligands, copies)
+    scale_file(
+        next(TEST_DATA_DIR.glob("*_ligand_id_mapping_*.tsv")),
+        paths.ligand_id_mapping,
+        copies,
+    )
+
+    gtop = GuideToPHARMACOLOGY(NullDatabase(), data_path=tmp_path)  # type: ignore
+    gtop._data_files = paths
+    tracemalloc.start()
+    start = timer()
+    gtop._transform_data()
+    elapsed = timer() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+print(f"{len(gtop._added_ids)} records in {elapsed:.2f}s")  # noqa: T201
+print(f"peak traced memory: {peak / 2**20:.1f} MiB")  # noqa: T201
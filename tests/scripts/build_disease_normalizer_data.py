@@ -40,14 +40,23 @@ class SaveQueryHandler(DiseaseQueryHandler):
 
 disease_query_handler = SaveQueryHandler(create_disease_db())
 
-ch = ChEMBL(database=db, data_path=TEST_DATA_DIRECTORY)
+# route every lookup, including those made by prefetch worker threads, through the
+# recording query handler, and bypass the persistent cache so none are skipped
+ch = ChEMBL(database=db, data_path=TEST_DATA_DIRECTORY, persist_disease_cache=False)
 ch.disease_normalizer = disease_query_handler
+ch._create_disease_normalizer = lambda: disease_query_handler
+ch._disease_cache.clear()
 ch.perform_etl(use_existing=True)
 
-h = HemOnc(database=db, data_path=TEST_DATA_DIRECTORY)
+h = HemOnc(database=db, data_path=TEST_DATA_DIRECTORY, persist_disease_cache=False)
 h.disease_normalizer = disease_query_handler
+h._create_disease_normalizer = lambda: disease_query_handler
 h.perform_etl(use_existing=True)
 
+if not disease_normalizer_table:
+    msg = "No disease normalizer lookups were recorded"
+    raise RuntimeError(msg)
+
 
 with (TEST_DATA_DIRECTORY / "disease_normalization.json").open("w") as f:
     # for consistency/easier diffing
@@ -6,7 +6,7 @@ from pathlib import Path
 
 from wikibaseintegrator.wbi_helpers import execute_sparql_query
 
-from therapy.etl.wikidata import SPARQL_QUERY
+from therapy.etl.wikidata import SPARQL_ORDER_BY, SPARQL_QUERY
 
 TEST_IDS = {
     "http://www.wikidata.org/entity/Q412415",
@@ -20,7 +20,7 @@ TEST_IDS = {
     "http://www.wikidata.org/entity/Q422265",
 }
 
-result = execute_sparql_query(SPARQL_QUERY)["results"]["bindings"]
+result = execute_sparql_query(SPARQL_QUERY + SPARQL_ORDER_BY)["results"]["bindings"]
 test_data = []
 for item in result:
     if item["item"]["value"] in TEST_IDS:
@@ -31,6 +31,6 @@ for item in result:
 
 TEST_DATA_DIR = Path(__file__).resolve().parents[1] / "data" / "wikidata"
 date = datetime.datetime.now(tz=datetime.UTC).strftime("%Y-%m-%d")
-outfile_path = TEST_DATA_DIR / f"wikidata_{date}.json"
+outfile_path = TEST_DATA_DIR / f"wikidata_{date}.jsonl"
 with outfile_path.open("w+") as f:
-    json.dump(test_data, f, indent=2)
+    f.writelines(f"{json.dumps(row)}\n" for row in test_data)
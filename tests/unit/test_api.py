@@ -47,6 +47,16 @@ async def test_search(api_client: AsyncClient):
     response = await api_client.get("/therapy/search")
     assert response.status_code == 422
 
+    response = await api_client.get("/therapy/search?q=cisplatin&limit=1")
+    assert response.status_code == 200
+    assert all(
+        len(matches["records"]) <= 1
+        for matches in response.json()["source_matches"].values()
+    )
+
+    response = await api_client.get("/therapy/search?q=cisplatin&limit=0")
+    assert response.status_code == 422
+
 
 @pytest.mark.asyncio
 async def test_normalize(api_client: AsyncClient):
@@ -59,10 +69,102 @@ async def test_normalize(api_client: AsyncClient):
         "system": "https://mor.nlm.nih.gov/RxNav/search?searchBy=RXCUI&searchTerm=",
     }
 
+    response = await api_client.get("/therapy/normalize?q=cisplatin&view=minimal")
+    assert response.status_code == 200
+    therapy = response.json()["therapy"]
+    assert therapy["name"] == "cisplatin"
+    assert "mappings" not in therapy
+    assert "extensions" not in therapy
+
+    response = await api_client.get("/therapy/normalize?q=cisplatin&view=partial")
+    assert response.status_code == 422
+
+    msgpack = pytest.importorskip("msgpack")
+    response = await api_client.get(
+        "/therapy/normalize?q=cisplatin",
+        headers={"Accept": "application/msgpack"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
+    therapy = msgpack.unpackb(response.content)["therapy"]
+    assert therapy["primaryCoding"]["id"] == "rxcui:2555"
+
     response = await api_client.get("/therapy/normalize")
     assert response.status_code == 422
 
 
+@pytest.mark.asyncio
+async def test_conditional_requests(api_client: AsyncClient):
+    """Test response caching headers and revalidation."""
+    response = await api_client.get("/therapy/normalize?q=cisplatin")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
+
+    response = await api_client.get(
+        "/therapy/normalize?q=cisplatin", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert not response.content
+
+    for url in (
+        "/therapy/normalize?q=platinol",
+        "/therapy/normalize_unmerged?q=cisplatin",
+        "/therapy/search?q=cisplatin",
+    ):
+        response = await api_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    response = await api_client.get(
+        "/therapy/normalize?q=cisplatin",
+        headers={"If-None-Match": etag, "Accept": "application/msgpack"},
+    )
+    assert response.status_code == 200
+
+    # invalid requests aren't revalidated
+    response = await api_client.get(
+        "/therapy/search?q=cisplatin&incl=fake", headers={"If-None-Match": "*"}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_etag_data_version(api_client: AsyncClient, monkeypatch):
+    """Test that entity tags change once normalized data is regenerated."""
+    response = await api_client.get("/therapy/normalize?q=cisplatin")
+    etag = response.headers["etag"]
+
+    query_handler = app.state.query_handler
+    monkeypatch.setattr(query_handler, "_data_version_ttl", 0)
+    monkeypatch.setattr(query_handler.db, "get_merge_run_id", lambda: "newmergerun")
+    response = await api_client.get(
+        "/therapy/normalize?q=cisplatin", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_compression(api_client: AsyncClient):
+    """Test compression of query responses."""
+    response = await api_client.get(
+        "/therapy/search?q=cisplatin", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["source_matches"]["NCIt"]["records"]
+
+    response = await api_client.get(
+        "/therapy/search?q=cisplatin", headers={"Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in response.headers
+    assert response.json()["source_matches"]["NCIt"]["records"]
+
+
 @pytest.mark.asyncio
 async def test_service_info(api_client: AsyncClient, test_data: Path):
     response = await api_client.get("/therapy/service-info")
@@ -0,0 +1,50 @@
+"""Test shared ETL base functionality."""
+
+import pytest
+from pydantic import ValidationError
+
+from therapy.etl.base import _check_record_structure
+from therapy.schemas import Therapy
+
+
+@pytest.fixture(scope="module")
+def valid_record():
+    """Provide a record as produced by source transforms"""
+    return {
+        "concept_id": "chembl:CHEMBL11359",
+        "label": "CISPLATIN",
+        "aliases": ["CDDP", "Platinol"],
+        "xrefs": {"drugbank:DB00515"},
+        "approval_ratings": ["chembl_phase_4"],
+        "has_indication": [
+            {
+                "disease_id": "mesh:D010051",
+                "disease_label": "Ovarian Neoplasms",
+                "normalized_disease_id": "ncit:C7431",
+                "supplemental_info": {"chembl_max_phase_for_ind": "chembl_phase_4"},
+            }
+        ],
+        "src_name": "ChEMBL",
+    }
+
+
+@pytest.mark.parametrize(
+    ("field", "value"),
+    [
+        ("concept_id", None),
+        ("label", ["CISPLATIN"]),
+        ("aliases", "CDDP"),
+        ("xrefs", ["drugbank:DB00515", None]),
+        ("approval_ratings", ["approved"]),
+        ("has_indication", [{"disease_id": "mesh:D010051"}]),
+    ],
+)
+def test_check_record_structure(valid_record: dict, field: str, value):
+    """Test that fast structural check agrees with full model validation."""
+    Therapy(**valid_record)
+    assert _check_record_structure(valid_record) is None
+
+    invalid_record = {**valid_record, field: value}
+    with pytest.raises(ValidationError):
+        Therapy(**invalid_record)
+    assert _check_record_structure(invalid_record) is not None
@@ -1,8 +1,11 @@
 """Test ChemIDplus ETL methods."""
 
+from pathlib import Path
+
 import isodate
 import pytest
 
+from therapy.etl import chemidplus as chemidplus_module
 from therapy.etl.chemidplus import ChemIDplus
 from therapy.schemas import MatchType, Therapy
 
@@ -189,6 +192,22 @@ def test_glycopyrronium_bromide(chemidplus, compare_records, glycopyrronium_brom
     compare_records(response.records[0], glycopyrronium_bromide)
 
 
+def test_parse_xml(test_data: Path, monkeypatch):
+    """Test that the lxml and standard library parsers produce the same records."""
+    pytest.importorskip("lxml")
+    data_file = next((test_data / "chemidplus").glob("*.xml"))
+
+    lxml_records = [
+        ChemIDplus._get_record(e) for e in ChemIDplus.parse_xml(data_file, "Chemical")
+    ]
+    monkeypatch.setattr(chemidplus_module, "lxml_etree", None)
+    stdlib_records = [
+        ChemIDplus._get_record(e) for e in ChemIDplus.parse_xml(data_file, "Chemical")
+    ]
+    assert lxml_records == stdlib_records
+    assert any(lxml_records)
+
+
 def test_meta(chemidplus):
     """Test correctness of source metadata."""
     response = chemidplus.search("incoherent-string-of-text")
@@ -4,7 +4,17 @@ In the future, this should be filled in with different tests for alternate
 implementations.
 """
 
+import gzip
+import json
+import threading
+
+import pytest
 from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+from therapy.database.database import DatabaseWriteError
+from therapy.database.dynamodb import DynamoDatabase, ShardedBatchWriter
+from therapy.schemas import RefType, SourceMeta, SourceName, SourcePriority
 
 
 def test_tables_created(database):
@@ -54,3 +64,208 @@ def test_item_type(database):
     item = database.therapies.query(KeyConditionExpression=filter_exp)["Items"][0]
     assert "item_type" in item
     assert item["item_type"] == "merger"
+
+
+@pytest.mark.parametrize(
+    ("term", "ref_type"),
+    [
+        ("cisplatin", RefType.LABEL),
+        ("cisplatin", RefType.ALIASES),
+        ("platinol", RefType.TRADE_NAMES),
+        ("cis-ddp", RefType.ALIASES),
+        ("drugbank:db00515", RefType.XREFS),
+        ("zzzz fake therapy zzzz", RefType.LABEL),
+    ],
+)
+def test_get_first_ref_by_type(database, term: str, ref_type: RefType):
+    """Check that the priority index gives the highest-priority matching record, with
+    and without the index.
+    """
+    records = [
+        database.get_record_by_id(concept_id, case_sensitive=False)
+        for concept_id in database.get_refs_by_type(term, ref_type)
+    ]
+    records.sort(key=lambda r: (SourcePriority[r["src_name"].upper()], r["concept_id"]))
+    expected = records[0]["concept_id"].lower() if records else None
+
+    assert database.get_first_ref_by_type(term, ref_type) == expected
+    database._has_priority_index = False
+    try:
+        assert database.get_first_ref_by_type(term, ref_type) == expected
+    finally:
+        database._has_priority_index = None
+
+
+def test_get_first_ref_by_type_unindexed(database):
+    """Check that references missing from the sparse priority index are still found."""
+    assert database._check_priority_index()
+    key = {"label_and_type": "zzzz legacy therapy##label", "concept_id": "ncit:c376"}
+    database.therapies.put_item(Item={**key, "src_name": "NCIt", "item_type": "label"})
+    try:
+        assert (
+            database.get_first_ref_by_type("zzzz legacy therapy", RefType.LABEL)
+            == "ncit:c376"
+        )
+    finally:
+        database.therapies.delete_item(Key=key)
+
+
+def test_get_record_by_id_fields(database):
+    """Check that record retrieval can be restricted to specific attributes."""
+    fields = ("concept_id", "label")
+    record = database.get_record_by_id("ncit:C376", fields=fields)
+    assert record == {"concept_id": "ncit:C376", "label": "Cisplatin"}
+    assert (
+        database.get_record_by_id("NCIT:c376", case_sensitive=False, fields=fields)
+        == record
+    )
+    assert database.get_record_by_id("ncit:C0000000", fields=fields) is None
+
+
+class _FakeBatchClient:
+    """Mimic BatchWriteItem responses, leaving items unprocessed on the first call."""
+
+    def __init__(self, n_unprocessed: int):
+        self.n_unprocessed = n_unprocessed
+        self.written = []
+        self._lock = threading.Lock()
+
+    def batch_write_item(self, RequestItems):  # noqa: N803
+        requests = RequestItems["therapy_normalizer"]
+        assert len(requests) <= 25
+        with self._lock:
+            unprocessed = requests[: self.n_unprocessed]
+            self.n_unprocessed = 0
+            self.written += requests[len(unprocessed) :]
+        return {"UnprocessedItems": {"therapy_normalizer": unprocessed}}
+
+
+def test_sharded_batch_writer():
+    """Check that the multi-threaded writer retries unprocessed items and writes
+    every item exactly once.
+    """
+    client = _FakeBatchClient(n_unprocessed=3)
+    writer = ShardedBatchWriter(client, "therapy_normalizer", n_threads=4)
+    with writer:
+        for i in range(200):
+            item = {
+                "label_and_type": f"term{i}##alias",
+                "concept_id": f"ncit:c{i}",
+                "src_name": "NCIt",
+                "item_type": "alias",
+            }
+            writer.put_item(Item=item)
+            if i % 50 == 0:
+                # repeated key within a pending batch should be collapsed
+                writer.put_item(Item=item)
+    keys = [r["PutRequest"]["Item"]["label_and_type"]["S"] for r in client.written]
+    assert len(keys) == 200
+    assert len(set(keys)) == 200
+
+    metrics = writer.get_metrics()
+    assert metrics["items_written"] == 200
+    assert metrics["retries"] == 1
+    assert metrics["failed_items"] == 0
+
+
+class _FailingBatchClient:
+    """Mimic BatchWriteItem calls that fail with a non-retryable error."""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def batch_write_item(self, RequestItems):  # noqa: N803, ARG002
+        with self._lock:
+            self.calls += 1
+        raise ClientError(
+            {"Error": {"Code": "ValidationException", "Message": "bad item"}},
+            "BatchWriteItem",
+        )
+
+
+def test_sharded_batch_writer_failure():
+    """Check that the multi-threaded writer stops accepting items after a failure."""
+    client = _FailingBatchClient()
+    writer = ShardedBatchWriter(client, "therapy_normalizer", n_threads=2)
+    items = (
+        {
+            "label_and_type": f"term{i}##alias",
+            "concept_id": f"ncit:c{i}",
+            "src_name": "NCIt",
+            "item_type": "alias",
+        }
+        for i in range(10_000)
+    )
+    n_put = 0
+
+    def _load() -> None:
+        nonlocal n_put
+        with writer:
+            for item in items:
+                writer.put_item(Item=item)
+                n_put += 1
+
+    with pytest.raises(DatabaseWriteError):
+        _load()
+    assert n_put < 10_000
+    # only batches already in flight at the time of the failure were sent
+    assert client.calls < 50
+    assert writer.get_metrics()["failed_items"] > 0
+
+
+def test_item_file_export_and_load(tmp_path, monkeypatch, is_test_env):
+    """Check that records written in export mode can be bulk loaded into a table."""
+    if not is_test_env:
+        pytest.skip("only create and drop scratch tables in testing environment")
+    monkeypatch.setenv("THERAPY_DYNAMO_TABLE", "therapy_normalizer_import_test")
+    exporter = DynamoDatabase(export_dir=tmp_path)
+    exporter.add_source_metadata(
+        SourceName.NCIT,
+        SourceMeta(
+            data_license="CC BY 4.0",
+            data_license_url="https://creativecommons.org/licenses/by/4.0/legalcode",
+            version="23.09d",
+            data_url=None,
+            rdp_url=None,
+            data_license_attributes={
+                "non_commercial": False,
+                "share_alike": False,
+                "attribution": True,
+            },
+        ),
+    )
+    exporter.add_record(
+        {
+            "concept_id": "ncit:C0000",
+            "label": "Fakeximab",
+            "aliases": ["FKX-1", "fkx-1"],
+        },
+        SourceName.NCIT,
+    )
+    exporter.complete_write_transaction()
+    exporter.add_merged_record({"concept_id": "ncit:C0000", "xrefs": ["rxcui:0"]})
+    exporter.update_merge_ref("ncit:C0000", "ncit:C0000")
+    exporter.complete_write_transaction()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["merger", "ncit"]
+    with gzip.open(tmp_path / "ncit" / "items_00000.json.gz", "rt") as f:
+        lines = [json.loads(line)["Item"] for line in f]
+    assert len(lines) == 4  # source meta, identity, label, alias
+    assert lines[1]["label_and_type"] == {"S": "ncit:c0000##identity"}
+    assert lines[1]["merge_ref"] == {"S": "ncit:c0000"}
+    with gzip.open(tmp_path / "merger" / "items_00000.json.gz", "rt") as f:
+        lines = [json.loads(line)["Item"] for line in f]
+    assert [line["item_type"] for line in lines] == [{"S": "merger"}]
+
+    loader = DynamoDatabase()
+    loader.initialize_db()
+    try:
+        assert loader.load_item_files(tmp_path, n_threads=2) == 5
+        record = loader.get_record_by_id("ncit:C0000")
+        assert record["label"] == "Fakeximab"
+        assert record["merge_ref"] == "ncit:c0000"
+        assert loader.get_refs_by_type("fkx-1", RefType.ALIASES) == ["ncit:c0000"]
+        assert loader.get_record_by_id("ncit:C0000", merge=True)["xrefs"] == ["rxcui:0"]
+    finally:
+        loader.drop_db()
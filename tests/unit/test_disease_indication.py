@@ -3,6 +3,7 @@ disease-normalizer introduced breaking changes.
 """
 
 import os
+from pathlib import Path
 
 import pytest
 from disease.schemas import (
@@ -14,9 +15,13 @@ from disease.schemas import (
 
 from therapy.database.database import AbstractDatabase
 from therapy.etl import ChEMBL
+from therapy.etl.base import Base
+from therapy.etl.disease_cache import DiseaseCache
 
 
-def test_normalize_disease(is_test_env: bool, database: AbstractDatabase):
+def test_normalize_disease(
+    is_test_env: bool, database: AbstractDatabase, tmp_path: Path
+):
     """Test that DiseaseIndicationBase works correctly when normalizing diseases"""
     if not is_test_env:
         pytest.skip(
@@ -25,7 +30,7 @@ def test_normalize_disease(is_test_env: bool, database: AbstractDatabase):
 
     # set up normalizer
     os.environ["DISEASE_DYNAMO_TABLE"] = "disease_normalizer_therapy_test"
-    chembl = ChEMBL(database)
+    chembl = ChEMBL(database, disease_cache_path=tmp_path / "disease_cache.db")
     chembl.disease_normalizer.db.drop_db()
     chembl.disease_normalizer.db.initialize_db()
     chembl.disease_normalizer.db.add_source_metadata(
@@ -53,3 +58,88 @@ def test_normalize_disease(is_test_env: bool, database: AbstractDatabase):
     chembl.disease_normalizer.db.complete_write_transaction()
     result = chembl._normalize_disease("mondo:0700110")
     assert result == "mondo:0700110"
+
+
+def test_disease_cache(tmp_path: Path):
+    """Test that persistent disease cache stores results and is invalidated by data
+    version changes.
+    """
+    db_path = tmp_path / "disease_cache.db"
+    cache = DiseaseCache(db_path, "Mondo:2022-10-11")
+    assert cache.get("pneumonia") == (False, None)
+    cache.set("pneumonia", "mondo:0005249")
+    cache.set("not a disease", None)
+    cache.close()
+
+    cache = DiseaseCache(db_path, "Mondo:2022-10-11")
+    assert cache.get("pneumonia") == (True, "mondo:0005249")
+    assert cache.get("not a disease") == (True, None)
+    cache.close()
+
+    cache = DiseaseCache(db_path, "Mondo:2023-01-01")
+    assert cache.get("pneumonia") == (False, None)
+    cache.close()
+
+
+def test_prefetch_diseases(database: AbstractDatabase, tmp_path: Path):
+    """Test that disease terms are prefetched once each, by per-thread normalizers, and
+    served from cache.
+    """
+    chembl = ChEMBL(database, disease_cache_path=tmp_path / "disease_cache.db")
+    chembl._disease_cache.clear()
+
+    lookups = []
+    normalizers = []
+
+    class _Response:
+        disease = None
+
+    class _DiseaseNormalizer:
+        def __init__(self):
+            normalizers.append(self)
+
+        def normalize(self, query: str) -> _Response:
+            lookups.append((self, query))
+            return _Response()
+
+    chembl._create_disease_normalizer = _DiseaseNormalizer
+    chembl._prefetch_diseases(["Pneumonia", "pneumonia", "Asthma"])
+    assert sorted(query for _, query in lookups) == ["asthma", "pneumonia"]
+    assert all(normalizer in normalizers for normalizer, _ in lookups)
+    assert chembl._normalize_disease("PNEUMONIA") is None
+    assert len(lookups) == 2
+    chembl._disease_cache.clear()
+
+
+def test_perform_etl_repeatable(
+    database: AbstractDatabase, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that the persistent disease cache is reopened for each ETL run, so the
+    same instance can perform ETL more than once.
+    """
+    chembl = ChEMBL(database, disease_cache_path=tmp_path / "disease_cache.db")
+    chembl._disease_cache.clear()
+
+    lookups = []
+
+    class _Response:
+        disease = None
+
+    class _DiseaseNormalizer:
+        def normalize(self, query: str) -> _Response:
+            lookups.append(query)
+            return _Response()
+
+    chembl.disease_normalizer = _DiseaseNormalizer()
+    monkeypatch.setattr(
+        Base, "perform_etl", lambda self, _: [self._normalize_disease("pneumonia")]
+    )
+    assert chembl.perform_etl(use_existing=True) == [None]
+    assert chembl._persistent_disease_cache is None
+
+    chembl._disease_cache.clear()
+    assert chembl.perform_etl(use_existing=True) == [None]
+    assert lookups == ["pneumonia"]
+    assert chembl._normalize_disease("asthma") is None
+    assert lookups == ["pneumonia", "asthma"]
+    chembl._disease_cache.clear()
@@ -1,9 +1,14 @@
 """Test correctness of Drugs@FDA ETL methods."""
 
+import io
+import json
+from pathlib import Path
+
 import isodate
 import pytest
 
-from therapy.etl.drugsatfda import DrugsAtFDA
+from therapy.etl.base import SourceFormatError
+from therapy.etl.drugsatfda import DrugsAtFDA, _iter_results, _JsonStreamReader
 from therapy.schemas import MatchType, Therapy
 
 
@@ -423,6 +428,31 @@ def test_other_parameters(drugsatfda):
     assert response.match_type == MatchType.NO_MATCH
 
 
+def test_iter_results(test_data: Path):
+    """Test that streamed applications match those from a complete parse, including
+    when values are split across reads.
+    """
+
+    class _TrickleStream(io.StringIO):
+        def read(self, size: int = -1) -> str:  # noqa: ARG002
+            return super().read(7)
+
+    text = (test_data / "drugsatfda" / "drugsatfda_2023-11-15.json").read_text()
+    expected = json.loads(text)["results"]
+    assert list(_iter_results(io.StringIO(text))) == expected
+    assert list(_iter_results(_TrickleStream(text))) == expected
+    assert list(_iter_results(io.StringIO('{"results": [], "meta": {}}'))) == []
+
+
+def test_malformed_value():
+    """Test that a malformed value fails without reading the rest of the stream."""
+    stream = io.StringIO('{"application_number": "NDA021234",, ' + " " * 10_000 + "}")
+    reader = _JsonStreamReader(stream, chunk_size=16, max_value_size=256)
+    with pytest.raises(SourceFormatError, match="Malformed Drugs@FDA JSON"):
+        reader.decode()
+    assert stream.tell() < 1024
+
+
 def test_meta(drugsatfda):
     """Test correctness of source metadata."""
     response = drugsatfda.search("incoherent-string-of-text")
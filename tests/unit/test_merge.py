@@ -281,6 +281,21 @@ def test_create_merged_concepts(
 
     assert update_spy.call_count == len(record_id_groups) - 2
 
+    # check precomputed normalization results
+    database = merge_instance.database
+    ref = database.get_normalized_ref("cisplatin")
+    assert ref["concept_id"] == "rxcui:2555"
+    assert ref["match_type"] == "LABEL"
+    assert ref["merged"] is True
+    ref = database.get_normalized_ref("chembl:chembl11359")
+    assert ref["concept_id"] == "rxcui:2555"
+    assert ref["match_type"] == "CONCEPT_ID"
+    ref = database.get_normalized_ref("ncit:c49236")
+    assert ref["concept_id"] == "ncit:c49236"
+    assert ref["match_type"] == "CONCEPT_ID"
+    assert ref["merged"] is False
+    assert database.get_normalized_ref("zzzz fake therapy zzzz") is None
+
 
 def test_merge_record_ordering(merge_instance: Merge):
     """Test record ordering within merged record generation.
@@ -1,22 +1,38 @@
 """Test the therapy querying method."""
 
 import json
+import warnings
+from collections.abc import Collection
 from datetime import datetime
 from pathlib import Path
 
 import pytest
 from deepdiff import DeepDiff
-from ga4gh.core.models import MappableConcept
-
+from ga4gh.core.models import MappableConcept, Relation
+
+from therapy.concepts import (
+    get_coding_object,
+    get_concept_mapping,
+    get_indication,
+    get_indication_concept,
+    get_therapy_concept,
+    load_therapy_concept,
+)
 from therapy.database.database import AbstractDatabase
-from therapy.query import InvalidParameterError, QueryHandler
-from therapy.schemas import MatchType, SourceName, Therapy
+from therapy.query import InvalidParameterError, QueryHandler, RequestCache
+from therapy.schemas import (
+    MatchType,
+    NormalizationService,
+    NormalizeView,
+    SourceName,
+    Therapy,
+)
 
 
 @pytest.fixture(scope="module")
 def handler(database: AbstractDatabase):
     """Build query handler test fixture."""
-    return QueryHandler(database)
+    return QueryHandler(database, strict_models=True)
 
 
 @pytest.fixture(scope="module")
@@ -25,7 +41,7 @@ def search_handler(database: AbstractDatabase):
 
     class QueryGetter:
         def __init__(self):
-            self.query_handler = QueryHandler(database)
+            self.query_handler = QueryHandler(database, strict_models=True)
 
         def search(self, query_str, incl="", excl="", infer=True):
             return self.query_handler.search(
@@ -41,7 +57,7 @@ def normalize_handler(database: AbstractDatabase):
 
     class QueryGetter:
         def __init__(self):
-            self.query_handler = QueryHandler(database)
+            self.query_handler = QueryHandler(database, strict_models=True)
 
         def normalize(self, query_str, infer=True):
             return self.query_handler.normalize(query_str, infer)
@@ -266,6 +282,48 @@ def test_search_sources(search_handler):
         resp = search_handler.search("cisplatin", incl="chembl", excl="wikidata")
 
 
+def test_search_sources_lookups(handler: QueryHandler):
+    """Test that source-restricted searches only retrieve records from requested
+    sources.
+    """
+    cache = RequestCache(handler.db)
+    response = handler.search("cisplatin", incl="ncit", request_cache=cache)
+    assert set(response.source_matches) == {SourceName.NCIT}
+    assert response.source_matches[SourceName.NCIT].match_type == MatchType.LABEL
+    assert cache.db_calls["get_record_by_id"] == len(
+        response.source_matches[SourceName.NCIT].records
+    )
+    # stop after the first match type that satisfies all requested sources
+    assert cache.db_calls["get_refs_by_type"] == 1
+
+    cache = RequestCache(handler.db)
+    response = handler.search("CHEMBL11359", incl="ncit", request_cache=cache)
+    assert response.source_matches[SourceName.NCIT].match_type == MatchType.NO_MATCH
+    assert not response.warnings
+    assert "get_record_by_id" not in cache.db_calls
+
+
+def test_search_limit(handler: QueryHandler):
+    """Test that search limits records returned per source, before retrieval."""
+    full_response = handler.search("cisplatin")
+    cache = RequestCache(handler.db)
+    response = handler.search("cisplatin", limit=1, request_cache=cache)
+    assert set(response.source_matches) == set(full_response.source_matches)
+    for source, matches in response.source_matches.items():
+        full_matches = full_response.source_matches[source]
+        assert matches.match_type == full_matches.match_type
+        expected = sorted(r.concept_id.lower() for r in full_matches.records)[:1]
+        assert [r.concept_id.lower() for r in matches.records] == expected
+    drugsatfda = response.source_matches[SourceName.DRUGSATFDA]
+    assert [r.concept_id for r in drugsatfda.records] == ["drugsatfda.anda:074656"]
+    assert cache.db_calls["get_record_by_id"] == sum(
+        len(m.records) for m in response.source_matches.values()
+    )
+
+    with pytest.raises(InvalidParameterError):
+        handler.search("cisplatin", limit=0)
+
+
 def test_infer_option(search_handler, normalize_handler):
     """Test infer_namespace boolean option"""
     # drugbank
@@ -652,6 +710,205 @@ def test_unmerged_normalize(
     )
 
 
+def test_normalize_view(handler: QueryHandler):
+    """Test that normalize responses only include requested parts of the concept."""
+    for query in ("cisplatin", "ncit:C376", "DB00515", "Platinol", "trastuzumab"):
+        full = handler.normalize(query)
+        minimal = handler.normalize(query, view=NormalizeView.MINIMAL)
+        mappings = handler.normalize(query, view=NormalizeView.MAPPINGS)
+        for response in (minimal, mappings):
+            assert response.match_type == full.match_type
+            assert response.warnings == full.warnings
+            assert response.therapy.id == full.therapy.id
+            assert response.therapy.name == full.therapy.name
+            assert response.therapy.primaryCoding == full.therapy.primaryCoding
+            assert response.therapy.extensions is None
+        assert minimal.therapy.mappings is None
+        assert len(minimal.source_meta_) == 1
+        assert set(minimal.source_meta_) <= set(full.source_meta_)
+        assert mappings.therapy.mappings == full.therapy.mappings
+        assert mappings.source_meta_ == full.source_meta_
+
+    cache = RequestCache(handler.db)
+    handler.normalize("cisplatin", view=NormalizeView.MINIMAL, request_cache=cache)
+    record = next(iter(cache._records.values()))
+    assert set(record) <= {"concept_id", "src_name", "item_type", "merge_ref", "label"}
+
+
+def test_trusted_models(database: AbstractDatabase, handler: QueryHandler):
+    """Test that responses constructed without validation match validated responses."""
+    trusted_handler = QueryHandler(database)
+    for query in ("cisplatin", "CHEMBL11359", "Platinol", "trastuzumab", "zzzz"):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            for method_name in ("search", "normalize", "normalize_unmerged"):
+                expected = getattr(handler, method_name)(query)
+                actual = getattr(trusted_handler, method_name)(query)
+                assert actual.model_dump_json(
+                    exclude={"service_meta_"}
+                ) == expected.model_dump_json(exclude={"service_meta_"})
+            for view in NormalizeView:
+                expected = handler.normalize(query, view=view)
+                actual = trusted_handler.normalize(query, view=view)
+                assert actual.model_dump_json(
+                    exclude={"service_meta_"}
+                ) == expected.model_dump_json(exclude={"service_meta_"})
+
+
+def test_indexed_normalize(handler: QueryHandler, monkeypatch):
+    """Test that normalizing via precomputed results matches step-by-step lookup."""
+    queries = [
+        ("chembl:CHEMBL11359", True),
+        ("DB01174", True),
+        ("DB01174", False),
+        ("   Cisplatin ", True),
+        ("Platinol-aq", True),
+        ("TREAT", True),
+        ("umls:C0087111", True),
+        ("therapeutic procedure", True),
+        ("fake:00001", True),
+        ("zzzz fake therapy zzzz", True),
+    ]
+    exclude = {"service_meta_"}
+    indexed = [handler.normalize(query, infer) for query, infer in queries]
+    indexed_unmerged = handler.normalize_unmerged("RP 5337")
+
+    monkeypatch.setattr(handler.db, "get_normalized_ref", lambda _: None)
+    for actual, (query, infer) in zip(indexed, queries, strict=True):
+        expected = handler.normalize(query, infer)
+        assert actual.model_dump(exclude=exclude) == expected.model_dump(
+            exclude=exclude
+        ), query
+    expected_unmerged = handler.normalize_unmerged("RP 5337")
+    assert indexed_unmerged.model_dump(exclude=exclude) == expected_unmerged.model_dump(
+        exclude=exclude
+    )
+
+
+def test_request_cache(handler: QueryHandler, monkeypatch):
+    """Test that each record is retrieved at most once per request."""
+    calls = []
+    get_record_by_id = handler.db.get_record_by_id
+
+    def _get_record_by_id(
+        concept_id: str,
+        case_sensitive: bool = True,
+        merge: bool = False,
+        fields: Collection[str] | None = None,
+    ) -> dict | None:
+        calls.append((concept_id.lower(), merge))
+        return get_record_by_id(concept_id, case_sensitive, merge, fields)
+
+    monkeypatch.setattr(handler.db, "get_record_by_id", _get_record_by_id)
+    monkeypatch.setattr(handler.db, "get_normalized_ref", lambda _: None)
+
+    for query_method in (handler.search, handler.normalize, handler.normalize_unmerged):
+        calls.clear()
+        cache = RequestCache(handler.db)
+        response = query_method("CHEMBL11359", request_cache=cache)
+        assert response.warnings
+        assert len(calls) == len(set(calls))
+        assert cache.db_calls["get_record_by_id"] == len(calls)
+
+    calls.clear()
+    cache = RequestCache(handler.db)
+    handler.normalize_unmerged("Platinol", request_cache=cache)
+    assert len(calls) == len(set(calls))
+    assert cache.db_calls["get_first_ref_by_type"] == 2
+
+
+def test_normalized_ref_version(handler: QueryHandler, monkeypatch):
+    """Test that precomputed normalization results are ignored if they weren't built
+    from the current data.
+    """
+    assert "merge:" in handler.data_version
+    ref = handler.db.get_normalized_ref("cisplatin")
+    assert ref["data_version"] == handler.data_version
+
+    cache = RequestCache(handler.db)
+    expected = handler.normalize("cisplatin", request_cache=cache)
+    assert "get_first_ref_by_type" not in cache.db_calls
+
+    monkeypatch.setattr(handler, "data_version", "stale")
+    cache = RequestCache(handler.db)
+    actual = handler.normalize("cisplatin", request_cache=cache)
+    assert cache.db_calls["get_first_ref_by_type"]
+    assert actual.therapy == expected.therapy
+
+
+def test_term_filter(database: AbstractDatabase):
+    """Test that queries for unknown terms are answered without database lookups."""
+    handler = QueryHandler(database)
+    assert handler.term_filter
+    assert "cisplatin" in handler.term_filter
+    assert "rxcui:2555" in handler.term_filter
+
+    query = "zzzz fake therapy zzzz"
+    cache = RequestCache(database)
+    response = handler.normalize(query, request_cache=cache)
+    assert response.match_type == MatchType.NO_MATCH
+    response = handler.normalize_unmerged(query, request_cache=cache)
+    assert response.match_type == MatchType.NO_MATCH
+    response = handler.search(query, request_cache=cache)
+    assert all(
+        match.match_type == MatchType.NO_MATCH
+        for match in response.source_matches.values()
+    )
+    assert not cache.db_calls
+
+    # namespace inference could still succeed
+    cache = RequestCache(database)
+    handler.normalize("C99999999", request_cache=cache)
+    assert cache.db_calls
+
+    assert not QueryHandler(database, use_term_filter=False).term_filter
+
+
+def test_data_version_refresh(database: AbstractDatabase, monkeypatch):
+    """Test that the term filter is dropped once normalized data is regenerated."""
+    handler = QueryHandler(database, data_version_ttl=0)
+    assert handler.term_filter
+    data_version = handler.data_version
+
+    monkeypatch.setattr(database, "get_merge_run_id", lambda: "newmergerun")
+    assert handler.refresh_data_version() != data_version
+    assert handler.data_version.endswith(";merge:newmergerun")
+    assert handler.term_filter is None
+
+    cache = RequestCache(database)
+    response = handler.normalize("zzzz fake therapy zzzz", request_cache=cache)
+    assert response.match_type == MatchType.NO_MATCH
+    assert cache.db_calls
+
+    monkeypatch.undo()
+    assert handler.refresh_data_version() == data_version
+    assert handler.term_filter
+
+
+def test_data_version_source_reload(database: AbstractDatabase):
+    """Test that the data version changes once a source is reloaded, even if normalized
+    data isn't regenerated.
+    """
+    handler = QueryHandler(database, data_version_ttl=0)
+    data_version = handler.data_version
+    metadata = database.get_source_metadata(SourceName.NCIT)
+    assert metadata
+
+    database.add_source_metadata(
+        SourceName.NCIT, metadata.model_copy(update={"version": "reloaded"})
+    )
+    database.complete_write_transaction()
+    try:
+        assert handler.refresh_data_version() != data_version
+        assert "NCIt:reloaded;" in handler.data_version
+        assert database.get_source_metadata(SourceName.NCIT).version == "reloaded"
+    finally:
+        database.add_source_metadata(SourceName.NCIT, metadata)
+        database.complete_write_transaction()
+    assert handler.refresh_data_version() == data_version
+    assert handler.term_filter
+
+
 def test_merged_meta(normalize_handler):
     """Test population of source and resource metadata in merged querying."""
     query = "phenobarbital"
@@ -698,3 +955,88 @@ def test_broken_db_handling(normalize_handler):
     """
     query = "fake:00001"
     assert normalize_handler.normalize(query)
+
+
+def test_stored_therapy_concept(handler: QueryHandler, database: AbstractDatabase):
+    """Test that a precomputed therapy concept stored with a merged record produces the
+    same response as building the concept from the record.
+    """
+    record = database.get_record_by_id("rxcui:2555", False, True)
+    assert record
+    expected = handler._add_therapy(
+        NormalizationService(**handler._prepare_normalized_response("cisplatin")),
+        record,
+        MatchType.LABEL,
+    )
+
+    stored_record = {
+        "concept_id": record["concept_id"],
+        "therapy_concept": get_therapy_concept(record).model_dump_json(
+            exclude_none=True
+        ),
+    }
+    actual = handler._add_therapy(
+        NormalizationService(**handler._prepare_normalized_response("cisplatin")),
+        stored_record,
+        MatchType.LABEL,
+    )
+    assert actual.therapy == expected.therapy
+    assert actual.source_meta_ == expected.source_meta_
+
+    concept_json = stored_record["therapy_concept"]
+    constructed = load_therapy_concept(concept_json, strict=False)
+    assert constructed == load_therapy_concept(concept_json)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert constructed.model_dump_json(exclude_none=True) == concept_json
+
+
+def test_coding_cache():
+    """Test construction of coding objects from cached values."""
+    coding = get_coding_object("chebi:27899")
+    assert coding.code.root == "chebi:27899"
+    assert coding.system == "https://www.ebi.ac.uk/chebi/searchId.do?chebiId="
+    other_coding = get_coding_object("chebi:27899", strict=False)
+    assert other_coding == coding
+    assert other_coding is not coding
+
+    coding = get_coding_object("drugbank:DB00515")
+    assert coding.code.root == "DB00515"
+    assert coding.system == "https://go.drugbank.com/drugs/"
+
+    mapping = get_concept_mapping("rxcui:2555", Relation.EXACT_MATCH)
+    assert mapping.coding == get_coding_object("rxcui:2555")
+    assert mapping.relation == Relation.EXACT_MATCH
+    other_mapping = get_concept_mapping("rxcui:2555", Relation.EXACT_MATCH)
+    assert other_mapping == mapping
+    assert other_mapping is not mapping
+    assert other_mapping.coding is not mapping.coding
+    assert get_concept_mapping("rxcui:2555", Relation.RELATED_MATCH) != mapping
+
+    with pytest.raises(ValueError, match="Namespace prefix not supported: fake"):
+        get_coding_object("fake:00001")
+
+
+def test_indication_cache():
+    """Test construction of indications from cached values."""
+    indication_string = json.dumps(
+        ["hemonc:671", "Prostate cancer", "mondo:0008315", {"regulatory_body": "FDA"}]
+    )
+    indication = get_indication(indication_string)
+    assert indication.disease_id == "hemonc:671"
+    assert indication.disease_label == "Prostate cancer"
+    assert indication.normalized_disease_id == "mondo:0008315"
+    assert indication.supplemental_info == {"regulatory_body": "FDA"}
+    other_indication = get_indication(indication_string, strict=False)
+    assert other_indication == indication
+    assert other_indication.supplemental_info is not indication.supplemental_info
+
+    concept = get_indication_concept(indication_string)
+    assert concept["id"] == "hemonc:671"
+    assert concept["name"] == "Prostate cancer"
+    assert concept["mappings"][0]["coding"]["code"] == "MONDO:0008315"
+    assert concept["extensions"] == [{"name": "regulatory_body", "value": "FDA"}]
+    concept["extensions"].clear()
+    other_concept = get_indication_concept(indication_string)
+    assert other_concept is not concept
+    assert other_concept["extensions"] == [{"name": "regulatory_body", "value": "FDA"}]
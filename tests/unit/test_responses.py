@@ -0,0 +1,113 @@
+"""Test response encoding and content negotiation."""
+
+import gzip
+import json
+
+import pytest
+
+from therapy.responses import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    compress,
+    encode_response,
+    etag_matches,
+    make_etag,
+    select_content_encoding,
+    select_media_type,
+)
+from therapy.schemas import Therapy
+
+msgpack = pytest.importorskip("msgpack")
+brotli = pytest.importorskip("brotli")
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (None, JSON_MEDIA_TYPE),
+        ("", JSON_MEDIA_TYPE),
+        ("*/*", JSON_MEDIA_TYPE),
+        ("application/json", JSON_MEDIA_TYPE),
+        ("application/msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/x-msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/msgpack, application/json", MSGPACK_MEDIA_TYPE),
+        ("application/msgpack;q=0.5, application/json", JSON_MEDIA_TYPE),
+        ("application/json;q=0.5, application/msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/msgpack;q=0, */*", JSON_MEDIA_TYPE),
+        ("text/html, application/msgpack;q=0.9, */*;q=0.8", MSGPACK_MEDIA_TYPE),
+        ("APPLICATION/MSGPACK; Q=1", MSGPACK_MEDIA_TYPE),
+    ],
+)
+def test_select_media_type(accept: str | None, expected: str):
+    """Test choice of response format from Accept header."""
+    assert select_media_type(accept) == expected
+
+
+def test_encode_response():
+    """Test that each format encodes the same content."""
+    therapy = Therapy(concept_id="ncit:C376", label="Cisplatin", aliases=["CDDP"])
+    expected = {
+        "concept_id": "ncit:C376",
+        "label": "Cisplatin",
+        "aliases": ["CDDP"],
+        "trade_names": [],
+        "xrefs": [],
+        "associated_with": [],
+        "approval_year": [],
+        "has_indication": [],
+    }
+    assert json.loads(encode_response(therapy, JSON_MEDIA_TYPE, True)) == expected
+    assert msgpack.unpackb(encode_response(therapy, MSGPACK_MEDIA_TYPE, True)) == (
+        expected
+    )
+    assert (
+        json.loads(encode_response(therapy, JSON_MEDIA_TYPE))["approval_ratings"]
+        is None
+    )
+
+    with pytest.raises(ValueError, match="Unsupported response media type"):
+        encode_response(therapy, "text/html")
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, deflate, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, *", "gzip"),
+        ("*", "br"),
+        ("gzip;q=0, br;q=0", None),
+    ],
+)
+def test_select_content_encoding(accept_encoding: str | None, expected: str | None):
+    """Test choice of response compression from Accept-Encoding header."""
+    assert select_content_encoding(accept_encoding) == expected
+
+
+def test_compress():
+    """Test response compression round trip."""
+    content = b'{"query": "cisplatin"}' * 100
+    assert gzip.decompress(compress(content, "gzip")) == content
+    assert brotli.decompress(compress(content, "br")) == content
+    with pytest.raises(ValueError, match="Unsupported content encoding"):
+        compress(content, "deflate")
+
+
+def test_etag():
+    """Test entity tag construction and matching."""
+    etag = make_etag("RxNorm:20210104", "/therapy/normalize", "q=cisplatin")
+    assert etag.startswith('W/"')
+    assert etag == make_etag("RxNorm:20210104", "/therapy/normalize", "q=cisplatin")
+    assert etag != make_etag("RxNorm:20220104", "/therapy/normalize", "q=cisplatin")
+    assert etag != make_etag("RxNorm:20210104", "/therapy/normalize", "q=platinol")
+    assert etag != make_etag("RxNorm:20210104", "/therapy/normalize", "", "q=cisplatin")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches(f'W/"abc", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('W/"abc"', etag)
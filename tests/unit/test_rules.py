@@ -0,0 +1,63 @@
+"""Test application of manual data rules."""
+
+from pathlib import Path
+
+import pytest
+
+from therapy.etl.rules import Rules, get_rules_index
+from therapy.schemas import SourceName
+
+
+@pytest.fixture
+def rules_path(tmp_path: Path) -> Path:
+    """Provide rules file with concept-level and wildcard rules"""
+    path = tmp_path / "rules.csv"
+    path.write_text(
+        "source,concept_id,field,value\n"
+        "Wikidata,wikidata:Q412415,aliases,CDDP\n"
+        "Wikidata,wikidata:Q412415,xrefs,chembl:CHEMBL11359\n"
+        "Wikidata,*,aliases,Ig gamma-1 chain C region\n"
+        "ChEMBL,chembl:CHEMBL11359,*,cisplatin\n"
+    )
+    return path
+
+
+def test_rules(rules_path: Path):
+    """Test that concept-specific and wildcard rules are applied."""
+    rules = Rules(SourceName.WIKIDATA, rules_path)
+    therapy = rules.apply_rules_to_therapy(
+        {
+            "concept_id": "wikidata:Q412415",
+            "aliases": ["CDDP", "Platinol", "Ig gamma-1 chain C region"],
+            "xrefs": ["chembl:CHEMBL11359", "drugbank:DB00515"],
+        }
+    )
+    assert therapy["aliases"] == ["Platinol"]
+    assert therapy["xrefs"] == ["drugbank:DB00515"]
+
+    therapy = rules.apply_rules_to_therapy(
+        {"concept_id": "wikidata:Q418702", "aliases": ["Ig gamma-1 chain C region"]}
+    )
+    assert therapy["aliases"] == []
+
+    rules = Rules(SourceName.CHEMBL, rules_path)
+    therapy = rules.apply_rules_to_therapy(
+        {
+            "concept_id": "chembl:CHEMBL11359",
+            "aliases": ["cisplatin", "CDDP"],
+            "trade_names": ["cisplatin"],
+        }
+    )
+    assert therapy["aliases"] == ["CDDP"]
+    assert therapy["trade_names"] == []
+
+
+def test_rules_index_cache(rules_path: Path):
+    """Test that rules are only recompiled when the rules file changes."""
+    index = get_rules_index(rules_path)
+    assert get_rules_index(rules_path) is index
+
+    with rules_path.open("a") as f:
+        f.write("Wikidata,wikidata:Q26272,field,value\n")
+    with pytest.raises(ValueError, match="Non-scalar fields"):
+        get_rules_index(rules_path)
@@ -0,0 +1,34 @@
+"""Test term filter construction and serialization."""
+
+import pytest
+
+from therapy.term_filter import TermFilter
+
+
+def test_term_filter():
+    """Test membership checks and round trip through serialized chunks."""
+    terms = {f"term {i}" for i in range(5000)} | {"cisplatin", "rxcui:2555"}
+    term_filter = TermFilter.build(terms, "RxNorm:20210104")
+    assert all(term in term_filter for term in terms)
+    false_positives = sum(f"missing {i}" in term_filter for i in range(5000))
+    assert false_positives < 150
+    assert 2555 not in term_filter
+
+    chunks = term_filter.to_chunks(chunk_size=1000)
+    assert len(chunks) > 1
+    loaded = TermFilter.from_chunks(
+        chunks, term_filter.num_bits, term_filter.num_hashes, "RxNorm:20210104"
+    )
+    assert loaded.data_version == "RxNorm:20210104"
+    assert all(term in loaded for term in terms)
+
+    with pytest.raises(ValueError, match="filter bytes"):
+        TermFilter.from_chunks(
+            chunks[:-1], term_filter.num_bits, term_filter.num_hashes, ""
+        )
+
+
+def test_empty_term_filter():
+    """Test that a filter without terms excludes everything."""
+    term_filter = TermFilter.build(set(), "")
+    assert "cisplatin" not in term_filter
@@ -2,9 +2,19 @@
 Wikidata source.
 """
 
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
 import isodate
 import pytest
+from wikibaseintegrator.wbi_config import config as wbi_config
 
+from therapy.etl import wikidata as wikidata_module
+from therapy.etl.base import EtlError
 from therapy.etl.wikidata import Wikidata
 from therapy.schemas import MatchType, Therapy
 
@@ -372,3 +382,92 @@ def test_meta_info(wikidata):
         "share_alike": False,
         "attribution": False,
     }
+
+
+@pytest.fixture
+def sparql_endpoint(test_data: Path, monkeypatch):
+    """Provide local stand-in for the Wikidata SPARQL endpoint, serving test data in
+    pages. Offsets added to ``failures`` return server errors.
+    """
+    with (test_data / "wikidata" / "wikidata_2023-11-17.jsonl").open() as f:
+        bindings = [
+            {key: {"type": "literal", "value": value} for key, value in row.items()}
+            for row in map(json.loads, f)
+        ]
+    failures: set[int] = set()
+    requested: list[int] = []
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_POST(self):  # noqa: N802
+            query = parse_qs(urlparse(self.path).query)["query"][0]
+            limit = int(re.search(r"LIMIT (\d+)", query).group(1))
+            offset = int(re.search(r"OFFSET (\d+)", query).group(1))
+            requested.append(offset)
+            if offset in failures:
+                self.send_response(503)
+                self.end_headers()
+                return
+            body = json.dumps(
+                {"results": {"bindings": bindings[offset : offset + limit]}}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/sparql-results+json")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = HTTPServer(("localhost", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setitem(
+        wbi_config, "SPARQL_ENDPOINT_URL", f"http://localhost:{server.server_port}"
+    )
+    monkeypatch.setattr(wikidata_module, "SPARQL_PAGE_SIZE", 4)
+    monkeypatch.setattr(wikidata_module, "SPARQL_PAGE_RETRIES", 2)
+    monkeypatch.setattr(wikidata_module, "SPARQL_RETRY_AFTER", 0)
+    yield failures, requested
+    server.shutdown()
+
+
+def test_paginated_download(sparql_endpoint, test_data: Path, tmp_path: Path):
+    """Test that paginated download resumes from a failed page and reproduces the
+    complete query results.
+    """
+    failures, requested = sparql_endpoint
+    outfile = tmp_path / "wikidata.jsonl"
+
+    failures.add(4)
+    with pytest.raises(EtlError):
+        Wikidata._download_data("", outfile)
+    assert not outfile.exists()
+    assert requested == [0, 4, 4]
+
+    failures.clear()
+    requested.clear()
+    Wikidata._download_data("", outfile)
+    assert requested == [4, 8]
+    expected = (test_data / "wikidata" / "wikidata_2023-11-17.jsonl").read_text()
+    assert outfile.read_text() == expected
+    assert not (tmp_path / "wikidata.jsonl.part").exists()
+
+
+def test_resume_truncated_download(sparql_endpoint, test_data: Path, tmp_path: Path):
+    """Test that an incompletely written row is discarded before resuming download."""
+    failures, requested = sparql_endpoint
+    outfile = tmp_path / "wikidata.jsonl"
+
+    failures.add(4)
+    with pytest.raises(EtlError):
+        Wikidata._download_data("", outfile)
+    partial_file = tmp_path / "wikidata.jsonl.part"
+    with partial_file.open("a") as f:
+        f.write('{"item": "http://www.wikidata.org/entity/Q')
+
+    failures.clear()
+    requested.clear()
+    Wikidata._download_data("", outfile)
+    assert requested == [4, 8]
+    expected = (test_data / "wikidata" / "wikidata_2023-11-17.jsonl").read_text()
+    assert outfile.read_text() == expected